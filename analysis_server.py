@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+analysis_server.py
+--------------------------------------------------------
+本地 HTTP/JSON 分析服务（asyncio，无第三方依赖，不导入 Qt）
+常驻一个已预热的 QingShiluService，供多个工具 / notebook 共用，避免各自重复加载词库和语料。
+1. GET  /health                     存活检查
+2. POST /analyze        {"text", "stages"}               单条分析
+3. POST /batch-analyze  {"texts", "stages"}              多条分析
+4. POST /save           {"originalText", "translation", "classificationKey", "articleId"}
+5. GET  /stats[?filter=0/赈灾与民生保障]                  分类统计
+并发的 /analyze 请求在 --batch-window-ms 内合并为一次 analyze_batch (推荐分类一次向量化打分)。
+Service 不是线程安全的：所有分析与保存都在同一个工作线程中串行执行。
+--------------------------------------------------------
+Usage:
+    python3 analysis_server.py [--host 127.0.0.1] [--port 8765] [--batch-window-ms 5] [--max-batch 64] [--data-dir DIR]
+    curl -s localhost:8765/analyze -d '{"text": "○123 ..."}'
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+# 与 batch_cli.py 相同的路径修正：保证能以 gemini.* 的形式导入
+ROOT = os.path.dirname(os.path.abspath(__file__))
+if os.path.dirname(ROOT) not in sys.path:
+    sys.path.insert(0, os.path.dirname(ROOT))
+
+from gemini.services.analysis_service import QingShiluService, INTERACTIVE_STAGES
+
+MAX_BODY_SIZE = 16 * 1024 * 1024
+MAX_HEADER_LINES = 100
+
+
+class HttpError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class AnalysisServer:
+    """
+    asyncio HTTP 服务器。start() 返回实际监听的端口 (port=0 时由系统分配，便于本机测试)。
+    """
+
+    def __init__(self, service: QingShiluService | None = None, host="127.0.0.1", port=8765,
+                 batch_window_ms=5.0, max_batch=64):
+        self.service = service or QingShiluService()
+        self.host = host
+        self.port = port
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+
+        # 单个工作线程：分析和保存串行执行，事件循环只负责网络 I/O
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis")
+        self._pending = None  # asyncio.Queue[(text, stages, future)]
+        self._batcher = None
+        self._server = None
+        self._connections = {}  # 连接处理协程 -> StreamWriter
+
+        self.routes = {
+            ("GET", "/health"): self._handle_health,
+            ("POST", "/analyze"): self._handle_analyze,
+            ("POST", "/batch-analyze"): self._handle_batch_analyze,
+            ("POST", "/save"): self._handle_save,
+            ("GET", "/stats"): self._handle_stats,
+        }
+
+    async def start(self):
+        self._pending = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"INFO: 分析服务已启动: http://{self.host}:{self.port}")
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            # 关闭仍保持 keep-alive 的连接，等待其处理协程读到 EOF 后正常退出
+            for writer in list(self._connections.values()):
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    # =================================================================
+    # 请求合并 (micro-batching)
+    # =================================================================
+
+    async def _batch_loop(self):
+        """收集一个时间窗口内的 /analyze 请求，按 stages 分组后各调用一次 analyze_batch"""
+        while True:
+            batch = [await self._pending.get()]
+            deadline = asyncio.get_running_loop().time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._pending.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            groups = {}
+            for text, stages, future in batch:
+                groups.setdefault(stages, []).append((text, future))
+
+            for stages, items in groups.items():
+                try:
+                    results = await self._run(self._analyze_texts, [text for text, _ in items], stages)
+                except Exception as e:
+                    for _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for (_, future), result in zip(items, results):
+                    if not future.done():
+                        future.set_result(result)
+
+    def _analyze_texts(self, texts, stages):
+        """在工作线程中执行：分析并导出为可 JSON 序列化的 dict"""
+        return [result.to_dict(stages) for result in self.service.analyze_batch(texts, stages=stages)]
+
+    def _parse_stages(self, payload):
+        stages = payload.get("stages")
+        if stages is None:
+            return INTERACTIVE_STAGES
+        if not isinstance(stages, list):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "stages 必须是字符串列表")
+        try:
+            return self.service._resolve_stages(stages)
+        except ValueError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, str(e))
+
+    # =================================================================
+    # 路由处理
+    # =================================================================
+
+    async def _handle_health(self, payload, query):
+        return {"status": "ok"}
+
+    async def _handle_analyze(self, payload, query):
+        text = payload.get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise HttpError(HTTPStatus.BAD_REQUEST, "text 不能为空")
+        stages = self._parse_stages(payload)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._pending.put((text, stages, future))
+        return {"result": await future}
+
+    async def _handle_batch_analyze(self, payload, query):
+        texts = payload.get("texts")
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "texts 必须是字符串列表")
+        stages = self._parse_stages(payload)
+        return {"results": await self._run(self._analyze_texts, texts, stages)}
+
+    async def _handle_save(self, payload, query):
+        # 以下字段都会写入 classified_data.json，类型不对时直接拒绝，避免写入非字符串的值
+        original_text = payload.get("originalText")
+        classification_key = payload.get("classificationKey")
+        translation = payload.get("translation", "N/A")
+        article_id = payload.get("articleId")
+        if not isinstance(original_text, str) or not isinstance(classification_key, str):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "originalText 和 classificationKey 必须是字符串")
+        if not isinstance(translation, str):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "translation 必须是字符串")
+        if article_id is not None and not isinstance(article_id, str):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "articleId 必须是字符串或 null")
+        if not original_text or not classification_key:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "originalText 和 classificationKey 不能为空")
+        # 推荐结果中的显示键 (事务类-赈灾与民生保障-赈灾) 也接受，统一转换为保存格式
+        classification_key = self.service.model.category_registry.to_save_key(classification_key)
+        if classification_key is None:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "classificationKey 格式应为 L1/L2/L3，例如 0/赈灾与民生保障/赈灾")
+
+        await self._run(
+            self.service.save_classification_result,
+            original_text, translation, classification_key, article_id
+        )
+        return {"saved": True}
+
+    async def _handle_stats(self, payload, query):
+        filter_key = query.get("filter", [None])[0]
+        return {"stats": await self._run(self.service.model.get_classified_stats, filter_key)}
+
+    # =================================================================
+    # HTTP/1.1 (支持 keep-alive)
+    # =================================================================
+
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                keep_alive = await self._handle_request(reader, writer)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _handle_request(self, reader, writer):
+        request_line = await reader.readline()
+        if not request_line:
+            return False
+
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            await self._send(writer, HTTPStatus.BAD_REQUEST, {"error": "无效的请求行"}, keep_alive=False)
+            return False
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+        # 请求体不读取时，连接上剩下的字节无法作为下一个请求解析：回复错误后关闭连接
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            await self._send(writer, HTTPStatus.BAD_REQUEST, {"error": "Content-Length 无效"}, keep_alive=False)
+            return False
+        if length > MAX_BODY_SIZE:
+            await self._send(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "请求体过大"}, keep_alive=False)
+            return False
+
+        try:
+            body = await reader.readexactly(length) if length else b""
+
+            url = urlsplit(target)
+            handler = self.routes.get((method, url.path))
+            if handler is None:
+                if any(path == url.path for _, path in self.routes):
+                    raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"{url.path} 不支持 {method}")
+                raise HttpError(HTTPStatus.NOT_FOUND, f"未知的路径: {url.path}")
+
+            try:
+                payload = json.loads(body) if body else {}
+            except ValueError:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "请求体不是合法的 JSON")
+            if not isinstance(payload, dict):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "请求体应为 JSON 对象")
+
+            status, response = HTTPStatus.OK, await handler(payload, parse_qs(url.query))
+        except HttpError as e:
+            status, response = e.status, {"error": e.message}
+        except ValueError as e:
+            status, response = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:
+            print(f"错误：处理 {method} {target} 失败: {e}")
+            status, response = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+        await self._send(writer, status, response, keep_alive)
+        return keep_alive
+
+    async def _send(self, writer, status, response, keep_alive):
+        body = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="清实录条文本地分析服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--batch-window-ms", type=float, default=5.0, help="合并并发 /analyze 请求的时间窗口")
+    parser.add_argument("--max-batch", type=int, default=64, help="一次合并的最大请求数")
+    parser.add_argument("--data-dir", help="数据目录，默认按 services/constants.py 的配置解析")
+    args = parser.parse_args(argv)
+
+    server = AnalysisServer(QingShiluService(args.data_dir), host=args.host, port=args.port,
+                            batch_window_ms=args.batch_window_ms, max_batch=args.max_batch)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("INFO: 分析服务已停止")
+
+
+if __name__ == "__main__":
+    main()
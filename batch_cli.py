@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+batch_cli.py
+--------------------------------------------------------
+命令行批量分类工具（无界面，不导入任何 Qt 模块，可在无显示的服务器上定时运行）
+1. 输入：文件、目录（取其中的 *.txt）或通配符，如 "text/抽取结果_*.txt"
+2. 拆分、去重、沿用已有分类的逻辑与批量界面 (FileManager) 一致
+3. 读取、拆分、分析、写出由 BatchPipeline 流水线串联：需要分析的条文按块分给多个进程并行分析，
+   结果边分析边写出，内存占用与输入文件数量无关
+4. 输出：JSONL（每行一条条文）或 CSV，按输出文件扩展名或 --format 决定
+--------------------------------------------------------
+Usage:
+    python3 batch_cli.py <文件/目录/通配符 ...> -o results.jsonl [--workers 4] [--stages keywords,recommendations] [--data-dir DIR]
+"""
+
+import argparse
+import asyncio
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# 与 benchmarks/ 相同的路径修正：保证能以 gemini.* 的形式导入
+ROOT = os.path.dirname(os.path.abspath(__file__))
+if os.path.dirname(ROOT) not in sys.path:
+    sys.path.insert(0, os.path.dirname(ROOT))
+
+from gemini.services.analysis_service import QingShiluService, ANALYSIS_STAGES
+from gemini.services.file_manager import FileManager, KNOWN_ARTICLE_POLICIES
+from gemini.services.batch_pipeline import BatchPipeline
+from gemini.services.keywords_data import CATEGORY_CONFIG
+from gemini.services.records import AnalysisRecord
+
+DEFAULT_STAGES = ('core_info', 'keywords', 'tags', 'recommendations')
+OUTPUT_FORMATS = ('jsonl', 'csv')
+# 每个性质/领域标签一列得分，列名取 CATEGORY_CONFIG 中的 name
+TAG_COLUMNS = [conf['name'] for conf in CATEGORY_CONFIG.values()]
+CSV_HEADER = [
+    "ArticleId", "SourceFile", "ClassificationKey", "AutoClassified",
+    "Recommendation1", "Recommendation2", "Recommendation3",
+    "Keywords", "Subject", "Action", "Nature", "Tags", *TAG_COLUMNS, "OriginalText"
+]
+
+# 子进程内的 Service 实例：每个进程只加载一次数据和词库
+_worker_service = None
+
+
+def _init_worker(data_dir):
+    global _worker_service
+    _worker_service = QingShiluService(data_dir)
+
+
+def _analyze_chunk(texts, stages):
+    """在子进程中分析一块条文，只返回请求的阶段 (普通 dict，便于跨进程传递)"""
+    return [result.to_dict(stages) for result in _worker_service.analyze_batch(texts, stages=stages)]
+
+
+def expand_inputs(patterns):
+    """展开文件、目录和通配符，去重并保持输入顺序"""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matched = sorted(glob.glob(os.path.join(pattern, "*.txt")))
+        else:
+            matched = sorted(glob.glob(pattern, recursive=True)) or ([pattern] if os.path.exists(pattern) else [])
+        if not matched:
+            print(f"警告：没有匹配的文件: {pattern}", file=sys.stderr)
+        files.extend(matched)
+    return list(dict.fromkeys(files))
+
+
+def _csv_row(article):
+    analysis = article.analysis or AnalysisRecord()
+    recommendations = [rec.category for rec in (analysis.recommendations or [])[:3]]
+    recommendations += [""] * (3 - len(recommendations))
+    core_info = analysis.core_info or {}
+    tags = analysis.tags or {}
+    tag_scores = {**tags.get('nature', {}), **tags.get('domain', {})}
+    return [
+        article.article_id,
+        article.source_file or '',
+        article.classification_key or '',
+        'Y' if article.auto_classified else '',
+        *recommendations,
+        " ".join(analysis.keywords or []),
+        core_info.get('subject', ''),
+        core_info.get('action', ''),
+        core_info.get('nature', ''),
+        " ".join(tags.get('labels', [])),
+        *(tag_scores.get(name, '') for name in TAG_COLUMNS),
+        article.original_text.replace('\n', ' ').strip(),
+    ]
+
+
+def make_writer(f, output_format):
+    """返回逐条写出批量条目的 sink"""
+    if output_format == 'jsonl':
+        def write(article):
+            f.write(json.dumps(article.to_dict(), ensure_ascii=False) + "\n")
+        return write
+
+    writer = csv.writer(f)
+    writer.writerow(CSV_HEADER)
+
+    def write(article):
+        if article.error is None:
+            writer.writerow(_csv_row(article))
+    return write
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="清实录条文命令行批量分类")
+    parser.add_argument("inputs", nargs="+", help="待处理的文件、目录或通配符")
+    parser.add_argument("-o", "--output", required=True, help="输出文件 (.jsonl 或 .csv)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, help="输出格式，默认按输出文件扩展名判断")
+    parser.add_argument("--stages", default=",".join(DEFAULT_STAGES),
+                        help=f"逗号分隔的分析阶段，可选: {','.join(ANALYSIS_STAGES)}")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="并行进程数，1 表示单进程")
+    parser.add_argument("--chunk-size", type=int, default=200, help="每个进程一次分析的条文数")
+    parser.add_argument("--data-dir", help="数据目录 (classified_data.json 等)，默认按 services/constants.py 的配置解析")
+    parser.add_argument("--known", choices=KNOWN_ARTICLE_POLICIES, default='carry',
+                        help="已分类条文的处理方式：沿用分类 / 跳过 / 重新分析")
+    parser.add_argument("--number-raw", action="store_true",
+                        help="没有“○”标记的原始文件按行编号后再拆分 (每个非空行为一条条文)")
+    args = parser.parse_args(argv)
+
+    args.stages = frozenset(s.strip() for s in args.stages.split(",") if s.strip())
+    unknown = args.stages.difference(ANALYSIS_STAGES)
+    if unknown:
+        parser.error(f"未知的分析阶段: {sorted(unknown)}")
+    if args.format is None:
+        args.format = 'csv' if args.output.lower().endswith('.csv') else 'jsonl'
+    if args.chunk_size < 1:
+        parser.error("--chunk-size 必须大于 0")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("错误：没有文件可供处理。", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    service = QingShiluService(args.data_dir)
+    file_manager = FileManager(service)
+    file_manager.set_known_article_policy(args.known)
+    file_manager.number_raw_files = args.number_raw
+    file_manager.begin_batch()
+
+    if args.workers <= 1:
+        # 单进程：在流水线默认的单个工作线程中使用本进程的 Service
+        def analyze(texts, stages):
+            return [result.to_dict(stages) for result in service.analyze_batch(texts, stages=stages)]
+        executor, analyzers = None, 1
+    else:
+        executor = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                       initargs=(service.model.data_dir,))
+        analyze, analyzers = _analyze_chunk, args.workers
+
+    pipeline = BatchPipeline(file_manager, stages=args.stages, chunk_size=args.chunk_size,
+                             analyzers=analyzers, executor=executor, analyze=analyze)
+    try:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            stats = asyncio.run(pipeline.run(files, make_writer(f, args.format)))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    skipped = file_manager.skipped_articles
+    print(f"共处理 {stats['files']} 个文件，输出 {stats['articles']} 条条文：分析 {stats['analyzed']} 条，"
+          f"沿用已有分类 {stats['carried']} 条，跳过重复 {len(skipped)} 条，"
+          f"出错 {stats['errors']} 条 (读取/拆分失败的文件或分析失败的条文)。")
+    print(f"结果已写入 {args.output} ({args.format})，耗时 {time.perf_counter() - start:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+# benchmarks/_path.py
+# ----------------------------------------------------
+# 基准脚本共用的路径约定 (与 main.py 相同)：gemini 的上级目录在 sys.path 中，才能以 gemini.* 的形式导入。
+# 脚本以 python3 benchmarks/bench_xxx.py 运行时 benchmarks/ 就是 sys.path[0]，可直接 from _path import ...
+
+import os
+import sys
+from pathlib import Path
+
+# 仓库根目录 (gemini/)
+ROOT = Path(os.path.abspath(__file__)).parent.parent
+
+
+def add_package_parent():
+    """把 gemini 的上级目录加入当前进程的 sys.path"""
+    if str(ROOT.parent) not in sys.path:
+        sys.path.insert(0, str(ROOT.parent))
+
+
+def child_env(**overrides):
+    """子进程的环境变量：在 PYTHONPATH 前加上 gemini 的上级目录；overrides 只在环境中未设置时生效"""
+    env = dict(os.environ)
+    for name, value in overrides.items():
+        env.setdefault(name, value)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT.parent), env.get("PYTHONPATH")]))
+    return env
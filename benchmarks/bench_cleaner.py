@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_cleaner.py
+--------------------------------------------------------
+语料清洗基准 (prepare_text/history_cleaner.py)
+1. normalize：原逐字符 unicodedata.category 版本 vs str.translate 映射表，校验两者结果完全一致
+2. 整个目录的清洗：单进程 vs 进程池 (--workers)，校验两者输出文件一致
+--------------------------------------------------------
+Usage:
+    python3 benchmarks/bench_cleaner.py [语料目录] [--workers 4] [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import unicodedata
+from pathlib import Path
+
+from _path import ROOT, add_package_parent
+
+add_package_parent()
+
+from gemini.prepare_text import history_cleaner
+from gemini.prepare_text.history_cleaner import clean_line, normalize
+
+SAMPLE_DIR = ROOT / "prepare_text" / "text"
+
+
+def legacy_normalize(line: str) -> str:
+    """改写前的实现，作为对照"""
+    line = line.strip()
+    line = "".join(c for c in line if not unicodedata.category(c).startswith("C"))
+
+    def f(c):
+        code = ord(c)
+        if 0xFF01 <= code <= 0xFF5E:
+            return chr(code - 0xFEE0)
+        if code == 0x3000:
+            return " "
+        return c
+
+    line = "".join(f(c) for c in line)
+    return unicodedata.normalize("NFKC", line)
+
+
+def bench_normalize(lines, repeat):
+    # 额外覆盖全角、控制字符、零宽字符等边界情况
+    extra = ["　○ＡＢＣ１２３​文本\u0007", "﻿○全角，标点！", "○私用区\U000e0001", "\t ○ "]
+    mismatches = sum(legacy_normalize(l) != normalize(l) for l in lines + extra)
+
+    timings = {}
+    for name, func in (("逐字符 (原实现)", legacy_normalize), ("str.translate", normalize)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for line in lines:
+                func(line)
+        timings[name] = time.perf_counter() - start
+    return mismatches, timings
+
+
+def bench_directory(corpus_dir, workers):
+    history_cleaner.logging.disable(history_cleaner.logging.INFO)
+    outputs, timings = {}, {}
+    for n in (1, workers):
+        with tempfile.TemporaryDirectory() as out_dir:
+            start = time.perf_counter()
+            history_cleaner.main(corpus_dir, Path(out_dir), n)
+            timings[n] = time.perf_counter() - start
+            outputs[n] = {p.name: p.read_bytes() for p in Path(out_dir).iterdir()}
+    return outputs[1] == outputs[workers], timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="history_cleaner 归一化与并行清洗基准")
+    parser.add_argument("corpus", nargs="?", type=Path, default=SAMPLE_DIR)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    lines = []
+    for path in sorted(args.corpus.glob("*.txt")):
+        with path.open(encoding="utf-8") as f:
+            lines.extend(clean_line(l) for l in f if l.strip())
+    print(f"语料: {args.corpus}，{len(lines)} 行，{sum(map(len, lines))} 字")
+
+    mismatches, timings = bench_normalize(lines, args.repeat)
+    base = timings["逐字符 (原实现)"]
+    for name, elapsed in timings.items():
+        print(f"  normalize {name:<16}{elapsed * 1000 / args.repeat:8.1f} ms/轮  {base / elapsed:5.1f}x")
+    print(f"  结果不一致: {mismatches} 行")
+
+    same, timings = bench_directory(args.corpus, args.workers)
+    for n, elapsed in timings.items():
+        print(f"  目录清洗 workers={n:<3}{elapsed * 1000:8.1f} ms")
+    print(f"  输出一致: {'是' if same else '否'}")
+    return 0 if mismatches == 0 and same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_core_info.py
+--------------------------------------------------------
+核心信息抽取基准：原 re.search 正则 vs 规则表 (CoreInfoExtractor)
+1. 读取 prepare_text/text/ 下的样例条文
+2. 分别计时，并统计两者抽取结果是否一致
+3. 构造跨行条文 (条文中间插入换行)，校验换行处的分句边界与原正则一致
+4. 额外构造一条无标点的长条文，观察正则回溯的开销
+--------------------------------------------------------
+Usage:
+    python3 benchmarks/bench_core_info.py [样例文件 ...]
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+from _path import ROOT, add_package_parent
+
+add_package_parent()
+
+from gemini.services.analysis_context import TermMatcher, AnalysisContext
+from gemini.services.core_info_rules import CoreInfoExtractor
+
+SAMPLE_DIR = ROOT / "prepare_text" / "text"
+LEGACY_SUBJECT = r"(○\d+)?\s*(\w+?巡抚|\w+?总督|\w+?按察使|\w+?知府|\w+?知县|皇上|皇帝|朝廷|部议)"
+LEGACY_ACTIONS = ["参奏", "题参", "疏报", "谕令", "谕", "抚恤", "赈济", "剿", "捕", "审", "判", "任免", "调", "革职"]
+
+
+def legacy_extract(text):
+    """原 QingShiluService._extract_core_info 的实现（每次调用都传入正则字符串）"""
+    subject = ""
+    subject_matches = re.search(LEGACY_SUBJECT, text)
+    if subject_matches:
+        subject = subject_matches.group(2) if subject_matches.group(2) else subject_matches.group(1)
+
+    action = ""
+    for keyword in LEGACY_ACTIONS:
+        if keyword in text:
+            action = keyword
+            break
+
+    nature = ""
+    if "不效力" in text or "徇私" in text or "贪暴" in text or "失职" in text:
+        nature = "官员失职问题"
+    elif "被灾" in text or "抚恤" in text or "赈济" in text:
+        nature = "灾害救济事务"
+
+    return {"subject": subject, "action": action, "nature": nature}
+
+
+def load_samples(paths):
+    lines = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            lines.extend(line.strip() for line in f if line.strip())
+    return lines
+
+
+def multiline_texts(texts):
+    """
+    跨行条文：每条样例在不同位置插入换行 (可能切断主体、称谓或动作词)，
+    再加上几条首尾带换行、主体与称谓分处两行的手写条文
+    """
+    lines = []
+    for text in texts:
+        for step in (3, 7, 16):
+            lines.append("\n".join(text[i:i + step] for i in range(0, len(text), step)))
+    lines += [
+        "○12河东\n河道总督奏、参\n奏失职。",
+        "\n○12\n河东河道总督题参知县徇私。\n",
+        "广东\r\n巡抚奏、被\n灾州县、请抚恤。",
+        "  部议\n山西巡抚革职。",
+    ]
+    return lines
+
+
+def run(texts, label, rounds=5):
+    extractor = CoreInfoExtractor()
+    matcher = TermMatcher(extractor.terms)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        legacy = [legacy_extract(t) for t in texts]
+    legacy_time = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        rules = [extractor.extract(AnalysisContext(t, matcher, ())) for t in texts]
+    rules_time = (time.perf_counter() - start) / rounds
+
+    same = sum(a == b for a, b in zip(legacy, rules))
+    print(f"[{label}] {len(texts)} 条, 总字符 {sum(map(len, texts))}")
+    print(f"  原正则:  {legacy_time * 1000:8.2f} ms")
+    print(f"  规则表:  {rules_time * 1000:8.2f} ms  (x{legacy_time / rules_time:.1f})")
+    print(f"  结果一致: {same}/{len(texts)}")
+
+
+def main(argv):
+    paths = [Path(p) for p in argv] or sorted(SAMPLE_DIR.glob("*.txt"))
+    texts = load_samples(paths)
+    if not texts:
+        print("未找到样例条文")
+        return
+
+    run(texts, "样例条文")
+    run(multiline_texts(texts), "跨行条文")
+
+    # 长条文：去掉标点和主体称谓后拼接，正则需要在每个起点反复回溯
+    extractor = CoreInfoExtractor()
+    subject_terms = "|".join(extractor.official_titles + extractor.authority_subjects)
+    long_text = re.sub(rf"\W|{subject_terms}", "", "".join(texts[:20]))
+    run([long_text], "无标点长条文", rounds=1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_import.py
+--------------------------------------------------------
+services 包冷启动导入耗时检查
+1. 每轮启动一个新的 Python 进程执行 import gemini.services，取多轮中的最小值
+2. 检查导入后是否加载了任何 Qt (PySide6) 模块
+3. 导入了 Qt 或耗时超过 --budget-ms 时以非零状态退出，可直接放进 CI
+--------------------------------------------------------
+Usage:
+    python3 benchmarks/bench_import.py [--rounds 5] [--budget-ms 500] [--module gemini.services]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from _path import child_env
+
+# 子进程中执行：计时导入并报告已加载的 Qt 模块
+CHILD_CODE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+qt_modules = sorted(m for m in sys.modules if m.split('.')[0] in ('PySide6', 'shiboken6'))
+print(json.dumps({{"ms": elapsed * 1000, "qt": qt_modules}}))
+"""
+
+
+def measure(module):
+    env = child_env()
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE.format(module=module)],
+        env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} 失败:\n{completed.stderr.strip()}")
+    # services 导入时会打印 INFO 信息，结果取最后一行
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="services 包冷启动导入耗时检查")
+    parser.add_argument("--module", default="gemini.services")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="允许的最长导入耗时 (毫秒)")
+    args = parser.parse_args()
+
+    try:
+        samples = [measure(args.module) for _ in range(args.rounds)]
+    except RuntimeError as e:
+        print(f"  失败：{e}")
+        return 1
+    best = min(sample["ms"] for sample in samples)
+    qt_modules = sorted({m for sample in samples for m in sample["qt"]})
+
+    print(f"import {args.module}: 最小 {best:.1f} ms, 最大 {max(s['ms'] for s in samples):.1f} ms ({args.rounds} 轮)")
+
+    failed = False
+    if qt_modules:
+        print(f"  失败：导入了 Qt 模块 {qt_modules[:5]}{' ...' if len(qt_modules) > 5 else ''}")
+        failed = True
+    if best > args.budget_ms:
+        print(f"  失败：超过预算 {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print(f"  通过：未导入 Qt，耗时在预算 {args.budget_ms:.0f} ms 以内")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
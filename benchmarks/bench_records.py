@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_records.py
+--------------------------------------------------------
+条文记录的内存占用基准 (services/records.py)
+1. 批量条目：原 dict 结构 vs BatchArticle + AnalysisRecord + Recommendation
+2. 已分类条目：原 dict 结构 vs ClassifiedEntry
+用 tracemalloc 统计保留 N 条记录新增的内存，并校验 to_dict() 与原结构一致
+--------------------------------------------------------
+Usage:
+    python3 benchmarks/bench_records.py [-n 100000]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+from _path import add_package_parent
+
+add_package_parent()
+
+from gemini.services.records import BatchArticle, ClassifiedEntry
+
+TEXT = "○201广东布政使史奕昂奏、粤东塘汛。旧制烟墩、砌以碎石土砖。望楼、用木建造。"
+# 分类键字符串由 CategoryRegistry 统一生成，各条文的推荐共用同一批字符串对象
+CATEGORIES = [
+    (f"事务类-赈灾与民生保障-{l3}", f"0/赈灾与民生保障/{l3}", "事务类", "赈灾与民生保障", l3)
+    for l3 in ("赈灾", "民生工程", "蠲免")
+]
+
+
+def batch_dict(i):
+    """批量界面中一条已分析条文的原 dict 结构 (推荐阶段 + 关键词 + 标签)"""
+    recommendations = [
+        {
+            "category": display_key, "category_id": cid, "classificationKey": save_key,
+            "level1": l1, "level2": l2, "level3": l3,
+            "score": 12.5, "reason": "民生", "matchedKeywords": ["赈济", "饥民"],
+        }
+        for cid, (display_key, save_key, l1, l2, l3) in enumerate(CATEGORIES)
+    ]
+    return {
+        "article_id": f"抽取结果_{i}",
+        "originalText": TEXT,
+        "source_file": "/data/抽取结果_1_100_带序号.txt",
+        "analysis": {
+            "keywords": ["赈济", "饥民"],
+            "tags": {"nature": {}, "domain": {}, "labels": [], "matchedKeywords": {}},
+            "recommendations": recommendations,
+        },
+        "classification_key": None,
+    }
+
+
+def classified_dict(i):
+    return {"originalText": TEXT, "translation": "N/A", "articleId": f"抽取结果_{i}", "timestamp": 1700000000.0 + i}
+
+
+def measure(build, n):
+    """保留 n 条 build(i) 的结果新增的内存 (字节)；构建过程中的临时对象不计入"""
+    tracemalloc.start()
+    items = [build(i) for i in range(n)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return size
+
+
+def compare(name, make_dict, record_cls, n):
+    # 记录由新建的 dict 转换而来，转换后 dict 被释放；正文、关键词列表等两者都保留的对象计入双方
+    dict_size = measure(make_dict, n)
+    record_size = measure(lambda i: record_cls.from_dict(make_dict(i)), n)
+
+    source = [make_dict(i) for i in range(n)]
+    start = time.perf_counter()
+    records = [record_cls.from_dict(data) for data in source]
+    from_dict_time = time.perf_counter() - start
+    start = time.perf_counter()
+    exported = [record.to_dict() for record in records]
+    to_dict_time = time.perf_counter() - start
+    same = exported == source
+
+    print(f"  {name}")
+    print(f"    dict           {dict_size / n:8.0f} B/条")
+    print(f"    {record_cls.__name__:<15}{record_size / n:8.0f} B/条  {dict_size / record_size:5.1f}x")
+    print(f"    from_dict {from_dict_time * 1e6 / n:.2f} µs/条，to_dict {to_dict_time * 1e6 / n:.2f} µs/条")
+    print(f"    to_dict() 与原结构一致: {'是' if same else '否'}")
+    return same
+
+
+def main():
+    parser = argparse.ArgumentParser(description="条文记录 (__slots__ dataclass) 与 dict 的内存占用对比")
+    parser.add_argument("-n", type=int, default=100_000, help="记录条数")
+    args = parser.parse_args()
+
+    print(f"记录条数: {args.n}")
+    same = compare("批量条目 (含分析结果)", batch_dict, BatchArticle, args.n)
+    same &= compare("已分类条目", classified_dict, ClassifiedEntry, args.n)
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
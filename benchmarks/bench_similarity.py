@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_similarity.py
+--------------------------------------------------------
+相似文本检索基准：索引 (MinHash LSH / 二元组 TF-IDF) vs 暴力扫描 (精确 Jaccard)
+1. 语料：数据目录下 classified_data.json 中的已分类条文，可用 --scale 扩充为合成语料
+2. 查询：prepare_text/text/ 下的样例条文
+3. 输出：建索引耗时、单次查询耗时、相对暴力扫描 top-k 的召回率
+--------------------------------------------------------
+Usage:
+    python3 benchmarks/bench_similarity.py [--index minhash] [--k 3] [--min-sim 0.2] [--scale 20000] [--data-dir DIR]
+"""
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+from _path import ROOT, add_package_parent
+
+add_package_parent()
+
+from gemini.services.similarity_index import SIMILARITY_INDEXES, char_shingles, jaccard
+from gemini.services.constants import CLASSIFIED_DATA_FILENAME, get_data_dir
+
+SAMPLE_DIR = ROOT / "prepare_text" / "text"
+
+
+def load_corpus(scale, data_dir=None, seed=7):
+    corpus_file = Path(get_data_dir(data_dir, create=False)) / CLASSIFIED_DATA_FILENAME
+    with open(corpus_file, encoding="utf-8") as f:
+        data = json.load(f)
+    texts = [entry["originalText"] for v1 in data.values() for v2 in v1.values()
+             for entries in v2.values() for entry in entries]
+
+    # 合成语料：把已有条文按句拼接成新条文，模拟数万条规模
+    rng = random.Random(seed)
+    sentences = [s for t in texts for s in t.split("。") if s]
+    while len(texts) < scale:
+        texts.append("。".join(rng.sample(sentences, rng.randint(3, 8))))
+    return texts
+
+
+def load_queries():
+    queries = []
+    for path in sorted(SAMPLE_DIR.glob("*.txt")):
+        with open(path, encoding="utf-8") as f:
+            queries.extend(line.strip() for line in f if line.strip())
+    return queries
+
+
+def brute_force(query, corpus_shingles, k, shingle_size):
+    query_shingles = char_shingles(query, shingle_size)
+    scored = sorted(((jaccard(query_shingles, s), i) for i, s in enumerate(corpus_shingles)), reverse=True)
+    return scored[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="相似文本检索基准")
+    parser.add_argument("--index", default="minhash", choices=sorted(SIMILARITY_INDEXES))
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--min-sim", type=float, default=0.2, help="只统计暴力扫描中相似度不低于该值的近邻")
+    parser.add_argument("--scale", type=int, default=0, help="将语料扩充到指定条数")
+    parser.add_argument("--data-dir", help="语料所在的数据目录，默认按 services/constants.py 的配置解析")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.scale, args.data_dir)
+    queries = load_queries()
+
+    index = SIMILARITY_INDEXES[args.index]()
+    start = time.perf_counter()
+    for doc_key, text in enumerate(corpus):
+        index.add(doc_key, text)
+    build_time = time.perf_counter() - start
+
+    shingle_size = getattr(index, "shingle_size", 3)
+    corpus_shingles = [char_shingles(t, shingle_size) for t in corpus]
+
+    start = time.perf_counter()
+    approx = [index.query(q, k=args.k) for q in queries]
+    index_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exact = [brute_force(q, corpus_shingles, args.k, shingle_size) for q in queries]
+    brute_time = time.perf_counter() - start
+
+    relevant = hit = 0
+    for found, truth in zip(approx, exact):
+        truth_keys = {i for score, i in truth if score >= args.min_sim}
+        relevant += len(truth_keys)
+        hit += len(truth_keys & {key for key, _ in found})
+
+    print(f"索引: {args.index}, 语料 {len(corpus)} 条, 查询 {len(queries)} 条, k={args.k}")
+    print(f"  建索引:     {build_time:8.2f} s")
+    print(f"  索引查询:   {index_time / len(queries) * 1000:8.2f} ms/条")
+    print(f"  暴力扫描:   {brute_time / len(queries) * 1000:8.2f} ms/条 (不含分片)")
+    if relevant:
+        print(f"  召回率@{args.k} (Jaccard >= {args.min_sim}): {hit / relevant:.3f} ({hit}/{relevant})")
+    else:
+        print(f"  暴力扫描中没有 Jaccard >= {args.min_sim} 的近邻")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_startup.py
+--------------------------------------------------------
+主窗口启动耗时基准
+1. 每轮启动一个新的 Python 进程，导入 main.py 并构建 MainWindow，首次绘制后退出
+2. 各阶段耗时取自 main.py 的 StartupTimer，输出多轮的中位数和最小值
+3. 默认用 offscreen 平台运行，不需要显示器
+--------------------------------------------------------
+Usage:
+    python3 benchmarks/bench_startup.py [--rounds 5] [--data-dir 数据目录]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from _path import child_env
+
+# 子进程中执行：与 main.main() 相同的启动流程，首次绘制后输出 StartupTimer 的记录并退出
+CHILD_CODE = """
+import json, sys
+from gemini import main
+from gemini.services import set_data_dir
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+
+if {data_dir!r}:
+    set_data_dir({data_dir!r})
+app = QApplication(sys.argv[:1])
+main.STARTUP_TIMER.mark("创建 QApplication")
+window = main.MainWindow()
+window.show()
+
+def first_paint():
+    timer = main.STARTUP_TIMER
+    timer.mark("首次绘制")
+    print(json.dumps({{"marks": timer.marks, "total": timer.last - timer.start}}))
+    app.quit()
+
+QTimer.singleShot(0, first_paint)
+app.exec()
+"""
+
+
+def measure(data_dir):
+    env = child_env(QT_QPA_PLATFORM="offscreen")
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE.format(data_dir=data_dir)],
+        env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"启动失败:\n{completed.stderr.strip()}")
+    # 启动过程会打印 INFO 信息，结果取最后一行
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    """各阶段耗时的 (中位数, 最小值) (毫秒)，阶段顺序与 StartupTimer 的记录顺序一致"""
+    labels = [label for label, _ in samples[0]["marks"]]
+    stages = {}
+    for label in labels:
+        times = [dict(sample["marks"])[label] * 1000 for sample in samples]
+        stages[label] = (statistics.median(times), min(times))
+    totals = [sample["total"] * 1000 for sample in samples]
+    stages["合计"] = (statistics.median(totals), min(totals))
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="主窗口各启动阶段的耗时")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--data-dir", default="", help="数据目录，默认按 services/constants.py 的配置解析")
+    args = parser.parse_args()
+
+    try:
+        samples = [measure(args.data_dir) for _ in range(args.rounds)]
+    except RuntimeError as e:
+        print(f"  失败：{e}")
+        return 1
+
+    print(f"启动耗时 ({args.rounds} 轮)")
+    print(f"  {'阶段':<16}{'中位数':>10}{'最小值':>10}")
+    for label, (median_ms, min_ms) in summarize(samples).items():
+        print(f"  {label:<16}{median_ms:>8.1f} ms{min_ms:>8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_ui_load.py
+--------------------------------------------------------
+界面构建基准：QUiLoader 运行时解析 .ui vs build_ui.py 预编译的 Python 类
+1. 先把 ui/*.ui 编译到临时目录 (不影响 ui/compiled/)
+2. 对每个 .ui 分别用两种方式构建控件，取多轮中的中位数
+3. 两种方式构建出的子控件 (objectName) 必须一致
+--------------------------------------------------------
+Usage:
+    QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_ui_load.py [--rounds 20]
+"""
+
+import argparse
+import importlib.util
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from _path import add_package_parent
+
+add_package_parent()
+
+from PySide6 import QtWidgets
+from PySide6.QtCore import QFile, QIODevice, QObject
+from PySide6.QtUiTools import QUiLoader
+
+from gemini.build_ui import UI_DIR, build_all
+
+
+def load_with_uiloader(ui_path):
+    loader = QUiLoader()
+    ui_file = QFile(ui_path)
+    ui_file.open(QIODevice.OpenModeFlag.ReadOnly)
+    widget = loader.load(ui_file)
+    ui_file.close()
+    return widget
+
+
+def load_compiled(form_class, base_class):
+    widget = base_class()
+    form_class().setupUi(widget)
+    return widget
+
+
+def child_names(widget):
+    return sorted(child.objectName() for child in widget.findChildren(QObject) if child.objectName())
+
+
+def median_ms(build, rounds):
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        widget = build()
+        times.append((time.perf_counter() - start) * 1000)
+        widget.deleteLater()
+    QtWidgets.QApplication.processEvents()
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="QUiLoader vs 预编译界面类的构建耗时")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        manifest, _ = build_all(output_dir=output_dir, force=True)
+
+        forms = {}
+        for ui_name, info in manifest.items():
+            spec = importlib.util.spec_from_file_location(info["module"], os.path.join(output_dir, info["module"] + ".py"))
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            forms[ui_name] = (getattr(module, info["class"]), getattr(QtWidgets, info["base"]))
+
+    print(f"{'界面文件':<18}{'QUiLoader':>12}{'预编译':>10}{'加速':>8}  子控件一致")
+    total_loader = total_compiled = 0.0
+    for ui_name, (form_class, base_class) in forms.items():
+        ui_path = os.path.join(UI_DIR, ui_name)
+        same = child_names(load_with_uiloader(ui_path)) == child_names(load_compiled(form_class, base_class))
+
+        loader_ms = median_ms(lambda: load_with_uiloader(ui_path), args.rounds)
+        compiled_ms = median_ms(lambda: load_compiled(form_class, base_class), args.rounds)
+        total_loader += loader_ms
+        total_compiled += compiled_ms
+        print(f"{ui_name:<20}{loader_ms:>10.2f} ms{compiled_ms:>8.2f} ms{loader_ms / compiled_ms:>7.1f}x  {'是' if same else '否'}")
+
+    print(f"{'合计':<20}{total_loader:>10.2f} ms{total_compiled:>8.2f} ms{total_loader / total_compiled:>7.1f}x")
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+build_ui.py
+--------------------------------------------------------
+界面预编译：用 pyside6-uic 把 ui/*.ui 编译为 Python 模块
+1. 输出到 ui/compiled/ui_<名称>.py，并写入 manifest.json (类名、根控件类型、.ui 的 sha1)
+2. 程序启动时 ui_utils.create_ui_widget 优先使用编译结果，省去 QUiLoader 每次解析 XML 的开销
+3. .ui 在编译后被修改 (sha1 不一致) 或未编译时，自动回退到 QUiLoader，不会加载过期的界面
+--------------------------------------------------------
+Usage:
+    python3 build_ui.py [--force] [--clean] [--output-dir ui/compiled]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+UI_DIR = os.path.join(ROOT, "ui")
+DEFAULT_OUTPUT_DIR = os.path.join(UI_DIR, "compiled")
+MANIFEST_FILENAME = "manifest.json"
+
+
+def find_uic():
+    """返回调用 pyside6-uic 的命令"""
+    uic = shutil.which("pyside6-uic")
+    if uic:
+        return [uic]
+    # 未把 PySide6 的脚本目录加入 PATH 时，通过当前解释器调用
+    return [sys.executable, "-m", "PySide6.scripts.pyside_tool", "uic"]
+
+
+def read_ui_root(ui_path):
+    """返回 .ui 根控件的 (类型, 对象名)，例如 ("QWidget", "StatsTabWidget")"""
+    widget = ET.parse(ui_path).getroot().find("widget")
+    if widget is None:
+        raise ValueError(f"{ui_path} 中没有根控件")
+    return widget.get("class"), widget.get("name")
+
+
+def file_sha1(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def load_manifest(output_dir):
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compile_ui(ui_path, output_dir, uic=None):
+    """编译单个 .ui，返回其 manifest 条目"""
+    base_class, object_name = read_ui_root(ui_path)
+    module = "ui_" + os.path.splitext(os.path.basename(ui_path))[0]
+    output_path = os.path.join(output_dir, module + ".py")
+
+    completed = subprocess.run(
+        (uic or find_uic()) + [ui_path, "-o", output_path],
+        capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"pyside6-uic 编译 {ui_path} 失败: {completed.stderr.strip()}")
+
+    return {
+        "module": module,
+        "class": f"Ui_{object_name}",
+        "base": base_class,
+        "sha1": file_sha1(ui_path),
+    }
+
+
+def build_all(ui_dir=UI_DIR, output_dir=DEFAULT_OUTPUT_DIR, force=False):
+    """编译 ui_dir 下所有 .ui (未修改的跳过)，写入 manifest.json，返回 (manifest, 本次编译的文件列表)"""
+    os.makedirs(output_dir, exist_ok=True)
+    old_manifest = load_manifest(output_dir)
+    manifest, compiled = {}, []
+    uic = find_uic()
+
+    for name in sorted(os.listdir(ui_dir)):
+        if not name.endswith(".ui"):
+            continue
+        ui_path = os.path.join(ui_dir, name)
+        entry = old_manifest.get(name)
+        up_to_date = (
+            entry is not None
+            and entry["sha1"] == file_sha1(ui_path)
+            and os.path.exists(os.path.join(output_dir, entry["module"] + ".py"))
+        )
+        if up_to_date and not force:
+            manifest[name] = entry
+            continue
+        manifest[name] = compile_ui(ui_path, output_dir, uic)
+        compiled.append(name)
+
+    with open(os.path.join(output_dir, MANIFEST_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest, compiled
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="用 pyside6-uic 预编译 ui/*.ui")
+    parser.add_argument("--force", action="store_true", help="忽略 sha1，全部重新编译")
+    parser.add_argument("--clean", action="store_true", help="删除编译结果 (之后启动时使用 QUiLoader)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    args = parser.parse_args(argv)
+
+    if args.clean:
+        shutil.rmtree(args.output_dir, ignore_errors=True)
+        print(f"已删除 {args.output_dir}")
+        return 0
+
+    try:
+        manifest, compiled = build_all(output_dir=args.output_dir, force=args.force)
+    except (RuntimeError, ValueError, OSError) as e:
+        print(f"错误：{e}", file=sys.stderr)
+        return 1
+
+    print(f"共 {len(manifest)} 个界面文件，本次编译 {len(compiled)} 个: {', '.join(compiled) or '无'}")
+    print(f"编译结果位于 {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,12 @@
 # /Users/luckpuppy/Desktop/UItools/gemini/main.py
 
+import time
+# 启动计时起点：尽量早，包含后面所有模块的导入时间
+_STARTUP_T0 = time.perf_counter()
+
 import sys
 import os
+import argparse
 # --- 路径修正代码 START ---
 # 获取当前脚本 (main.py) 所在的目录
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -15,15 +20,14 @@ from PySide6.QtWidgets import (
     QApplication, QMainWindow, QMessageBox, QTabWidget, QWidget, QLabel
 )
 from PySide6.QtGui import QAction
-from PySide6.QtCore import QFile
-from PySide6.QtUiTools import QUiLoader
+from PySide6.QtCore import QTimer
 
 # 导入核心服务类 (通过 services/__init__.py 桥接导入)
 # 保持不变，但现在它们指向拆分后的类
-from gemini.services import QingShiluService
+from gemini.services import QingShiluService, set_data_dir
 
 # 导入拆分后的模块
-from gemini.ui_utils import load_ui_file # 从 gemini 目录导入
+from gemini.ui_utils import create_ui_widget # 从 gemini 目录导入
 from gemini.widgets.single_tab import SingleTabWidget
 from gemini.widgets.batch_tab import BatchTabWidget
 from gemini.widgets.keyword_tab import KeywordTabWidget
@@ -36,8 +40,32 @@ class CategoryTabWidget(QWidget):
         super().__init__(parent)
         QLabel("分类管理 - 待实现", self)
 
+
+class StartupTimer:
+    """启动耗时记录：依次记录各阶段耗时，首次绘制后打印报告"""
+
+    def __init__(self, start):
+        self.start = start
+        self.last = start
+        self.marks = []
+
+    def mark(self, label):
+        now = time.perf_counter()
+        self.marks.append((label, now - self.last))
+        self.last = now
+
+    def report(self):
+        print("INFO: 启动耗时")
+        for label, elapsed in self.marks:
+            print(f"  {label:<16} {elapsed * 1000:8.1f} ms")
+        print(f"  {'合计':<16} {(self.last - self.start) * 1000:8.1f} ms")
+
+
+STARTUP_TIMER = StartupTimer(_STARTUP_T0)
+STARTUP_TIMER.mark("导入模块")
+
 # ... (MainWindow 类和其他代码保持不变) ...
-# 注意：MainWindow 类中的 load_ui_file 需要从 ui_utils 导入，已修正
+# 注意：MainWindow 类中的 create_ui_widget 需要从 ui_utils 导入，已修正
 
 
 # =======================================================
@@ -46,18 +74,15 @@ class CategoryTabWidget(QWidget):
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.loader = QUiLoader()
         self.ui_loaded = False
 
         # --- 实例化 Service 层，供所有 Tab 共享 ---
         self.qingshilu_service = QingShiluService()
+        STARTUP_TIMER.mark("加载数据 (DataModel)")
 
         # --- 1. 加载主窗口外壳 ---
-        ui_file = load_ui_file(self.loader, "main_window.ui", self)
-        if ui_file is None: return
-
-        temp_window = self.loader.load(ui_file)
-        ui_file.close()
+        # 优先使用 build_ui.py 预编译的界面类，未编译时回退到 QUiLoader
+        temp_window = create_ui_widget("main_window.ui")
 
         if temp_window is None:
             QMessageBox.critical(self, "加载错误", "无法从 main_window.ui 加载内容。")
@@ -92,6 +117,7 @@ class MainWindow(QMainWindow):
         if self.mainTabWidget:
             self._add_tab_modules()
             self._connect_menu_actions()
+        STARTUP_TIMER.mark("加载界面 (.ui)")
 
     def _add_tab_modules(self):
         """实例化并添加所有 Tab 模块到 QTabWidget"""
@@ -127,11 +153,26 @@ class MainWindow(QMainWindow):
                 )
 
 
+def _report_first_paint():
+    STARTUP_TIMER.mark("首次绘制")
+    STARTUP_TIMER.report()
+
+
 def main():
-    app = QApplication(sys.argv)
+    # 自己的参数先解析掉，其余留给 Qt (如 -style)
+    parser = argparse.ArgumentParser(description="清实录条文分类工具")
+    parser.add_argument("--data-dir", help="数据目录，默认按 services/constants.py 的配置解析")
+    args, qt_argv = parser.parse_known_args()
+    if args.data_dir:
+        set_data_dir(args.data_dir)
+
+    app = QApplication(sys.argv[:1] + qt_argv)
+    STARTUP_TIMER.mark("创建 QApplication")
     window = MainWindow()
     if window.ui_loaded:
         window.show()
+        # 事件循环处理完首批绘制事件后执行，记为首次绘制
+        QTimer.singleShot(0, _report_first_paint)
     sys.exit(app.exec())
 
 
@@ -1,10 +1,162 @@
+"""
+extract_text_by_range.py
+--------------------------------------------------------
+按 ○序号 范围抽取条文
+1. 首次使用时为源文件建立侧车偏移索引 (<源文件>.idx.json，序号 -> 字节偏移)，源文件修改后自动重建
+2. 任意范围都通过索引 seek 直接读取，不要求序号有序
+3. 一次可抽取多个范围，或用 --chunk-size 把整个文件切分为 抽取结果_{start}_{end}_带序号.txt
+--------------------------------------------------------
+Usage:
+    python3 extract_text_by_range.py <源文件> 701-800 [801-900 ...]
+    python3 extract_text_by_range.py <源文件> --chunk-size 100 [201-800]
+"""
+
+import argparse
+import bisect
+import codecs
+import json
 import os
 import re  # 导入正则表达式库，用于更可靠地解析序号
 
+# 行开头的 ○序号 (允许前导空白，与 strip() 后再匹配等价)
+SERIAL_RE = re.compile(r'\s*○(\d+)')
+INDEX_SUFFIX = '.idx.json'
+INDEX_VERSION = 2  # 2: 首行的 UTF-8 BOM 不计入条目
+
+
+# ==========================================================
+# 偏移索引：序号 -> 行在源文件中的字节偏移
+# ==========================================================
+
+def index_path_for(input_filepath):
+    """源文件对应的索引文件 (与源文件放在同一目录)"""
+    return input_filepath + INDEX_SUFFIX
+
+
+def build_offset_index(input_filepath, encoding='utf-8'):
+    """
+    扫描一遍源文件，记录每个 "○序号" 行的 (序号, 字节偏移, 字节长度)，按 (序号, 偏移) 排序。
+    序号不要求有序，也允许重复 (重复的序号都会被抽取)。
+    UTF-8 文件开头的 BOM 不属于第一行：第一行从 BOM 之后开始记录，否则其序号无法匹配。
+    """
+    entries = []
+    offset = 0
+    skip_bom = codecs.lookup(encoding).name in ('utf-8', 'utf-8-sig')
+    with open(input_filepath, 'rb') as infile:
+        for raw in infile:
+            if skip_bom:
+                skip_bom = False
+                if raw.startswith(codecs.BOM_UTF8):
+                    offset += len(codecs.BOM_UTF8)
+                    raw = raw[len(codecs.BOM_UTF8):]
+            match = SERIAL_RE.match(raw.decode(encoding))
+            if match:
+                entries.append((int(match.group(1)), offset, len(raw)))
+            offset += len(raw)
+    entries.sort()
+    return entries
+
+
+def load_offset_index(input_filepath, encoding='utf-8', rebuild=False):
+    """
+    读取侧车索引文件；不存在、源文件已修改 (大小或修改时间不同) 或 rebuild=True 时重建并写回。
+    返回按序号排序的 [(序号, 偏移, 长度), ...]
+    """
+    stat = os.stat(input_filepath)
+    index_file = index_path_for(input_filepath)
+    if not rebuild and os.path.exists(index_file):
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if (data.get('version') == INDEX_VERSION and data.get('encoding') == encoding
+                    and data.get('source_size') == stat.st_size and data.get('source_mtime_ns') == stat.st_mtime_ns):
+                return [tuple(entry) for entry in data['entries']]
+        except (OSError, ValueError, KeyError):
+            pass  # 索引损坏时重建
+
+    entries = build_offset_index(input_filepath, encoding)
+    data = {
+        'version': INDEX_VERSION,
+        'encoding': encoding,
+        'source_size': stat.st_size,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'entries': entries,
+    }
+    try:
+        tmp_file = index_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_file, index_file)
+    except OSError as e:
+        # 源文件所在目录不可写时仍可使用内存中的索引
+        print(f"警告：无法写入索引文件 {index_file}: {e}")
+    return entries
+
+
+def _strip_line_ending(raw):
+    """去掉一行末尾的换行符 (\n 或 \r\n)，与文本模式读取的结果一致"""
+    if raw.endswith(b'\r\n'):
+        return raw[:-2]
+    if raw.endswith(b'\n'):
+        return raw[:-1]
+    return raw
+
+
+def _read_entries(infile, entries, encoding):
+    """按文件顺序读取若干行；文件中相邻的行合并为一次 seek + read"""
+    lines = []
+    i = 0
+    while i < len(entries):
+        start = entries[i][1]
+        end = start + entries[i][2]
+        j = i + 1
+        while j < len(entries) and entries[j][1] == end:
+            end += entries[j][2]
+            j += 1
+        infile.seek(start)
+        block = infile.read(end - start)
+        for _, offset, length in entries[i:j]:
+            lines.append(_strip_line_ending(block[offset - start:offset - start + length]).decode(encoding))
+        i = j
+    return lines
+
+
+def extract_ranges(input_filepath, ranges, encoding='utf-8', index=None):
+    """
+    一次抽取多个序号范围。ranges 为 [(起始序号, 结束序号), ...] (均包含)。
+    返回 {(start, end): [原始行, ...]}，每个范围内的行保持源文件中的顺序。
+    """
+    index = index if index is not None else load_offset_index(input_filepath, encoding)
+    numbers = [entry[0] for entry in index]
+    results = {}
+    with open(input_filepath, 'rb') as infile:
+        for start_num, end_num in ranges:
+            lo = bisect.bisect_left(numbers, start_num)
+            hi = bisect.bisect_right(numbers, end_num)
+            selected = sorted(index[lo:hi], key=lambda entry: entry[1])
+            results[(start_num, end_num)] = _read_entries(infile, selected, encoding)
+    return results
+
+
+def chunk_ranges(index, chunk_size, start_num=None, end_num=None):
+    """把索引覆盖的序号区间按 chunk_size 切分，例如 201-300, 301-400, ..."""
+    if not index:
+        return []
+    start_num = index[0][0] if start_num is None else start_num
+    end_num = index[-1][0] if end_num is None else end_num
+    return [(n, min(n + chunk_size - 1, end_num)) for n in range(start_num, end_num + 1, chunk_size)]
+
+
+def _write_lines(output_filepath, lines, encoding):
+    with open(output_filepath, 'w', encoding=encoding) as outfile:
+        # 每行末尾添加换行符，以便写入文件
+        outfile.writelines(line + '\n' for line in lines)
+
 
 def extract_text_by_range(input_filepath, start_num, end_num, encoding='utf-8', output_filepath=None):
     """
     根据行开头的序号范围，抽取文件中的部分文本，并保持原有的“○[序号]”前缀。
+    通过侧车偏移索引 (见 load_offset_index) 直接定位，无需逐行扫描整个文件。
 
     :param input_filepath: str, 带有序号的前缀的txt文件路径。
     :param start_num: int, 抽取的起始序号（包含）。
@@ -14,57 +166,17 @@ def extract_text_by_range(input_filepath, start_num, end_num, encoding='utf-8',
     :return: list, 抽取出的文本列表。
     """
 
-    extracted_lines = []
-
     try:
-        # 1. 读取文件内容
-        with open(input_filepath, 'r', encoding=encoding) as infile:
-            for line in infile:
-                # 保留原始行，因为我们需要它来输出完整的文本
-                original_line = line
-                stripped_line = line.strip()
-
-                # 跳过空行
-                if not stripped_line:
-                    continue
-
-                # 2. 解析行号
-                if stripped_line.startswith('○'):
-                    # 尝试用正则表达式匹配：○ 后面紧跟着的数字
-                    match = re.match(r'○(\d+)', stripped_line)
-
-                    if match:
-                        try:
-                            # 提取匹配到的序号
-                            num_str = match.group(1)
-                            current_num = int(num_str)
-
-                            # **核心修改点：**
-                            # 3. 检查序号是否在范围内
-                            if start_num <= current_num <= end_num:
-                                # **不再提取子字符串，而是直接添加原始行内容。**
-                                # 注意：如果原始行带有换行符，我们不需要额外添加 \n
-                                extracted_lines.append(original_line.rstrip('\n'))  # 移除行末换行符，后续统一添加
-
-                            # 优化：如果当前序号已经超过结束范围，就停止读取
-                            if current_num > end_num:
-                                break
-
-                        except ValueError:
-                            continue
-                        except Exception:
-                            continue
-
-        # 4. 输出结果
+        extracted_lines = extract_ranges(input_filepath, [(start_num, end_num)], encoding)[(start_num, end_num)]
+
+        # 输出结果
         if not extracted_lines:
             print(f"在 {input_filepath} 中未找到序号范围 {start_num}-{end_num} 内的文本。")
             return []
 
         if output_filepath:
             # 写入到文件
-            with open(output_filepath, 'w', encoding=encoding) as outfile:
-                # 每行末尾添加换行符，以便写入文件
-                outfile.writelines([line + '\n' for line in extracted_lines])
+            _write_lines(output_filepath, extracted_lines, encoding)
             print(f"\n文本抽取成功！")
             print(f"抽取范围: {start_num}-{end_num}")
             print(f"输出文件: {output_filepath}")
@@ -85,22 +197,56 @@ def extract_text_by_range(input_filepath, start_num, end_num, encoding='utf-8',
         return []
 
 
-# ==========================================================
-# 使用示例：使用您的实际路径和范围
-# ==========================================================
-
-# 1. 您的实际文件路径
-input_file_with_numbers = r'/Users/luckpuppy/Desktop/扩充训练集/0926结构化训练集/2-人工/Train_nonriots_非动乱-人工遍历.txt'
-
-# 2. 只需要修改起始和结束序号
-start = 701
-end = 800
+def _parse_range(text):
+    start, sep, end = text.partition('-')
+    try:
+        start_num, end_num = int(start), int(end if sep else start)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的序号范围: {text} (应为 起始-结束，例如 701-800)")
+    if start_num > end_num:
+        raise argparse.ArgumentTypeError(f"起始序号大于结束序号: {text}")
+    return start_num, end_num
 
-# 3. 指定输出文件路径
-output_template = r'/Users/luckpuppy/Desktop/抽取结果_{start}_{end}_带序号.txt'  # 建议修改文件名，以区分上次的输出
 
-output_file = output_template.format(start=start, end=end)
+# ==========================================================
+# 命令行入口
+# ==========================================================
 
-# 调用函数（保存到文件）
-extract_text_by_range(input_file_with_numbers, start, end,
-                      output_filepath=output_file)
\ No newline at end of file
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="按 ○序号 范围抽取条文 (使用侧车偏移索引)")
+    parser.add_argument("input", help="带序号前缀的 txt 文件")
+    parser.add_argument("ranges", nargs="*", type=_parse_range, help="序号范围，例如 701-800 801-900")
+    parser.add_argument("--chunk-size", type=int, help="把整个文件 (或 ranges 给出的唯一区间) 按该大小切分为多个范围")
+    parser.add_argument("--output-template", default="抽取结果_{start}_{end}_带序号.txt",
+                        help="输出文件名模板，可使用 {start} {end}；为空字符串时打印到控制台")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--rebuild-index", action="store_true", help="忽略已有索引，重新扫描源文件")
+    args = parser.parse_intermixed_args(argv)
+
+    index = load_offset_index(args.input, args.encoding, rebuild=args.rebuild_index)
+    ranges = args.ranges
+    if args.chunk_size:
+        if len(ranges) > 1:
+            parser.error("--chunk-size 只能与一个范围一起使用")
+        ranges = chunk_ranges(index, args.chunk_size, *(ranges[0] if ranges else (None, None)))
+    if not ranges:
+        parser.error("请指定序号范围或 --chunk-size")
+
+    if not args.output_template:
+        for start_num, end_num in ranges:
+            extract_text_by_range(args.input, start_num, end_num, args.encoding)
+        return 0
+
+    results = extract_ranges(args.input, ranges, args.encoding, index)
+    for (start_num, end_num), lines in results.items():
+        if not lines:
+            print(f"在 {args.input} 中未找到序号范围 {start_num}-{end_num} 内的文本。")
+            continue
+        output_file = args.output_template.format(start=start_num, end=end_num)
+        _write_lines(output_file, lines, args.encoding)
+        print(f"抽取范围: {start_num}-{end_num}，{len(lines)} 条 -> {output_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,28 +9,39 @@ history_cleaner.py
 2. 全局去重，仅保留首次出现
 3. 输出最终条文数
 4. 跳过隐藏/临时文件
-5. 结果保存到 ~/Desktop/{原文件名}_cleaned.txt
+5. 结果保存到 ~/Desktop/{原文件名}_cleaned.txt（可用 --output-dir 指定）
+6. 逐行流式读写，内存占用与文件大小无关；目录下的多个文件由进程池并行处理
+7. --hash-store：跨文件全局去重。已清洗条文的 64 位哈希保存在磁盘上的哈希库中，
+   之后清洗的新文件会与此前所有语料去重，无需重新读取旧文本
 --------------------------------------------------------
 Usage:
-    python3 history_cleaner.py  <文件或文件夹路径>
+    python3 history_cleaner.py  <文件或文件夹路径> [--output-dir DIR] [--workers N] [--hash-store corpus.hashes]
 """
 
+import argparse
+import bisect
+import hashlib
+import os
 import re
 import sys
 import logging
+import unicodedata
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # ---------- 日志配置 ----------
-logging.basicConfig(
-    level=logging.INFO,
-    format="[%(levelname)s] %(message)s"
-)
+# basicConfig 只在脚本入口调用，作为库被 services 导入时不改动全局日志配置
 log = logging.getLogger("HistoryCleaner")
 
 # ---------- 常量 ----------
 DESKTOP = Path.home() / "Desktop"
 SKIP_PREFIXES = (".", "~")      # 跳过隐藏/临时文件
 MIN_SIZE = 30                   # 小于 30 Byte 的文件直接忽略
+WRITE_BUFFER = 1 << 20          # 输出文件的写缓冲 (1 MiB)
+
+_SERIAL_RE = re.compile(r'○\d+')
+_CIRCLES_RE = re.compile(r'○+')
 
 # ---------- 功能函数 ----------
 def clean_line(line: str) -> str:
@@ -42,65 +53,101 @@ def clean_line(line: str) -> str:
         123 文本      -> ○123 文本
     """
     # 第一步：把所有 ○数字 片段一次性干掉
-    line = re.sub(r'○\d+', '', line.lstrip())
+    line = _SERIAL_RE.sub('', line.lstrip())
     # 第二步：把可能出现的连续多个 ○ 压成一个
-    line = re.sub(r'○+', '○', line)
+    line = _CIRCLES_RE.sub('○', line)
     line = line.strip()
     # 兜底：开头无 ○ 就补一个
     if not line.startswith('○'):
         line = '○' + line
     return line
-def read_and_clean(file_path: Path) -> list[str]:
+# ---------- 归一化 ----------
+class _NormalizeTable(dict):
     """
-    读取文件，逐行清洗，返回清洗后的条文列表
-    空行自动跳过
+    str.translate 用的映射表：删除控制/格式等 C 类字符，全角 ASCII 与全角空格转半角。
+    按需填充：每个字符只在第一次出现时查一次 unicodedata，之后都是 C 层的 dict 查找。
     """
-    try:
-        with file_path.open(encoding="utf-8") as f:
-            lines = [clean_line(l) for l in f if l.strip()]
-        log.info("已读取 %s，原始行数 %d", file_path.name, len(lines))
-        return lines
-    except Exception as e:
-        log.error("读取文件失败 %s: %s", file_path, e)
-        return []
 
-import unicodedata
+    def __missing__(self, code):
+        if unicodedata.category(chr(code)).startswith("C"):
+            value = None                  # None 表示删除该字符
+        elif 0xFF01 <= code <= 0xFF5E:    # 全角 ASCII 区 -> 半角
+            value = code - 0xFEE0
+        elif code == 0x3000:              # 全角空格
+            value = 0x20
+        else:
+            value = code
+        self[code] = value
+        return value
+
+
+_NORMALIZE_TABLE = _NormalizeTable()
+
 
-# ---------- 归一化 ----------
 def normalize(line: str) -> str:
-    line = line.strip()
-    line = "".join(c for c in line if not unicodedata.category(c).startswith("C"))
-
-    def f(c):
-        code = ord(c)
-        # 全角 ASCII 区 -> 半角
-        if 0xFF01 <= code <= 0xFF5E:
-            half = code - 0xFEE0          # 正确偏移
-            return chr(half)
-        if code == 0x3000:                # 全角空格
-            return " "
-        return c
-
-    line = "".join(f(c) for c in line)
+    line = line.strip().translate(_NORMALIZE_TABLE)
     return unicodedata.normalize("NFKC", line)
 
-# ---------- 去重（归一化键版） ----------
-def dedup(lines: list[str]) -> tuple[list[str], int]:
+def key_hash(key: str) -> int:
+    """归一化键的 64 位 blake2b 哈希 (与 services/content_index.py 的内容哈希一致)"""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+# ---------- 持久化哈希库（全局去重） ----------
+class HashStore:
     """
-    按归一化后的 key 去重，顺序不变；
-    返回 (去重后原始行列表, 被剔除的重复条数)
+    磁盘上的 64 位哈希集合：文件头 HASH_STORE_MAGIC + 升序排列的小端 uint64。
+    已有哈希读入一个有序 array('Q') (每条 8 字节)，用二分查找判断是否存在；
+    本次新增的哈希先放在 set 中，save() 时归并后整体写回 (先写临时文件再替换)。
     """
-    seen = set()
-    deduped = []
-    dup_count = 0
-    for raw in lines:
-        key = normalize(raw)
-        if key not in seen:
-            seen.add(key)
-            deduped.append(raw)
-        else:
-            dup_count += 1
-    return deduped, dup_count
+
+    MAGIC = b"QSLHASH1"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._sorted = array("Q")
+        self._added = set()
+        if self.path.exists():
+            self._load()
+
+    def _load(self) -> None:
+        with self.path.open("rb") as f:
+            if f.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError(f"不是有效的哈希库文件: {self.path}")
+            self._sorted.frombytes(f.read())
+        if sys.byteorder == "big":
+            self._sorted.byteswap()
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._added)
+
+    def __contains__(self, digest: int) -> bool:
+        if digest in self._added:
+            return True
+        i = bisect.bisect_left(self._sorted, digest)
+        return i < len(self._sorted) and self._sorted[i] == digest
+
+    def add(self, digest: int) -> bool:
+        """加入哈希；已存在时返回 False"""
+        if digest in self:
+            return False
+        self._added.add(digest)
+        return True
+
+    def save(self) -> None:
+        if not self._added and self.path.exists():
+            return
+        merged = array("Q", sorted(self._sorted.tolist() + list(self._added)))
+        if sys.byteorder == "big":
+            merged.byteswap()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            f.write(self.MAGIC)
+            merged.tofile(f)
+        os.replace(tmp_path, self.path)
+        if sys.byteorder == "big":
+            merged.byteswap()
+        self._sorted, self._added = merged, set()
 
 def should_skip(path: Path) -> bool:
     """
@@ -116,39 +163,131 @@ def should_skip(path: Path) -> bool:
         return True
     return False
 
-def process_single_file(file_path: Path) -> None:
+def clean_file(file_path: Path, out_dir: Path = DESKTOP, with_hashes: bool = False) -> dict:
     """
-    处理单个文件：清洗 -> 去重 -> 写结果到桌面
+    流式处理单个文件：逐行 清洗 -> 文件内去重 -> 写出，不在内存中保留整份条文。
+    结果先写到临时文件，成功后再替换为 {原文件名}_cleaned.txt，中途失败不会留下半个结果。
+    返回统计 {"file", "output", "lines", "dups", "kept", "error"}，
+    便于在进程池的子进程中调用 (日志统一由主进程输出)。
+    with_hashes=True 时另返回 "hashes"：输出各行归一化键的哈希 (array('Q') 的字节串)，供全局去重使用；
+    此时结果留在临时文件 "pending" 中，由 apply_global_dedup 决定是否写出，已有的输出文件在此之前保持不变。
     """
-    if should_skip(file_path):
-        return
+    out_file = out_dir / f"{file_path.stem}_cleaned.txt"
+    tmp_file = out_file.with_name(out_file.name + ".tmp")
+    stats = {"file": str(file_path), "output": str(out_file), "lines": 0, "dups": 0, "kept": 0, "error": None}
+    hashes = array("Q")
 
-    lines = read_and_clean(file_path)
-    if not lines:
-        log.warning("文件 %s 无有效内容，已跳过", file_path.name)
-        return
+    seen = set()
+    try:
+        with file_path.open(encoding="utf-8") as src, \
+                tmp_file.open("w", encoding="utf-8", buffering=WRITE_BUFFER) as dst:
+            for raw in src:
+                if not raw.strip():
+                    continue
+                line = clean_line(raw)
+                stats["lines"] += 1
+                key = normalize(line)
+                if key in seen:
+                    stats["dups"] += 1
+                    continue
+                seen.add(key)
+                dst.write(line + "\n")
+                stats["kept"] += 1
+                if with_hashes:
+                    hashes.append(key_hash(key))
+        if not stats["lines"]:
+            tmp_file.unlink()
+        elif with_hashes:
+            stats["pending"] = str(tmp_file)
+        else:
+            os.replace(tmp_file, out_file)
+    except Exception as e:
+        stats["error"] = str(e)
+        tmp_file.unlink(missing_ok=True)
+    if with_hashes:
+        stats["hashes"] = hashes.tobytes()
+    return stats
+
+def apply_global_dedup(stats: dict, store: HashStore) -> dict:
+    """
+    用哈希库对 clean_file 的结果做跨文件去重 (按文件顺序在主进程中调用)：
+    剔除此前语料中已出现过的条文，并把本文件的新哈希加入哈希库，然后把临时文件中的结果写出。
+    全部条文都已出现过时 (例如重复清洗同一批文件) 不输出，已有的输出文件保持不变、不会被删除。
+    """
+    hashes = array("Q")
+    hashes.frombytes(stats.pop("hashes", b""))
+    pending = stats.pop("pending", None)
+    stats["global_dups"] = 0
+    if stats["error"] or pending is None:
+        return stats
 
-    deduped, dup_count = dedup(lines)
-    out_file = DESKTOP / f"{file_path.stem}_cleaned.txt"
+    pending = Path(pending)
+    out_file = Path(stats["output"])
+    keep = [store.add(digest) for digest in hashes]
+    stats["global_dups"] = keep.count(False)
+    stats["kept"] -= stats["global_dups"]
+    if not stats["kept"]:
+        pending.unlink()
+        return stats
+    if not stats["global_dups"]:
+        os.replace(pending, out_file)
+        return stats
 
+    filtered = out_file.with_name(out_file.name + ".dedup.tmp")
     try:
-        with out_file.open("w", encoding="utf-8") as f:
-            for line in deduped:
-                f.write(line + "\n")
+        with pending.open(encoding="utf-8") as src, \
+                filtered.open("w", encoding="utf-8", buffering=WRITE_BUFFER) as dst:
+            for line, kept in zip(src, keep):
+                if kept:
+                    dst.write(line)
+        os.replace(filtered, out_file)
+    finally:
+        filtered.unlink(missing_ok=True)
+        pending.unlink()
+    return stats
+
+def _report(stats: dict) -> None:
+    name = Path(stats["file"]).name
+    if stats["error"]:
+        log.error("处理文件失败 %s: %s", name, stats["error"])
+    elif not stats["lines"]:
+        log.warning("文件 %s 无有效内容，已跳过", name)
+    elif "global_dups" in stats:
+        log.info(
+            "✅ 完成：%s -> %s，原始 %d 条，去重 %d 条，与已有语料重复 %d 条，最终 %d 条",
+            name,
+            Path(stats["output"]).name if stats["kept"] else "(无新条文，未输出)",
+            stats["lines"],
+            stats["dups"],
+            stats["global_dups"],
+            stats["kept"],
+        )
+    else:
         log.info(
             "✅ 完成：%s -> %s，原始 %d 条，去重 %d 条，最终 %d 条",
-            file_path.name,
-            out_file.name,
-            len(lines),
-            dup_count,
-            len(deduped),
+            name,
+            Path(stats["output"]).name,
+            stats["lines"],
+            stats["dups"],
+            stats["kept"],
         )
-    except Exception as e:
-        log.error("写入结果失败 %s: %s", out_file, e)
 
-def main(root_path: Path) -> None:
+def process_single_file(file_path: Path, out_dir: Path = DESKTOP) -> dict | None:
     """
-    批量处理目录下所有文本文件，或直接处理单个文件
+    处理单个文件：清洗 -> 去重 -> 写结果 (默认写到桌面)
+    """
+    if should_skip(file_path):
+        return None
+    stats = clean_file(file_path, out_dir)
+    _report(stats)
+    return stats
+
+def main(root_path: Path, out_dir: Path = DESKTOP, workers: int = 1, hash_store: Path | None = None) -> None:
+    """
+    批量处理目录下所有文本文件，或直接处理单个文件。
+    workers > 1 时多个文件由进程池并行清洗，各自流式写出结果。
+    指定 hash_store 时做跨文件全局去重：子进程清洗并计算哈希，主进程按文件顺序与哈希库比对，
+    先出现的条文保留 (与单进程结果一致)，处理完后把新哈希写回哈希库。
     """
     if not root_path.exists():
         log.error("路径不存在: %s", root_path)
@@ -157,21 +296,70 @@ def main(root_path: Path) -> None:
     if root_path.is_file():
         files = [root_path]
     else:
-        files = [p for p in root_path.iterdir() if p.is_file()]
+        files = sorted(p for p in root_path.iterdir() if p.is_file())
+    files = [p for p in files if not should_skip(p)]
 
     if not files:
         log.warning("未找到任何文件: %s", root_path)
         sys.exit(0)
 
-    log.info("共发现 %d 个文件，开始处理…", len(files))
-    for file_path in files:
-        process_single_file(file_path)
-    log.info("全部处理完成，结果已保存到桌面！")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = max(1, min(workers, len(files)))
+    log.info("共发现 %d 个文件，开始处理 (%d 个进程)…", len(files), workers)
+
+    store = None
+    if hash_store is not None:
+        store = HashStore(hash_store)
+        log.info("全局去重：哈希库 %s 中已有 %d 条", hash_store, len(store))
+    with_hashes = store is not None
+
+    def finish(stats):
+        if store is not None:
+            apply_global_dedup(stats, store)
+        _report(stats)
+        results.append(stats)
+
+    results = []
+    if workers == 1:
+        for file_path in files:
+            finish(clean_file(file_path, out_dir, with_hashes))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # pool.map 按提交顺序返回结果，全局去重因此与单进程一样以文件顺序为准
+            for stats in pool.map(clean_file, files, [out_dir] * len(files), [with_hashes] * len(files)):
+                finish(stats)
+
+    if store is not None:
+        store.save()
+        log.info("哈希库已更新：%s，共 %d 条", hash_store, len(store))
+
+    log.info(
+        "全部处理完成：%d 个文件，原始 %d 条，去重 %d 条，最终 %d 条，结果已保存到 %s",
+        len(results),
+        sum(r["lines"] for r in results),
+        sum(r["dups"] + r.get("global_dups", 0) for r in results),
+        sum(r["kept"] for r in results),
+        out_dir,
+    )
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="清洗历史条文：去序号、去重")
+    parser.add_argument("path", nargs="?", help="文件或文件夹路径；省略时弹出文件选择框")
+    parser.add_argument("--output-dir", type=Path, default=DESKTOP, help="结果目录，默认桌面")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="并行进程数，1 表示单进程")
+    parser.add_argument("--hash-store", type=Path,
+                        help="跨文件全局去重的哈希库文件 (不存在时新建)，与此前清洗过的所有语料去重")
+    return parser.parse_args(argv)
 
 # ---------- 入口 ----------
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(levelname)s] %(message)s"
+    )
+    args = parse_args(sys.argv[1:])
     # 无参数时弹出文件选择框
-    if len(sys.argv) == 1:
+    if args.path is None:
         try:
             import tkinter as tk
             from tkinter import filedialog
@@ -183,9 +371,9 @@ if __name__ == "__main__":
             )
             if not path:
                 sys.exit(0)
-            main(Path(path))
+            main(Path(path), args.output_dir, args.workers, args.hash_store)
         except ImportError:
             print("用法: python3 history_cleaner.py  <文件或文件夹路径>")
             sys.exit(1)
     else:
-        main(Path(sys.argv[1]))
\ No newline at end of file
+        main(Path(args.path), args.output_dir, args.workers, args.hash_store)
\ No newline at end of file
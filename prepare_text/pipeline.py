@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+pipeline.py
+--------------------------------------------------------
+语料预处理流水线：把 history_cleaner / rank / random_draw / extract_text_by_range 的步骤串成一次流式处理
+    clean  去掉 ○序号，只保留一个 ○                 (history_cleaner.clean_line)
+    dedup  按 clean_line + normalize() 的 64 位哈希去重，可接持久化哈希库做跨批次去重 (history_cleaner.HashStore)
+    number 去掉原有的 ○序号，重新编号为 ○1、○2 …     (rank.number_lines)
+    sample 蓄水池随机抽样，可复现                      (random_draw.reservoir_sample)
+    chunk  按条数切分为 抽取结果_{start}_{end}_带序号.txt (extract_text_by_range)
+各阶段是串联的生成器，输入只读一遍，中间结果不落盘；除 sample 外内存占用与语料大小无关。
+阶段总按上面的顺序执行 (clean 会删除序号，所以 number 必须在 clean 之后)，--stages 只选择启用哪些。
+结果默认写到数据目录下的 corpus/<名称>/ (数据目录的解析见 services/constants.py)。
+--------------------------------------------------------
+Usage:
+    python3 pipeline.py <文件或文件夹 ...> [--stages clean,dedup,number,chunk] [--chunk-size 100]
+                        [--sample 1000 --seed 42] [--hash-store corpus.hashes] [--name 名称] [--output-dir DIR]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# 与 batch_cli.py 相同的路径修正：保证能以 gemini.* 的形式导入
+ROOT = Path(os.path.abspath(__file__)).parent.parent
+if str(ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(ROOT.parent))
+
+from gemini.prepare_text.history_cleaner import clean_line, normalize, key_hash, should_skip, HashStore
+from gemini.prepare_text.random_draw import reservoir_sample
+from gemini.prepare_text.rank import number_lines
+
+STAGES = ("clean", "dedup", "number", "sample", "chunk")
+DEFAULT_STAGES = ("clean", "dedup", "number")
+CHUNK_TEMPLATE = "抽取结果_{start}_{end}_带序号.txt"
+_SERIAL_RE = re.compile(r"○(\d+)")
+_LEADING_SERIAL_RE = re.compile(r"^○\d*")
+
+
+# ---------- 各阶段 (生成器) ----------
+def read_lines(paths, stats, encoding="utf-8"):
+    """依次读取各文件的非空行 (去掉首尾空白)"""
+    for path in paths:
+        stats["files"] += 1
+        with path.open(encoding=encoding) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    stats["read"] += 1
+                    yield line
+
+
+def clean_stage(lines):
+    for line in lines:
+        yield clean_line(line)
+
+
+def line_hash(line):
+    """条文的去重哈希：忽略 ○序号 (与 history_cleaner 的哈希库、services 的内容哈希一致)，编号前后不变"""
+    return key_hash(normalize(clean_line(line)))
+
+
+def dedup_stage(lines, stats, store=None):
+    """
+    按 line_hash 去重，保留首次出现的行。
+    store 为 HashStore 时同时剔除此前处理过的语料；这里只查询不写入，
+    新哈希由 record_stage 在行真正输出后加入哈希库。
+    """
+    seen = set()
+    for line in lines:
+        digest = line_hash(line)
+        if digest in seen or (store is not None and digest in store):
+            stats["dups"] += 1
+            continue
+        seen.add(digest)
+        yield line
+
+
+def number_stage(lines, start=1):
+    """去掉行首原有的 ○序号 后编号为 ○<序号><正文> (rank.number_lines)"""
+    for line in number_lines((_LEADING_SERIAL_RE.sub("", line, count=1) for line in lines), start):
+        yield line.rstrip("\n")
+
+
+def sample_stage(lines, k, seed=None):
+    """蓄水池抽样 k 行，按原顺序输出 (只保留 k 行在内存中)"""
+    for _, line in reservoir_sample(lines, k, random.Random(seed)):
+        yield line
+
+
+def record_stage(lines, store):
+    """最后一个阶段：每行交给输出之后才把它的哈希加入哈希库，未输出的行 (如抽样落选) 不记录"""
+    for line in lines:
+        yield line
+        store.add(line_hash(line))
+
+
+# ---------- 输出 ----------
+def write_single(lines, out_file, encoding="utf-8"):
+    """写入单个文件 (先写临时文件再替换)，返回行数"""
+    tmp_file = out_file.with_name(out_file.name + ".tmp")
+    count = 0
+    with tmp_file.open("w", encoding=encoding) as f:
+        for line in lines:
+            f.write(line + "\n")
+            count += 1
+    os.replace(tmp_file, out_file)
+    return [(out_file, count)]
+
+
+def write_chunks(lines, out_dir, chunk_size, template=CHUNK_TEMPLATE, encoding="utf-8"):
+    """
+    每 chunk_size 行写一个文件。文件名中的 {start} {end} 取首末行的 ○序号，
+    没有序号时取行在输出中的位置 (从 1 开始)。返回 [(文件, 行数), ...]
+    """
+    written = []
+    chunk = []
+    first = None
+
+    def flush(position):
+        if not chunk:
+            return
+        start = _serial_of(chunk[0], first)
+        end = _serial_of(chunk[-1], position)
+        out_file = out_dir / template.format(start=start, end=end)
+        written.extend(write_single(iter(chunk), out_file, encoding))
+        chunk.clear()
+
+    position = 0
+    for position, line in enumerate(lines, 1):
+        if not chunk:
+            first = position
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            flush(position)
+    flush(position)
+    return written
+
+
+def _serial_of(line, position):
+    match = _SERIAL_RE.match(line)
+    return int(match.group(1)) if match else position
+
+
+# ---------- 组装 ----------
+def expand_inputs(inputs):
+    """展开文件夹 (取其中的 *.txt)，跳过隐藏/临时/过小的文件"""
+    paths = []
+    for item in inputs:
+        path = Path(item)
+        candidates = sorted(path.glob("*.txt")) if path.is_dir() else [path]
+        paths.extend(p for p in candidates if p.is_file() and not should_skip(p))
+    return paths
+
+
+def run_pipeline(paths, out_dir, stages=DEFAULT_STAGES, number_start=1, sample_size=None, seed=None,
+                 chunk_size=100, hash_store=None, name="corpus", encoding="utf-8"):
+    """
+    对 paths 按 STAGES 的顺序执行 stages 中启用的阶段，结果写入 out_dir。
+    返回 (统计 Counter, [(输出文件, 行数), ...])
+    """
+    stats = Counter()
+    store = HashStore(hash_store) if hash_store is not None and "dedup" in stages else None
+
+    lines = read_lines(paths, stats, encoding)
+    if "clean" in stages:
+        lines = clean_stage(lines)
+    if "dedup" in stages:
+        lines = dedup_stage(lines, stats, store)
+    if "number" in stages:
+        lines = number_stage(lines, number_start)
+    if "sample" in stages:
+        lines = sample_stage(lines, sample_size, seed)
+    if store is not None:
+        lines = record_stage(lines, store)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if "chunk" in stages:
+        written = write_chunks(lines, out_dir, chunk_size, encoding=encoding)
+    else:
+        written = write_single(lines, out_dir / f"{name}.txt", encoding)
+
+    # 哈希只记录已输出的行，且输出全部写完后才写回哈希库，中途失败不会把未输出的条文记为已处理
+    if store is not None:
+        store.save()
+    stats["written"] = sum(count for _, count in written)
+    return stats, written
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="语料预处理流水线：clean → dedup → number → sample → chunk")
+    parser.add_argument("inputs", nargs="+", help="txt 文件或文件夹")
+    parser.add_argument("--stages", default=",".join(DEFAULT_STAGES),
+                        help=f"逗号分隔的启用阶段，可选: {','.join(STAGES)} (总按此顺序执行)")
+    parser.add_argument("--number-start", type=int, default=1, help="number 阶段的起始序号")
+    parser.add_argument("--sample", type=int, help="sample 阶段抽取的条数 (指定后自动启用 sample)")
+    parser.add_argument("--seed", type=int, help="sample 阶段的随机种子")
+    parser.add_argument("--chunk-size", type=int, help="chunk 阶段每个文件的条数 (指定后自动启用 chunk)")
+    parser.add_argument("--hash-store", type=Path, help="dedup 阶段的持久化哈希库，与此前处理过的语料去重")
+    parser.add_argument("--name", help="本次输出的名称，默认取第一个输入的文件名或文件夹名")
+    parser.add_argument("--output-dir", type=Path, help="输出目录，默认为 <数据目录>/corpus/<名称>")
+    parser.add_argument("--data-dir", help="数据目录，默认按 services/constants.py 的配置解析")
+    parser.add_argument("--encoding", default="utf-8")
+    args = parser.parse_args(argv)
+
+    args.stages = {s.strip() for s in args.stages.split(",") if s.strip()}
+    if args.sample is not None:
+        args.stages.add("sample")
+    if args.chunk_size is not None:
+        args.stages.add("chunk")
+    unknown = args.stages.difference(STAGES)
+    if unknown:
+        parser.error(f"未知的阶段: {sorted(unknown)}")
+    if "sample" in args.stages and not (args.sample and args.sample > 0):
+        parser.error("sample 阶段需要 --sample N (N > 0)")
+    if args.chunk_size is None:
+        args.chunk_size = 100
+    if args.chunk_size < 1:
+        parser.error("--chunk-size 必须大于 0")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("错误：没有可处理的 txt 文件。", file=sys.stderr)
+        return 1
+
+    # 默认名称：第一个输入的文件名 (不含扩展名) 或文件夹名
+    name = args.name or Path(args.inputs[0]).stem
+    out_dir = args.output_dir
+    if out_dir is None:
+        # 只在需要时导入 services (会解析并创建数据目录)
+        from gemini.services.constants import get_data_dir
+        out_dir = Path(get_data_dir(args.data_dir)) / "corpus" / name
+
+    start = time.perf_counter()
+    stats, written = run_pipeline(
+        paths, out_dir, args.stages, args.number_start, args.sample, args.seed,
+        args.chunk_size, args.hash_store, name, args.encoding,
+    )
+
+    enabled = [s for s in STAGES if s in args.stages]
+    print(f"阶段: {' → '.join(enabled)}")
+    print(f"读取 {stats['files']} 个文件 {stats['read']} 条，去重 {stats['dups']} 条，输出 {stats['written']} 条")
+    for out_file, count in written:
+        print(f"  {out_file} ({count} 条)")
+    print(f"耗时 {time.perf_counter() - start:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,23 +4,133 @@
 random_draw.py
 --------------------------------------------------------
 随机抽取历史条文工具
-1. 文件选择框读入 txt
-2. 输入抽取数量（默认 100）
-3. 随机抽取 → 桌面 {原文件名}_random<N>.txt
-4. 打印实际抽取数量
+1. 命令行传入一个或多个 txt 文件 / 文件夹；不带参数运行时弹出文件选择框
+2. 抽取数量默认 100
+3. 蓄水池抽样 (reservoir sampling)：逐行流式读取，内存只与抽取数量有关，可直接用于 GB 级语料
+4. --seed 固定随机种子，结果可复现
+5. --stratify 按来源文件分层抽样：equal 每个文件抽取相同数量，proportional 按各文件条数比例分配
+6. 结果按原文顺序写出 → 桌面 {原文件名}_random<N>.txt (可用 -o 指定)，打印实际抽取数量
 --------------------------------------------------------
-PyCharm 直接点绿色三角即可运行
+Usage:
+    python3 random_draw.py <文件或文件夹 ...> [-n 100] [--seed 42] [--stratify equal|proportional] [-o 输出文件]
+PyCharm 直接点绿色三角即可运行 (弹出文件选择框)
 """
 
-import tkinter as tk
-from tkinter import filedialog, simpledialog
-from pathlib import Path
+import argparse
+import math
 import random
 import sys
+from itertools import islice
+from pathlib import Path
 
 DESKTOP = Path.home() / "Desktop"
+STRATIFY_MODES = ("none", "equal", "proportional")
+
+
+# ---------- 抽样 ----------
+def iter_lines(path: Path, encoding: str = "utf-8"):
+    """逐行读取非空行 (去掉行尾空白)"""
+    with path.open(encoding=encoding) as f:
+        for l in f:
+            if l.strip():
+                yield l.rstrip()
+
+
+def reservoir_sample(items, k: int, rng: random.Random) -> list:
+    """
+    从任意长度的可迭代对象中等概率不重复地抽取 k 个元素 (Algorithm L)。
+    只保留 k 个元素，跳过的元素用 islice 在 C 层消耗，随机数调用次数约为 O(k·log(n/k))。
+    返回 [(原序号, 元素), ...]，按原序号排序；不足 k 个时全部返回。
+    """
+    if k <= 0:
+        return []
+    it = enumerate(items)
+    reservoir = list(islice(it, k))
+    if len(reservoir) < k:
+        return reservoir
+
+    # 1 - random() 取值在 (0, 1]，避免 log(0)
+    w = math.exp(math.log(1.0 - rng.random()) / k)
+    while True:
+        skip = math.floor(math.log(1.0 - rng.random()) / math.log(1.0 - w)) if w < 1.0 else 0
+        item = next(islice(it, skip, None), None)
+        if item is None:
+            break
+        reservoir[rng.randrange(k)] = item
+        w *= math.exp(math.log(1.0 - rng.random()) / k)
+
+    reservoir.sort(key=lambda pair: pair[0])
+    return reservoir
+
+
+def count_lines(path: Path, encoding: str = "utf-8") -> int:
+    """非空行数 (按比例分层时用于分配名额)"""
+    return sum(1 for _ in iter_lines(path, encoding))
+
+
+def allocate(total: int, weights: list[int]) -> list[int]:
+    """按权重把 total 个名额分给各层 (最大余数法)，每层不超过其权重"""
+    weight_sum = sum(weights)
+    if weight_sum == 0:
+        return [0] * len(weights)
+    total = min(total, weight_sum)
+    quotas = [total * w / weight_sum for w in weights]
+    counts = [math.floor(q) for q in quotas]
+    by_remainder = sorted(range(len(weights)), key=lambda i: quotas[i] - counts[i], reverse=True)
+    for i in by_remainder[:total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def draw(paths: list[Path], num: int, seed=None, stratify: str = "none", encoding: str = "utf-8") -> list[str]:
+    """
+    从 paths 中随机抽取 num 条非空行。
+    stratify="none"：所有文件视为一个整体抽样；"equal"：各文件名额相同 (余数给前面的文件)；
+    "proportional"：按各文件非空行数比例分配 (需要先统计一遍行数)。
+    同一 seed、同一输入得到同样的结果。
+    """
+    rng = random.Random(seed)
+    if stratify == "none" or len(paths) == 1:
+        def all_lines():
+            for path in paths:
+                yield from iter_lines(path, encoding)
+        return [line for _, line in reservoir_sample(all_lines(), num, rng)]
+
+    if stratify == "equal":
+        quotas = [num // len(paths) + (1 if i < num % len(paths) else 0) for i in range(len(paths))]
+    elif stratify == "proportional":
+        quotas = allocate(num, [count_lines(path, encoding) for path in paths])
+    else:
+        raise ValueError(f"未知的分层方式: {stratify}")
+
+    picked = []
+    for path, quota in zip(paths, quotas):
+        sample = reservoir_sample(iter_lines(path, encoding), quota, rng)
+        if len(sample) < quota:
+            print(f"提示：{path.name} 只有 {len(sample)} 条，少于分配的 {quota} 条")
+        picked.extend(line for _, line in sample)
+    return picked
+
+
+def expand_paths(inputs: list[str]) -> list[Path]:
+    """展开文件夹 (取其中的 *.txt，按文件名排序)"""
+    paths = []
+    for item in inputs:
+        path = Path(item)
+        paths.extend(sorted(path.glob("*.txt")) if path.is_dir() else [path])
+    return paths
+
+
+def write_lines(out_file: Path, lines: list[str]) -> None:
+    with out_file.open("w", encoding="utf-8") as f:
+        f.writelines(f"{l}\n" for l in lines)
+
+
+# ---------- 交互模式 (tkinter) ----------
+def run_dialog():
+    import tkinter as tk
+    from tkinter import filedialog, simpledialog
 
-def main():
     # 隐藏主窗口
     root = tk.Tk()
     root.withdraw()
@@ -36,10 +146,7 @@ def main():
         print("用户取消选择")
         sys.exit(0)
 
-    # 读入所有非空行
-    with path.open(encoding="utf-8") as f:
-        lines = [l.rstrip() for l in f if l.strip()]
-    total = len(lines)
+    total = count_lines(path)
     if total == 0:
         print("文件无有效内容")
         sys.exit(0)
@@ -55,14 +162,53 @@ def main():
     if num is None:  # 用户取消
         sys.exit(0)
 
-    # 随机抽 + 去重
-    picked = random.sample(lines, num)  # 不重复抽样
+    picked = draw([path], num)
     out_file = DESKTOP / f"{path.stem}_random{num}.txt"
-    with out_file.open("w", encoding="utf-8") as f:
-        f.writelines(f"{l}\n" for l in picked)
+    write_lines(out_file, picked)
 
     print(f"✅ 已完成：随机抽取 {num} 条 → {out_file.name}")
-    print(f"实际抽取数量：{num}")
+    print(f"实际抽取数量：{len(picked)}")
+
+
+# ---------- 命令行 ----------
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        run_dialog()
+        return 0
+
+    parser = argparse.ArgumentParser(description="随机抽取历史条文 (蓄水池抽样，可复现，可按文件分层)")
+    parser.add_argument("inputs", nargs="+", help="txt 文件或文件夹")
+    parser.add_argument("-n", "--num", type=int, default=100, help="抽取数量，默认 100")
+    parser.add_argument("--seed", type=int, help="随机种子，指定后结果可复现")
+    parser.add_argument("--stratify", choices=STRATIFY_MODES, default="none", help="按来源文件分层抽样")
+    parser.add_argument("-o", "--output", type=Path, help="输出文件，默认桌面 {原文件名}_random<N>.txt")
+    parser.add_argument("--encoding", default="utf-8")
+    args = parser.parse_args(argv)
+
+    if args.num < 1:
+        parser.error("--num 必须大于 0")
+    paths = expand_paths(args.inputs)
+    missing = [str(p) for p in paths if not p.is_file()]
+    if missing:
+        parser.error(f"文件不存在: {', '.join(missing)}")
+    if not paths:
+        parser.error("没有可抽取的 txt 文件")
+
+    picked = draw(paths, args.num, args.seed, args.stratify, args.encoding)
+    if not picked:
+        print("文件无有效内容")
+        return 0
+
+    stem = paths[0].stem if len(paths) == 1 else "merged"
+    out_file = args.output or DESKTOP / f"{stem}_random{args.num}.txt"
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    write_lines(out_file, picked)
+
+    print(f"✅ 已完成：随机抽取 {len(picked)} 条 → {out_file}")
+    print(f"实际抽取数量：{len(picked)}")
+    return 0
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
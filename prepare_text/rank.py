@@ -1,7 +1,52 @@
+"""
+rank.py
+--------------------------------------------------------
+为 txt 文件中的每条非空文本行开头加上“○”和序号
+1. 逐行流式读写，内存占用与文件大小无关
+2. 可指定起始序号和补零位数 (例如 --width 4 → ○0001)
+3. 结果先写入同目录下的临时文件，完成后原子替换；--in-place 直接覆盖原文件
+4. 导入本模块没有副作用：number_lines / add_prefix_to_txt 可作为库函数使用 (例如批量导入时为原始文件临时编号)
+--------------------------------------------------------
+Usage:
+    python3 rank.py <输入文件> [-o 输出文件] [--start 1] [--width 0] [--in-place]
+"""
+
+import argparse
 import os
+import shutil
+import sys
+import tempfile
+
 
+def number_lines(lines, start=1, width=0):
+    """
+    为每条非空行加上“○”和序号，逐行产出结果 (生成器)。
+    包含换行符的空行原样保留、不编号；不包含换行符的空行 (如文件末尾) 忽略。
 
-def add_prefix_to_txt(input_filepath, output_filepath=None, encoding='utf-8'):
+    :param lines: 可迭代的文本行 (例如打开的文件对象)。
+    :param start: int, 起始序号，默认为 1。
+    :param width: int, 序号补零后的最小位数，0 表示不补零。
+    """
+    line_number = start
+    for line in lines:
+        # 移除行首和行尾的空白字符（包括换行符）
+        stripped_line = line.strip()
+
+        if stripped_line:
+            # 添加“○”和序号，序号后直接跟原文本
+            yield f"○{str(line_number).zfill(width)}{stripped_line}\n"
+            line_number += 1
+        elif line.endswith('\n'):
+            # 如果是包含换行符的空行，则保留空行，不编号
+            yield '\n'
+
+
+def number_text(text, start=1, width=0):
+    """number_lines 的字符串版本"""
+    return "".join(number_lines(text.splitlines(keepends=True), start, width))
+
+
+def add_prefix_to_txt(input_filepath, output_filepath=None, encoding='utf-8', start=1, width=0, in_place=False):
     """
     为txt文件中的每条非空文本行开头加上“○”和序号。
 
@@ -9,61 +54,69 @@ def add_prefix_to_txt(input_filepath, output_filepath=None, encoding='utf-8'):
     :param output_filepath: str, 可选，处理结果保存的文件路径。
                             如果为 None，则默认在输入文件路径前添加 "_numbered"。
     :param encoding: str, 文件编码，默认为 'utf-8'。
+    :param start: int, 起始序号，默认为 1。
+    :param width: int, 序号补零后的最小位数，0 表示不补零。
+    :param in_place: bool, 为 True 时直接覆盖输入文件 (忽略 output_filepath)。
+    :return: int, 编号的行数；出错时返回 None。
     """
 
     # 确定输出文件路径
-    if output_filepath is None:
+    if in_place:
+        output_filepath = input_filepath
+    elif output_filepath is None:
         base, ext = os.path.splitext(input_filepath)
         output_filepath = base + "_numbered" + ext
 
-    processed_lines = []
-    line_number = 1
-
+    tmp_path = None
     try:
-        # 1. 读取文件内容
-        with open(input_filepath, 'r', encoding=encoding) as infile:
-            for line in infile:
-                # 移除行首和行尾的空白字符（包括换行符）
-                stripped_line = line.strip()
-
-                # 检查行是否为空（如果文件中有空行，可以选择跳过或为它们编号）
-                if stripped_line:
-                    # 2. 添加“○”和序号
-                    # 使用 f-string 格式化，序号后跟一个空格或分隔符，然后是原文本。
-                    # 您也可以调整 {line_number} 的格式，例如 {line_number:03} 表示三位数字，不足补0
-                    # 移除句号和空格（`. `）
-                    new_line = f"○{line_number}{stripped_line}"
-                    processed_lines.append(new_line + '\n')  # 重新添加换行符
-                    line_number += 1
-                elif line.endswith('\n'):
-                    # 如果是包含换行符的空行，则保留空行，不编号
-                    processed_lines.append('\n')
-                # 否则，如果是不包含换行符的空行（如文件末尾），则忽略
-
-        # 3. 写入处理后的内容到新文件
-        with open(output_filepath, 'w', encoding=encoding) as outfile:
-            outfile.writelines(processed_lines)
+        # 先写入输出目录下的临时文件，完成后再替换，中途出错不会破坏已有文件
+        out_dir = os.path.dirname(os.path.abspath(output_filepath))
+        with open(input_filepath, 'r', encoding=encoding) as infile, \
+                tempfile.NamedTemporaryFile('w', encoding=encoding, dir=out_dir, prefix='.rank-',
+                                            suffix='.tmp', delete=False) as outfile:
+            tmp_path = outfile.name
+            count = 0
+            for new_line in number_lines(infile, start, width):
+                outfile.write(new_line)
+                if new_line != '\n':
+                    count += 1
+
+        # NamedTemporaryFile 创建的文件权限为 0600：沿用被覆盖文件的权限，新建输出则沿用输入文件的权限
+        shutil.copymode(output_filepath if os.path.exists(output_filepath) else input_filepath, tmp_path)
+        os.replace(tmp_path, output_filepath)
+        tmp_path = None
 
         print(f"文件处理成功！")
         print(f"输入文件: {input_filepath}")
         print(f"输出文件: {output_filepath}")
+        print(f"编号范围: {start}-{start + count - 1}" if count else "没有需要编号的行")
+        return count
 
     except FileNotFoundError:
         print(f"错误：找不到文件 '{input_filepath}'")
     except Exception as e:
         print(f"处理过程中发生错误: {e}")
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return None
 
 
-# ==========================================================
-# 使用示例：每次修改下方路径即可对新文件进行处理
-# ==========================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="为 txt 文件的每条非空行加上“○”和序号")
+    parser.add_argument("input", help="待处理的 txt 文件")
+    parser.add_argument("-o", "--output", help="输出文件，默认为 <输入文件名>_numbered.txt")
+    parser.add_argument("--start", type=int, default=1, help="起始序号，默认 1")
+    parser.add_argument("--width", type=int, default=0, help="序号补零位数，例如 4 → ○0001；默认不补零")
+    parser.add_argument("--in-place", action="store_true", help="直接覆盖输入文件")
+    parser.add_argument("--encoding", default="utf-8")
+    args = parser.parse_args(argv)
 
-# 仅修改这个路径即可
-input_file = r'/Users/luckpuppy/Desktop/扩充训练集/0926结构化训练集/4/annotation/Train_nonriots_cleaned.txt'
+    if args.in_place and args.output:
+        parser.error("--in-place 与 -o 不能同时使用")
+    count = add_prefix_to_txt(args.input, args.output, args.encoding, args.start, args.width, args.in_place)
+    return 0 if count is not None else 1
 
-# 可以选择指定输出文件路径，如果不指定，将自动生成一个名称
-# output_file = r'/Users/your_username/Desktop/已处理文本_带序号.txt'
 
-# 调用函数
-add_prefix_to_txt(input_file)
-# add_prefix_to_txt(input_file, output_filepath=output_file) # 如果指定了输出路径，则使用此行
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,7 @@
 # services/__init__.py (修改内容)
 
-# 1. 导入常量和打印信息 (只导入 DataModel 需要的，或全部导入用于调试)
-from gemini.services.constants import (
-    CLASSIFIED_DATA_FILE, CUSTOM_KEYWORD_FILE, HISTORY_FILE, DATA_DIR
-)
-print(f"INFO: Data files will be stored in: {DATA_DIR}") # 重新添加打印信息
+# 1. 数据目录在首次创建 DataModel 时才解析 (见 constants.py)，导入本包没有副作用
+from gemini.services.constants import set_data_dir, get_data_dir
 
 # 2. 桥接内部类 (保持不变)
 from gemini.services.data_model import DataModel
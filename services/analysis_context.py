@@ -0,0 +1,84 @@
+# services/analysis_context.py
+# ----------------------------------------------------
+# TermMatcher / AnalysisContext：文本只扫描一次，扫描结果供分析流程的各个阶段共享
+
+
+class TermMatcher:
+    """
+    多词条匹配器：一次扫描找出文本中出现的所有词条及其位置。
+    结果与逐个执行 `term in text` 完全一致（包括相互重叠的词条）。
+    """
+
+    def __init__(self, terms):
+        self.terms = frozenset(term for term in terms if term)
+
+        # 按首字符分桶：首字符 -> 该字符开头的词条长度列表
+        self._lengths_by_first_char = {}
+        for term in self.terms:
+            self._lengths_by_first_char.setdefault(term[0], set()).add(len(term))
+        for first_char, lengths in self._lengths_by_first_char.items():
+            self._lengths_by_first_char[first_char] = sorted(lengths)
+
+    def scan(self, text: str) -> dict[str, list[int]]:
+        """返回 {词条: [出现位置, ...]}，按首次出现的先后顺序排列"""
+        hits = {}
+        terms = self.terms
+        lengths_by_first_char = self._lengths_by_first_char
+
+        for i, char in enumerate(text):
+            lengths = lengths_by_first_char.get(char)
+            if lengths is None:
+                continue
+            for length in lengths:
+                piece = text[i:i + length]
+                if piece in terms:
+                    hits.setdefault(piece, []).append(i)
+
+        return hits
+
+
+class AnalysisContext:
+    """
+    单条文本的分析上下文。
+    构造时用 TermMatcher 扫描一次文本，核心信息、术语注释、关键词、相似文本等阶段都从这里取词。
+    """
+
+    def __init__(self, text: str, matcher: TermMatcher, keyword_vocabulary):
+        self.text = text
+        # 确保所有空格、换行符被清理 (与原 _extract_keywords 的处理一致)
+        self.clean_text = text.replace('\n', '').replace('\r', '').strip()
+        self.term_positions = matcher.scan(self.clean_text)
+        self._matcher = matcher
+        self._raw_term_positions = self.term_positions if text == self.clean_text else None
+
+        # 出现在关键词库中的词条，按首次出现顺序排列
+        self.keywords = [term for term in self.term_positions if term in keyword_vocabulary]
+        self.keyword_set = frozenset(self.keywords)
+
+    @property
+    def raw_term_positions(self) -> dict[str, list[int]]:
+        """
+        原文 self.text 中的词条位置 (不去除换行，跨行的词条不算出现)。
+        原文含换行或首尾空白时才另行扫描一次，否则与 term_positions 相同。
+        """
+        if self._raw_term_positions is None:
+            self._raw_term_positions = self._matcher.scan(self.text)
+        return self._raw_term_positions
+
+    def has(self, term) -> bool:
+        """词条是否在文本中出现"""
+        return term in self.term_positions
+
+    def has_any(self, terms) -> bool:
+        return any(term in self.term_positions for term in terms)
+
+    def first_of(self, terms, default=""):
+        """按 terms 的优先级顺序，返回第一个在文本中出现的词条"""
+        for term in terms:
+            if term in self.term_positions:
+                return term
+        return default
+
+    def count(self, term) -> int:
+        """词条在文本中出现的次数"""
+        return len(self.term_positions.get(term, ()))
@@ -2,10 +2,71 @@
 # ----------------------------------------------------
 # QingShiluService 类：核心分析算法、业务逻辑
 
-import re
-
 # 从同级模块导入 DataModel
 from gemini.services.data_model import DataModel
+from gemini.services.analysis_context import TermMatcher, AnalysisContext
+from gemini.services.core_info_rules import CoreInfoExtractor
+from gemini.services.category_index import CategoryIndex
+from gemini.services.scoring import CorpusStats, BM25Scorer, SCORERS
+from gemini.services.tag_engine import TagEngine
+
+# 分析流程的全部阶段，按执行顺序排列
+ANALYSIS_STAGES = ('core_info', 'keywords', 'tags', 'translation', 'recommendations', 'similar_texts')
+
+# 批量处理展示推荐分类和性质/领域标签，跳过最耗时的相似文本检索
+BATCH_STAGES = frozenset({'keywords', 'tags', 'recommendations'})
+
+# 单条处理：相似文本在面板打开时再计算
+INTERACTIVE_STAGES = frozenset({'core_info', 'keywords', 'translation', 'recommendations'})
+
+# 翻译中的术语注释
+TRANSLATION_TERMS = {
+    "题参": "上奏参劾",
+    "蠲免": "免除赋税",
+    "赈粜": "平价卖粮救灾",
+    "平粜": "平价卖粮",
+}
+
+
+class AnalysisResult(dict):
+    """
+    run_full_analysis 的返回结果。
+    未在 stages 中请求的阶段是惰性字段：首次通过 result[stage] 或 result.get(stage) 访问时才计算并缓存。
+    """
+
+    def __init__(self, service, context, **fields):
+        super().__init__(**fields)
+        self._service = service
+        self._context = context
+
+    def __missing__(self, key):
+        if key not in ANALYSIS_STAGES:
+            raise KeyError(key)
+        value = self._service._run_stage(key, self._context, self)
+        self[key] = value
+        return value
+
+    def get(self, key, default=None):
+        if key in ANALYSIS_STAGES:
+            return self[key]
+        return super().get(key, default)
+
+    def load(self, stage):
+        """显式计算（或取出已缓存的）某个阶段的结果，供 WorkerThread 调用"""
+        return self[stage]
+
+    def is_loaded(self, stage):
+        """判断某个阶段是否已经计算过"""
+        return dict.__contains__(self, stage)
+
+    def to_dict(self, stages=None):
+        """
+        导出为只含分析阶段的普通 dict (可 JSON 序列化、可跨进程传递)。
+        stages 为 None 时只导出已计算的阶段，否则按需计算并导出指定阶段。
+        """
+        if stages is None:
+            return {stage: dict.__getitem__(self, stage) for stage in ANALYSIS_STAGES if self.is_loaded(stage)}
+        return {stage: self[stage] for stage in ANALYSIS_STAGES if stage in stages}
 
 
 class QingShiluService:
@@ -13,87 +74,179 @@ class QingShiluService:
     负责执行核心分析算法和管理数据操作。
     """
 
-    def __init__(self):
-        self.model = DataModel()
+    def __init__(self, data_dir: str | None = None):
+        self.model = DataModel(data_dir)
+        # 核心信息抽取规则表 (services/core_info_rules.py)
+        self.core_info_extractor = CoreInfoExtractor()
+        # 性质/领域标签 (keywords_data.CATEGORY_CONFIG)，词条并入共享的匹配器
+        self.tag_engine = TagEngine()
+
+        # 词条匹配器及其对应的关键词库版本；关键词库变化时重建
+        self._term_matcher = None
+        self._keyword_vocabulary = frozenset()
+        self._matcher_version = None
+        # 已分类文本 -> 关键词集合 的缓存，避免每次检索相似文本都重新分词
+        self._stored_keywords_cache = {}
+        # 关键词 × 分类 关联矩阵，关键词库变化时重建
+        self._category_index = None
+        self._category_index_version = None
+        # 已分类语料的统计量 (BM25 的 IDF)，首次使用时构建，保存分类时增量更新
+        self.corpus_stats = CorpusStats()
+        self._corpus_stats_version = None
+        # 推荐打分器，默认 BM25；可通过 set_scorer('count') 切换回原始计数打分
+        self.scorer = BM25Scorer(self.corpus_stats)
+        # 相似文本检索方式：'minhash' (LSH 索引，亚线性) / 'bigram' (字符二元组 TF-IDF 余弦)
+        #                  / 'keywords' (原关键词重合度线性扫描)
+        self.similarity_mode = 'minhash'
 
     # --- 核心分析方法 (JS: translateAndRecommend) ---
 
-    def run_full_analysis(self, original_text: str):
+    def run_full_analysis(self, original_text: str, stages=None):
         """
         执行完整的智能分析流程（耗时操作，需由 WorkerThread 调用）。
+
+        :param stages: 需要立即计算的阶段集合（见 ANALYSIS_STAGES），例如 {'keywords', 'recommendations'}。
+                       为 None 时计算全部阶段；其余阶段在首次访问时惰性计算。
         """
         # 模拟 BERT/NLP 模型的推理时间 (JS 模拟的异步耗时)
         # 🌟 移除或注释掉 time.sleep(1.5)
         # time.sleep(1.5)
 
-        core_info = self._extract_core_info(original_text)
-
-        # 🌟 调用现在位于此类的内部
-        keywords = self._extract_keywords(original_text)
+        return self.analyze_batch([original_text], stages=stages)[0]
 
-        translation = self._simulate_optimized_translation(original_text, core_info)
-
-        recommendations = self._get_classification_recommendations(original_text, keywords)
-        similar_texts = self._find_similar_texts(original_text)
-
-        return {
-            'translation': translation,
-            'core_info': core_info,
-            'keywords': keywords,
-            'recommendations': recommendations,
-            'similar_texts': similar_texts,
-            'category_structure': self.model.categoryStructure  # 将结构也返回给 Controller
-        }
+    def analyze_batch(self, texts, stages=BATCH_STAGES):
+        """
+        批量分析多条文本。推荐分类阶段对整批文本只做一次向量化打分。
+        返回与 texts 一一对应的 AnalysisResult 列表。
+        """
+        stages = self._resolve_stages(stages)
+
+        # 每条文本只扫描一次，各阶段共享扫描结果
+        results = [
+            AnalysisResult(
+                self, self.build_context(text),
+                category_structure=self.model.categoryStructure  # 将结构也返回给 Controller
+            )
+            for text in texts
+        ]
+
+        if 'recommendations' in stages:
+            batch_recommendations = self._get_classification_recommendations_batch(
+                [result._context for result in results]
+            )
+            for result, recommendations in zip(results, batch_recommendations):
+                result['recommendations'] = recommendations
+
+        # 按固定顺序计算请求的阶段，依赖的前置阶段会被自动补算
+        for result in results:
+            for stage in ANALYSIS_STAGES:
+                if stage in stages:
+                    result.load(stage)
+
+        return results
+
+    def _resolve_stages(self, stages):
+        """校验并规范化 stages 参数"""
+        if stages is None:
+            return frozenset(ANALYSIS_STAGES)
+
+        stages = frozenset(stages)
+        unknown = stages.difference(ANALYSIS_STAGES)
+        if unknown:
+            raise ValueError(f"未知的分析阶段: {sorted(unknown)}，可选: {ANALYSIS_STAGES}")
+        return stages
+
+    def _run_stage(self, stage, context, result):
+        """计算单个阶段；依赖的阶段通过 result[...] 取得（必要时惰性计算）"""
+        if stage == 'core_info':
+            return self._extract_core_info(context)
+        if stage == 'keywords':
+            return list(context.keywords)
+        if stage == 'tags':
+            return self.tag_engine.tag_context(context)
+        if stage == 'translation':
+            return self._simulate_optimized_translation(context, result['core_info'])
+        if stage == 'recommendations':
+            return self._get_classification_recommendations(context)
+        if stage == 'similar_texts':
+            return self._find_similar_texts(context)
+        raise ValueError(f"未知的分析阶段: {stage}")
+
+    # --- 分析上下文 (一次分词，多阶段共享) ---
+
+    def _ensure_term_matcher(self):
+        """关键词库版本变化时，重建覆盖全部词条（关键词、核心信息规则词、术语）的匹配器"""
+        if self._term_matcher is not None and self._matcher_version == self.model.keywordMapVersion:
+            return self._term_matcher
+
+        keyword_vocabulary = set()
+        for data in self.model.mergedKeywordMap.values():
+            keyword_vocabulary.update(data['keywords'])
+
+        all_terms = set(keyword_vocabulary)
+        all_terms.update(self.core_info_extractor.terms)
+        all_terms.update(self.tag_engine.terms)
+        all_terms.update(TRANSLATION_TERMS)
+
+        self._keyword_vocabulary = frozenset(keyword_vocabulary)
+        self._term_matcher = TermMatcher(all_terms)
+        self._matcher_version = self.model.keywordMapVersion
+        self._stored_keywords_cache.clear()
+        return self._term_matcher
+
+    def _ensure_category_index(self):
+        """关键词库版本变化时，重建 关键词 × 分类 关联矩阵"""
+        if self._category_index is None or self._category_index_version != self.model.keywordMapVersion:
+            self._category_index = CategoryIndex(self.model.mergedKeywordMap, self.model.category_registry)
+            self._category_index_version = self.model.keywordMapVersion
+        return self._category_index
+
+    def _ensure_corpus_stats(self):
+        """关键词库版本变化 (或首次使用) 时，从 classifiedData 重建语料统计量"""
+        if self._corpus_stats_version == self.model.keywordMapVersion:
+            return self.corpus_stats
+
+        self.corpus_stats.clear()
+        for entry in self._iter_stored_entries():
+            text = entry.original_text
+            self.corpus_stats.add_document(self._get_stored_keywords(text), len(text))
+        self._corpus_stats_version = self.model.keywordMapVersion
+        return self.corpus_stats
+
+    def _iter_stored_entries(self):
+        for v1 in self.model.classifiedData.values():
+            for v2 in v1.values():
+                for texts in v2.values():
+                    yield from texts
+
+    def set_scorer(self, scorer):
+        """切换推荐打分器：传入名称 ('count' / 'bm25') 或打分器实例"""
+        if isinstance(scorer, str):
+            if scorer not in SCORERS:
+                raise ValueError(f"未知的打分器: {scorer}，可选: {sorted(SCORERS)}")
+            scorer = BM25Scorer(self.corpus_stats) if scorer == BM25Scorer.name else SCORERS[scorer]()
+        self.scorer = scorer
+
+    def build_context(self, text: str) -> AnalysisContext:
+        """为一条文本构建分析上下文（只扫描一次文本）"""
+        matcher = self._ensure_term_matcher()
+        return AnalysisContext(text, matcher, self._keyword_vocabulary)
 
     # --- 内部辅助方法 (JS 核心逻辑的 Python 翻译) ---
 
-    def _extract_core_info(self, text):
-        """提取核心信息（JS: extractCoreInfo）"""
-        # ... (您原有的 _extract_core_info 完整内容) ...
-        # 提取主体
-        subject = ""
-        # 匹配 JS 复杂的正则表达式
-        subject_matches = re.search(r"(○\d+)?\s*(\w+?巡抚|\w+?总督|\w+?按察使|\w+?知府|\w+?知县|皇上|皇帝|朝廷|部议)",
-                                    text)
-        if subject_matches:
-            # Python re.search 返回 groups
-            subject = subject_matches.group(2) if subject_matches.group(2) else subject_matches.group(1)
-
-        # 提取核心动作
-        action = ""
-        action_keywords = ["参奏", "题参", "疏报", "谕令", "谕", "抚恤", "赈济", "剿", "捕", "审", "判", "任免", "调",
-                           "革职"]
-        for keyword in action_keywords:
-            if keyword in text:
-                action = keyword
-                break
-
-        # 提取事件性质 (基于关键字的简单判断)
-        nature = ""
-        if "不效力" in text or "徇私" in text or "贪暴" in text or "失职" in text:
-            nature = "官员失职问题"
-        elif "被灾" in text or "抚恤" in text or "赈济" in text:
-            nature = "灾害救济事务"
-        # ... (省略其他性质判断)
-
-        return {"subject": subject, "action": action, "nature": nature}
-
-    def _simulate_optimized_translation(self, original_text, core_info):
+    def _extract_core_info(self, context):
+        """提取核心信息（JS: extractCoreInfo），规则见 services/core_info_rules.py"""
+        return self.core_info_extractor.extract(context)
+
+    def _simulate_optimized_translation(self, context, core_info):
         """优化的翻译（JS: simulateOptimizedTranslation）"""
         # ... (您原有的 _simulate_optimized_translation 完整内容) ...
         translation = f"【核心信息】主体: {core_info.get('subject', '无')}, 性质: {core_info.get('nature', '无')}\n\n"
         translation += "这是 Service 层对原文的白话文翻译。\n\n"
 
         # 添加术语注释
-        terms = {
-            "题参": "上奏参劾",
-            "蠲免": "免除赋税",
-            "赈粜": "平价卖粮救灾",
-            "平粜": "平价卖粮",
-        }
-
-        for term, note in terms.items():
-            if term in original_text:
+        for term, note in TRANSLATION_TERMS.items():
+            if context.has(term):
                 translation += f"【术语注释】'{term}' 意为 '{note}'。\n"
 
         return translation
@@ -101,62 +254,71 @@ class QingShiluService:
     # 🌟 【关键修复】正确的位置，在主 QingShiluService 类内部
     def _extract_keywords(self, text):
         """提取关键词（JS: extractKeywords）"""
-        all_keywords = set()
+        return list(self.build_context(text).keywords)
 
-        # 确保所有空格、换行符被清理 (生产代码版本)
-        clean_text = text.replace('\n', '').replace('\r', '').strip()
+    def _get_stored_keywords(self, stored_text):
+        """已分类文本的关键词集合（带缓存，每条文本只分词一次）"""
+        keywords = self._stored_keywords_cache.get(stored_text)
+        if keywords is None:
+            keywords = self.build_context(stored_text).keyword_set
+            self._stored_keywords_cache[stored_text] = keywords
+        return keywords
 
-        # 从合并的词库中提取关键词
-        for category, data in self.model.mergedKeywordMap.items():
-            keywords = data['keywords']
-            for keyword in keywords:
-                # 匹配逻辑保持不变
-                if keyword in clean_text:
-                    all_keywords.add(keyword)
+    def _get_classification_recommendations(self, context):
+        """获取分类推荐（JS: getClassificationRecommendations）"""
+        return self._get_classification_recommendations_batch([context])[0]
+
+    def _get_classification_recommendations_batch(self, contexts):
+        """为一批文章计算分类推荐：打分器给出关键词权重，一次矩阵乘法得到全部分数，每篇返回前3个推荐"""
+        index = self._ensure_category_index()
+        registry = self.model.category_registry
+        self._ensure_corpus_stats()
+        weight_rows = [self.scorer.weights(context) for context in contexts]
+
+        batch_recommendations = []
+        for context, ranked in zip(contexts, index.top_categories_batch(weight_rows, k=3)):
+            keywords = context.keywords
+            recommendations = []
+            for category_id, score in ranked:
+                category = registry.display_key(category_id)
+                level1, level2, level3 = registry.display_path(category_id)
+
+                recommendations.append({
+                    "category": category,
+                    "category_id": category_id,
+                    "classificationKey": registry.save_key(category_id),
+                    "level1": level1,
+                    "level2": level2,
+                    "level3": level3,
+                    "score": score if isinstance(score, int) else round(score, 3),
+                    "reason": self.model.mergedKeywordMap.get(category, {}).get('description', '无'),
+                    "matchedKeywords": index.matched_keywords(category_id, keywords)
+                })
+            batch_recommendations.append(recommendations)
 
-        return list(all_keywords)
+        return batch_recommendations
 
-    def _get_classification_recommendations(self, text, keywords):
-        """获取分类推荐（JS: getClassificationRecommendations）"""
-        # ... (您原有的 _get_classification_recommendations 完整内容) ...
-        recommendations = []
-        category_scores = {}
-
-        # 计算每个分类的匹配分数
-        for category, data in self.model.mergedKeywordMap.items():
-            category_keywords = data['keywords']
-            score = 0
-
-            for keyword in keywords:
-                if keyword in category_keywords:
-                    score += 1
-
-            if score > 0:
-                category_scores[category] = score
-
-        # 排序并返回前3个推荐
-        sorted_categories = sorted(category_scores.items(), key=lambda item: item[1], reverse=True)[:3]
-
-        for category, score in sorted_categories:
-            parts = category.split('-')
-            level1 = parts[0]
-            level2 = parts[1]
-            level3 = parts[2]
-
-            recommendations.append({
-                "category": category,
-                "level1": level1,
-                "level2": level2,
-                "level3": level3,
-                "score": score,
-                "reason": self.model.mergedKeywordMap[category].get('description', '无'),
-                "matchedKeywords": [kw for kw in keywords if kw in self.model.mergedKeywordMap[category]['keywords']]
-            })
+    def _find_similar_texts(self, context, k=3):
+        """查找相似文本（JS: findSimilarTexts），检索方式由 self.similarity_mode 决定"""
+        if self.similarity_mode == 'keywords':
+            return self._find_similar_texts_by_keywords(context)
 
-        return recommendations
+        index = self.model.get_similarity_index(self.similarity_mode)
+        similar_texts = []
+        for doc_key, similarity in index.query(context.text, k=k):
+            category_id, entry = self.model.get_indexed_entry(doc_key)
+            l1, l2, l3 = self.model.category_registry.path(category_id)
+            stored_keywords = self._get_stored_keywords(entry.original_text)
+            similar_texts.append({
+                **entry.to_dict(),
+                "categoryPath": f"{l1}集 → {l2} → {l3}",
+                "similarity": round(similarity, 3),
+                "commonKeywords": [kw for kw in context.keywords if kw in stored_keywords]
+            })
+        return similar_texts
 
-    def _find_similar_texts(self, text):
-        """查找相似文本（JS: findSimilarTexts）"""
+    def _find_similar_texts_by_keywords(self, context):
+        """按关键词重合度线性扫描全部已分类文本（原实现）"""
         # ... (您原有的 _find_similar_texts 完整内容) ...
         all_texts = []
 
@@ -164,22 +326,23 @@ class QingShiluService:
         for l1, v1 in self.model.classifiedData.items():
             for l2, v2 in v1.items():
                 for l3, texts in v2.items():
+                    category_path = f"{l1}集 → {l2} → {l3}"
                     for t in texts:
-                        all_texts.append({
-                            **t,
-                            "categoryPath": f"{l1}集 → {l2} → {l3}"
-                        })
+                        all_texts.append((category_path, t))
 
         similar_texts = []
-        text_keywords = self._extract_keywords(text)  # 注意：这里会递归调用 _extract_keywords
+        # 复用上下文的扫描结果，不再重复分词
+        text_keywords = context.keywords
+        self._ensure_term_matcher()
 
-        for stored_text in all_texts:
-            stored_keywords = self._extract_keywords(stored_text['originalText'])
+        for category_path, stored_text in all_texts:
+            stored_keywords = self._get_stored_keywords(stored_text.original_text)
             common_keywords = [kw for kw in text_keywords if kw in stored_keywords]
 
             if len(common_keywords) >= 2:
                 similar_texts.append({
-                    **stored_text,
+                    **stored_text.to_dict(),
+                    "categoryPath": category_path,
                     "similarity": len(common_keywords),
                     "commonKeywords": common_keywords
                 })
@@ -192,7 +355,16 @@ class QingShiluService:
     def save_classification_result(self, original_text, translation, classification_key,
                                    article_id: str | None = None):
         """保存单条分类结果，新增 article_id 参数"""
-        self.model.save_classified_text(original_text, translation, classification_key, article_id)
+        new_entry, replaced_entry = self.model.save_classified_text(
+            original_text, translation, classification_key, article_id
+        )
+
+        # 增量更新语料统计 (尚未构建时留到首次使用再整体构建)
+        if self._corpus_stats_version == self.model.keywordMapVersion:
+            if replaced_entry is not None:
+                old_text = replaced_entry.original_text
+                self.corpus_stats.remove_document(self._get_stored_keywords(old_text), len(old_text))
+            self.corpus_stats.add_document(self._get_stored_keywords(original_text), len(original_text))
 
     # --- 关键词和分类管理方法 ---
 
@@ -0,0 +1,161 @@
+# services/batch_pipeline.py
+# ----------------------------------------------------
+# BatchPipeline：基于 asyncio 的批量处理流水线
+# 读取文件 -> 拆分去重 -> 分析 (analyzers 个并发) -> 输出，各阶段之间用有界队列连接。
+# 下游来不及处理时上游在 put 处等待 (背压)：同一时刻在途的文件和条文块数量有上限，与所选文件总数无关；
+# 文件读取在线程中进行，与条文分析相互重叠。
+
+import asyncio
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from gemini.services.analysis_service import BATCH_STAGES
+from gemini.services.records import AnalysisRecord
+
+# 队列结束标记
+_DONE = object()
+
+
+class BatchPipeline:
+    """
+    file_manager 提供 read_file / prepare_articles / needs_analysis / error_entry (见 FileManager)。
+    读取、拆分失败的文件和分析失败的条文都记为错误条目，不会中断整批处理。
+    analyze(texts, stages) 在 executor 中执行，返回与 texts 一一对应的分析结果；
+    默认使用 file_manager 的 QingShiluService.analyze_batch 和单个工作线程 (Service 不是线程安全的)。
+    传入进程池作为 executor 时，analyze 需要是可 pickle 的模块级函数 (见 batch_cli.py)。
+    """
+
+    def __init__(self, file_manager, stages=BATCH_STAGES, chunk_size=64, queue_size=4,
+                 analyzers=1, executor=None, analyze=None):
+        self.file_manager = file_manager
+        self.stages = stages
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.analyzers = analyzers
+        self.executor = executor
+        self.analyze = analyze or file_manager.qingshilu_service.analyze_batch
+        # 本次运行的计数：files / articles / analyzed / carried / errors
+        self.stats = Counter()
+
+    async def run(self, files, sink):
+        """处理 files，按输入顺序对每个批量条目调用 sink(entry)"""
+        self.stats = Counter()
+        file_queue = asyncio.Queue(self.queue_size)
+        chunk_queue = asyncio.Queue(self.queue_size)
+        result_queue = asyncio.Queue(self.queue_size)
+
+        executor = self.executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-analysis")
+        tasks = [
+            asyncio.create_task(self._read(files, file_queue)),
+            asyncio.create_task(self._split(file_queue, chunk_queue, len(files))),
+            asyncio.create_task(self._analyze_all(chunk_queue, result_queue, executor)),
+            asyncio.create_task(self._sink(result_queue, sink)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # 任一阶段出错时停止其余阶段，避免它们在队列上永久等待
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            if self.executor is None:
+                executor.shutdown(wait=False)
+        return self.stats
+
+    async def _read(self, files, file_queue):
+        for file_path in files:
+            try:
+                text = await asyncio.to_thread(self.file_manager.read_file, file_path)
+            except Exception as e:
+                await file_queue.put((file_path, None, e))
+            else:
+                await file_queue.put((file_path, text, None))
+        await file_queue.put(_DONE)
+
+    async def _split(self, file_queue, chunk_queue, total_files):
+        """拆分并去重，把批量条目按 chunk_size 分块 (块号用于输出时恢复顺序)"""
+        chunk, seq, index = [], 0, 0
+        while (item := await file_queue.get()) is not _DONE:
+            file_path, text, error = item
+            index += 1
+            self.stats['files'] += 1
+            if error is None:
+                try:
+                    entries = self.file_manager.prepare_articles(text, file_path)
+                except Exception as e:
+                    error = e
+                else:
+                    print(
+                        f"Service: 批量读取文件 {os.path.basename(file_path)} 完成，得到 {len(entries)} 条条文 ({index}/{total_files})")
+            if error is not None:
+                entries = [self.file_manager.error_entry(file_path, error)]
+
+            for entry in entries:
+                chunk.append(entry)
+                if len(chunk) >= self.chunk_size:
+                    await chunk_queue.put((seq, chunk))
+                    chunk, seq = [], seq + 1
+
+        if chunk:
+            await chunk_queue.put((seq, chunk))
+        for _ in range(self.analyzers):
+            await chunk_queue.put(_DONE)
+
+    async def _analyze_all(self, chunk_queue, result_queue, executor):
+        await asyncio.gather(*(self._analyze(chunk_queue, result_queue, executor) for _ in range(self.analyzers)))
+        await result_queue.put(_DONE)
+
+    async def _analyze(self, chunk_queue, result_queue, executor):
+        loop = asyncio.get_running_loop()
+        while (item := await chunk_queue.get()) is not _DONE:
+            seq, chunk = item
+            pending = [(i, entry) for i, entry in enumerate(chunk) if self.file_manager.needs_analysis(entry)]
+            if pending:
+                try:
+                    results = await loop.run_in_executor(
+                        executor, self.analyze, [entry.original_text for _, entry in pending], self.stages
+                    )
+                except Exception:
+                    # 整块分析失败：逐条重试，只有仍然失败的条文记为错误条目
+                    results = [await self._analyze_one(loop, executor, entry) for _, entry in pending]
+                for (i, entry), result in zip(pending, results):
+                    if isinstance(result, Exception):
+                        chunk[i] = self.file_manager.error_entry(
+                            entry.source_file, result, article_id=entry.article_id)
+                    else:
+                        # 转为紧凑的 AnalysisRecord，不再持有 AnalysisResult 的分析上下文
+                        entry.analysis = AnalysisRecord.from_dict(result)
+            await result_queue.put((seq, chunk))
+
+    async def _analyze_one(self, loop, executor, entry):
+        """单独分析一条条文，返回分析结果；失败时返回异常对象"""
+        try:
+            results = await loop.run_in_executor(executor, self.analyze, [entry.original_text], self.stages)
+        except Exception as e:
+            return e
+        return results[0]
+
+    async def _sink(self, result_queue, sink):
+        # 多个 analyzer 可能乱序完成：按块号缓存，按输入顺序输出
+        buffered, next_seq = {}, 0
+        while (item := await result_queue.get()) is not _DONE:
+            seq, chunk = item
+            buffered[seq] = chunk
+            while next_seq in buffered:
+                for entry in buffered.pop(next_seq):
+                    self._count(entry)
+                    sink(entry)
+                next_seq += 1
+
+    def _count(self, entry):
+        if entry.error is not None:
+            self.stats['errors'] += 1
+            return
+        self.stats['articles'] += 1
+        if entry.auto_classified:
+            self.stats['carried'] += 1
+        elif entry.analysis is not None:
+            self.stats['analyzed'] += 1
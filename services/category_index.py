@@ -0,0 +1,138 @@
+# services/category_index.py
+# ----------------------------------------------------
+# CategoryIndex：关键词 × 分类 关联矩阵，用于向量化的分类推荐打分
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 为可选依赖，缺失时退回纯 Python 实现
+    np = None
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+
+class CategoryIndex:
+    """
+    将关键词和分类映射为整数 ID，并构建 关键词 × 分类 的 0/1 关联矩阵。
+    一批文章的打分 = 文章 × 关键词 矩阵 与 关联矩阵 的一次矩阵乘法。
+    分数与原嵌套循环一致：分类得分 = 文章中出现的、属于该分类的关键词个数。
+    """
+
+    def __init__(self, keyword_map, registry=None):
+        # 分类按词库中的顺序编号 (列号)，保证同分时的排序与原实现一致。
+        # 传入 CategoryRegistry 时，categories 中存放注册表的分类 ID，打分结果和 matched_keywords 都使用该 ID；
+        # 无法解析的词库键被忽略。未传入时沿用词库键字符串。
+        if registry is None:
+            category_keys = list(keyword_map.keys())
+            self.categories = category_keys
+        else:
+            category_keys, self.categories = [], []
+            for key in keyword_map:
+                category_id = registry.id_of(key, register=True)
+                if category_id is None:
+                    print(f"警告: 无法解析关键词库中的分类键 '{key}'，已忽略。")
+                    continue
+                category_keys.append(key)
+                self.categories.append(category_id)
+        self.category_ids = {category: cid for cid, category in enumerate(self.categories)}
+
+        self.keywords = []
+        self.keyword_ids = {}
+        # 纯 Python 的稀疏表示：关键词 ID -> 包含该关键词的分类 ID 列表
+        self.keyword_categories = []
+        # 分类 ID -> 关键词集合 (用于生成 matchedKeywords)
+        self.category_keyword_sets = []
+
+        for cid, key in enumerate(category_keys):
+            category_keywords = set(keyword_map[key]['keywords'])
+            self.category_keyword_sets.append(category_keywords)
+            for keyword in category_keywords:
+                kid = self.keyword_ids.get(keyword)
+                if kid is None:
+                    kid = len(self.keywords)
+                    self.keyword_ids[keyword] = kid
+                    self.keywords.append(keyword)
+                    self.keyword_categories.append([])
+                self.keyword_categories[kid].append(cid)
+
+        self.incidence = self._build_incidence() if np is not None else None
+
+    def _build_incidence(self):
+        """关键词 × 分类 关联矩阵 (稠密 float32；分类数很少，矩阵本身很小)"""
+        incidence = np.zeros((len(self.keywords), len(self.categories)), dtype=np.float32)
+        for kid, category_ids in enumerate(self.keyword_categories):
+            incidence[kid, category_ids] = 1.0
+        return incidence
+
+    def _build_article_matrix(self, weight_rows):
+        """文章 × 关键词 的稀疏矩阵；weight_rows 为每篇文章的 {关键词: 权重}"""
+        rows, cols, values = [], [], []
+        for row, weights in enumerate(weight_rows):
+            for keyword, weight in weights.items():
+                kid = self.keyword_ids.get(keyword)
+                if kid is not None:
+                    rows.append(row)
+                    cols.append(kid)
+                    values.append(weight)
+
+        shape = (len(weight_rows), len(self.keywords))
+        if sparse is not None:
+            return sparse.csr_matrix((values, (rows, cols)), shape=shape, dtype=np.float32)
+
+        matrix = np.zeros(shape, dtype=np.float32)
+        matrix[rows, cols] = values
+        return matrix
+
+    def score_batch(self, weight_rows):
+        """
+        一次性为一批文章打分。
+        返回 文章 × 分类 的分数矩阵 (NumPy 可用时为 ndarray，否则为 list[list[float]])。
+        """
+        if np is not None:
+            if not self.keywords or not self.categories:
+                return np.zeros((len(weight_rows), len(self.categories)), dtype=np.float32)
+            return np.asarray(self._build_article_matrix(weight_rows) @ self.incidence)
+
+        scores = []
+        for weights in weight_rows:
+            row = [0.0] * len(self.categories)
+            for keyword, weight in weights.items():
+                kid = self.keyword_ids.get(keyword)
+                if kid is None:
+                    continue
+                for cid in self.keyword_categories[kid]:
+                    row[cid] += weight
+            scores.append(row)
+        return scores
+
+    def top_categories_batch(self, weight_rows, k=3):
+        """返回每篇文章得分最高的 k 个分类：[[(分类, 分数), ...], ...]，只保留正分 (分类为 categories 中的元素)"""
+        scores = self.score_batch(weight_rows)
+        results = []
+
+        if np is not None:
+            # 稳定排序：同分时保持词库中的分类顺序
+            order = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+            for row, top in zip(scores, order):
+                results.append([(self.categories[cid], _as_number(row[cid].item())) for cid in top if row[cid] > 0])
+            return results
+
+        for row in scores:
+            ranked = sorted(
+                (cid for cid, score in enumerate(row) if score > 0),
+                key=lambda cid: row[cid], reverse=True
+            )[:k]
+            results.append([(self.categories[cid], _as_number(row[cid])) for cid in ranked])
+        return results
+
+    def matched_keywords(self, category, keywords):
+        """文章关键词中属于该分类 (categories 中的元素) 的部分，保持 keywords 的顺序"""
+        category_keywords = self.category_keyword_sets[self.category_ids[category]]
+        return [kw for kw in keywords if kw in category_keywords]
+
+
+def _as_number(value):
+    """整数分数按 int 返回 (与原计数打分的输出一致)"""
+    return int(value) if float(value).is_integer() else value
@@ -0,0 +1,111 @@
+# services/category_registry.py
+# ----------------------------------------------------
+# CategoryRegistry：为三级分类分配紧凑的整数 ID (见 improvement.md「引入分类 ID 机制」)
+# 分类在系统中有两种字符串形式：
+#   显示 / 关键词库键: "事务类-赈灾与民生保障-赈灾"
+#   保存键 (classifiedData): "0/赈灾与民生保障/赈灾"
+# 注册表把两种形式都映射到同一个 ID，ID 到任一形式的转换都是 O(1) 的列表下标，
+# 打分、存储和索引内部只传递 ID，需要展示或落盘时再转换，不再反复 split / 拼接字符串。
+
+import sys
+
+# L1 键 -> 显示名称前缀
+L1_DISPLAY_NAMES = {
+    "0": "事务类",
+    "1": "问题类",
+}
+
+
+class CategoryRegistry:
+    """
+    分类 ID 按注册顺序从 0 开始分配，同一分类重复注册返回同一个 ID。
+    字符串均经过 sys.intern，推荐结果、批量条目中重复出现的分类键共用同一个对象。
+    """
+
+    def __init__(self, category_structure=None):
+        self._paths = []         # ID -> (l1 键, L2 名称, L3 名称)
+        self._save_keys = []     # ID -> "0/L2/L3"
+        self._display_keys = []  # ID -> "事务类-L2-L3"
+        self._ids = {}           # 两种字符串形式 -> ID
+        self._l1_keys = {name: key for key, name in L1_DISPLAY_NAMES.items()}
+
+        if category_structure:
+            for l1, l2_map in category_structure.items():
+                for l2, l3_map in l2_map.items():
+                    for l3 in l3_map:
+                        self.register(l1, l2, l3)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, key):
+        return key in self._ids
+
+    def register(self, l1, l2, l3):
+        """注册分类 (l1 为 "0" / "1" 这样的 L1 键)，返回其 ID"""
+        save_key = f"{l1}/{l2}/{l3}"
+        category_id = self._ids.get(save_key)
+        if category_id is not None:
+            return category_id
+
+        category_id = len(self._paths)
+        l1_name = L1_DISPLAY_NAMES.get(l1, l1)
+        save_key = sys.intern(save_key)
+        display_key = sys.intern(f"{l1_name}-{l2}-{l3}")
+        self._paths.append((sys.intern(l1), sys.intern(l2), sys.intern(l3)))
+        self._save_keys.append(save_key)
+        self._display_keys.append(display_key)
+        self._ids[save_key] = category_id
+        self._ids[display_key] = category_id
+        return category_id
+
+    def parse(self, key):
+        """把任一字符串形式解析为 (l1 键, L2, L3)；格式不对时返回 None"""
+        if '/' in key:
+            parts = key.split('/')
+            if len(parts) == 3 and parts[0] in L1_DISPLAY_NAMES:
+                return tuple(parts)
+            return None
+
+        parts = key.split('-')
+        if len(parts) == 3 and parts[0] in self._l1_keys:
+            return self._l1_keys[parts[0]], parts[1], parts[2]
+        return None
+
+    def id_of(self, key, register=False):
+        """
+        任一字符串形式 -> ID。未注册的分类返回 None；
+        register=True 时解析并注册 (例如关键词库中新增的分类)，格式不对时仍返回 None。
+        """
+        category_id = self._ids.get(key)
+        if category_id is not None or not register:
+            return category_id
+        path = self.parse(key)
+        return self.register(*path) if path is not None else None
+
+    def path(self, category_id):
+        """ID -> (l1 键, L2, L3)"""
+        return self._paths[category_id]
+
+    def save_key(self, category_id):
+        """ID -> "0/L2/L3" """
+        return self._save_keys[category_id]
+
+    def display_key(self, category_id):
+        """ID -> "事务类-L2-L3" """
+        return self._display_keys[category_id]
+
+    def display_path(self, category_id):
+        """ID -> ("事务类", L2, L3)"""
+        l1, l2, l3 = self._paths[category_id]
+        return L1_DISPLAY_NAMES.get(l1, l1), l2, l3
+
+    def to_save_key(self, key):
+        """任一字符串形式 -> 保存键；无法解析时返回 None"""
+        category_id = self.id_of(key, register=True)
+        return self._save_keys[category_id] if category_id is not None else None
+
+    def to_display_key(self, key):
+        """任一字符串形式 -> 显示键；无法解析时返回 None"""
+        category_id = self.id_of(key, register=True)
+        return self._display_keys[category_id] if category_id is not None else None
@@ -1,19 +1,93 @@
 # services/constants.py
 # ----------------------------------------------------
 # 存放所有公共常量和路径配置
+#
+# 数据目录在首次使用时才解析和创建 (导入本模块没有任何副作用)，优先级从高到低：
+#   1. set_data_dir()：命令行参数 --data-dir 或测试 / 基准脚本直接设置
+#   2. 环境变量 QINGSHILU_DATA_DIR
+#   3. 配置文件中的 "data_dir"：环境变量 QINGSHILU_CONFIG 指定的文件，否则为项目根目录下的 config.json
+#      (相对路径以配置文件所在目录为基准)
+#   4. 默认：项目根目录下的 data/
+# 需要多个互相隔离的实例时 (例如并行运行的基准数据)，可直接把 data_dir 传给 DataModel / QingShiluService。
 
+import json
 import os
 
-# 路径配置
-# 假设项目的根目录是 /Users/luckpuppy/Desktop/UItools/gemini
-DATA_DIR = "/Users/luckpuppy/Desktop/UItools/gemini/data"
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-if not os.path.exists(DATA_DIR):
-    os.makedirs(DATA_DIR)
+DATA_DIR_ENV = "QINGSHILU_DATA_DIR"
+CONFIG_FILE_ENV = "QINGSHILU_CONFIG"
+DEFAULT_CONFIG_FILE = os.path.join(PROJECT_ROOT, "config.json")
+DEFAULT_DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 
-# 数据持久化文件定义 (使用绝对路径)
-CLASSIFIED_DATA_FILE = os.path.join(DATA_DIR, "classified_data.json")
-CUSTOM_KEYWORD_FILE = os.path.join(DATA_DIR, "custom_keywords.json")
-HISTORY_FILE = os.path.join(DATA_DIR, "translation_history.json")
+# 数据持久化文件名 (位于数据目录下)
+CLASSIFIED_DATA_FILENAME = "classified_data.json"
+CUSTOM_KEYWORD_FILENAME = "custom_keywords.json"
+HISTORY_FILENAME = "translation_history.json"
 
-print(f"INFO: Data files will be stored in: {DATA_DIR}")
\ No newline at end of file
+# 旧的模块级常量名 -> 文件名，通过模块 __getattr__ 惰性解析 (兼容 from constants import CLASSIFIED_DATA_FILE)
+_LEGACY_FILE_CONSTANTS = {
+    "CLASSIFIED_DATA_FILE": CLASSIFIED_DATA_FILENAME,
+    "CUSTOM_KEYWORD_FILE": CUSTOM_KEYWORD_FILENAME,
+    "HISTORY_FILE": HISTORY_FILENAME,
+}
+
+_data_dir_override = None
+
+
+def set_data_dir(path):
+    """指定数据目录 (优先级最高)；传入 None 恢复按环境变量 / 配置文件解析"""
+    global _data_dir_override
+    _data_dir_override = os.path.abspath(os.path.expanduser(path)) if path else None
+
+
+def load_config(config_file=None):
+    """读取 JSON 配置文件；文件不存在时返回空配置"""
+    config_file = config_file or os.environ.get(CONFIG_FILE_ENV) or DEFAULT_CONFIG_FILE
+    if not os.path.exists(config_file):
+        return {}, config_file
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            return json.load(f), config_file
+    except Exception as e:
+        print(f"警告：无法读取配置文件 {config_file}，使用默认配置。错误: {e}")
+        return {}, config_file
+
+
+def resolve_data_dir():
+    """按优先级解析数据目录 (不创建目录)"""
+    if _data_dir_override:
+        return _data_dir_override
+
+    env_dir = os.environ.get(DATA_DIR_ENV)
+    if env_dir:
+        return os.path.abspath(os.path.expanduser(env_dir))
+
+    config, config_file = load_config()
+    config_dir = config.get("data_dir")
+    if config_dir:
+        config_dir = os.path.expanduser(config_dir)
+        return os.path.abspath(os.path.join(os.path.dirname(config_file), config_dir))
+
+    return DEFAULT_DATA_DIR
+
+
+def get_data_dir(data_dir=None, create=True):
+    """返回数据目录的绝对路径 (data_dir 为 None 时按优先级解析)，需要时创建"""
+    data_dir = os.path.abspath(os.path.expanduser(data_dir)) if data_dir else resolve_data_dir()
+    if create:
+        os.makedirs(data_dir, exist_ok=True)
+    return data_dir
+
+
+def data_file(filename, data_dir=None):
+    """数据目录下某个持久化文件的路径"""
+    return os.path.join(get_data_dir(data_dir), filename)
+
+
+def __getattr__(name):
+    if name == "DATA_DIR":
+        return get_data_dir()
+    if name in _LEGACY_FILE_CONSTANTS:
+        return data_file(_LEGACY_FILE_CONSTANTS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
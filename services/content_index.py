@@ -0,0 +1,47 @@
+# services/content_index.py
+# ----------------------------------------------------
+# ContentHashIndex：按归一化正文的哈希查找已分类条文，用于批量导入时的重复检测。
+# 归一化沿用 prepare_text/history_cleaner.py 的 clean_line + normalize，与语料清洗阶段的去重口径一致。
+
+from gemini.prepare_text.history_cleaner import clean_line, normalize, key_hash
+
+
+def content_hash(text):
+    """条文的内容哈希：去掉 ○序号、做全角/半角与 NFKC 归一化后取 64 位 blake2b (与清洗阶段的哈希库一致)"""
+    return key_hash(normalize(clean_line(text)))
+
+
+class ContentHashIndex:
+    """
+    内容哈希 -> 已分类条目 的索引。
+    同一内容可能被保存在多个分类下，查找时返回最近加入的一条。
+    分类以 CategoryRegistry 的整数 ID 记录。
+    """
+
+    def __init__(self):
+        self._entries = {}  # 内容哈希 -> [(分类 ID, 条目), ...]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, digest):
+        return digest in self._entries
+
+    def add(self, category_id, entry):
+        digest = content_hash(entry.original_text)
+        self._entries.setdefault(digest, []).append((category_id, entry))
+        return digest
+
+    def remove(self, entry):
+        digest = content_hash(entry.original_text)
+        located = self._entries.get(digest)
+        if not located:
+            return
+        located[:] = [item for item in located if item[1] is not entry]
+        if not located:
+            del self._entries[digest]
+
+    def lookup(self, digest):
+        """返回 (分类 ID, 条目)；未收录时返回 None"""
+        located = self._entries.get(digest)
+        return located[-1] if located else None
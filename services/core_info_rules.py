@@ -0,0 +1,120 @@
+# services/core_info_rules.py
+# ----------------------------------------------------
+# 核心信息（主体 / 动作 / 性质）抽取规则表。
+# 规则全部是数据：需要识别新的官职或动作时，只需修改下面的列表。
+
+import bisect
+import re
+
+# 官职称谓：主体 = 同一分句内称谓之前的地名/人名 + 称谓 (例: "河东河道总督")
+# 列表顺序即优先级：同一分句内出现多个称谓时，取排在前面的称谓
+OFFICIAL_TITLES = ["巡抚", "总督", "按察使", "知府", "知县"]
+
+# 朝廷层面的主体：单独出现即视为主体
+AUTHORITY_SUBJECTS = ["皇上", "皇帝", "朝廷", "部议"]
+
+# 核心动作词（按优先级排列，取第一个出现的）
+ACTION_KEYWORDS = ["参奏", "题参", "疏报", "谕令", "谕", "抚恤", "赈济", "剿", "捕", "审", "判", "任免", "调", "革职"]
+
+# 事件性质判断规则（按顺序匹配，命中任一词即采用该性质）
+NATURE_RULES = [
+    ("官员失职问题", ["不效力", "徇私", "贪暴", "失职"]),
+    ("灾害救济事务", ["被灾", "抚恤", "赈济"]),
+]
+
+# 预编译：分句（连续的 \w 字符）。线性扫描一次，不回溯
+_WORD_RUN_RE = re.compile(r"\w+")
+
+
+class CoreInfoExtractor:
+    """
+    基于规则表的核心信息抽取器。
+    所有词条（称谓、动作词、性质词）都交给 AnalysisContext 的一次扫描统一匹配，
+    这里只根据扫描得到的位置解析规则，不再对全文执行带回溯的正则。
+    """
+
+    def __init__(self, official_titles=None, authority_subjects=None, action_keywords=None, nature_rules=None):
+        self.official_titles = list(official_titles or OFFICIAL_TITLES)
+        self.authority_subjects = list(authority_subjects or AUTHORITY_SUBJECTS)
+        self.action_keywords = list(action_keywords or ACTION_KEYWORDS)
+        self.nature_rules = list(nature_rules or NATURE_RULES)
+
+        self._title_rank = {title: rank for rank, title in enumerate(self.official_titles)}
+
+    @property
+    def terms(self):
+        """规则表用到的全部词条，需注册到 TermMatcher 中"""
+        terms = set(self.official_titles)
+        terms.update(self.authority_subjects)
+        terms.update(self.action_keywords)
+        for _, nature_terms in self.nature_rules:
+            terms.update(nature_terms)
+        return terms
+
+    def extract(self, context):
+        """
+        提取核心信息（JS: extractCoreInfo）
+        与原实现一样在原文上匹配：换行是分句边界，主体不会跨行拼接，跨行的动作词/性质词也不算出现。
+        """
+        term_positions = context.raw_term_positions
+        subject = self._extract_subject(context.text, term_positions)
+
+        action = next((term for term in self.action_keywords if term in term_positions), "")
+
+        nature = ""
+        for nature_name, nature_terms in self.nature_rules:
+            if any(term in term_positions for term in nature_terms):
+                nature = nature_name
+                break
+
+        return {"subject": subject, "action": action, "nature": nature}
+
+    def _extract_subject(self, text, term_positions):
+        """
+        与原正则 (○\\d+)?\\s*(\\w+?巡抚|...|皇上|皇帝|朝廷|部议) 的匹配结果一致：
+        取最靠前的候选；官职候选从所在分句的开头算起。
+        """
+        candidates = []  # (起始位置, 类型优先级, 主体)
+
+        title_hits = [
+            (position, self._title_rank[title], title)
+            for title in self.official_titles
+            for position in term_positions.get(title, ())
+        ]
+        if title_hits:
+            runs = [(m.start(), m.end()) for m in _WORD_RUN_RE.finditer(text)]
+            run_starts = [start for start, _ in runs]
+            best_by_run = {}
+            for position, rank, title in title_hits:
+                run_index = bisect.bisect_right(run_starts, position) - 1
+                run_start, _ = runs[run_index]
+                subject_start = self._subject_start(text, run_start, position)
+                if subject_start is None:
+                    continue
+                # 同一分句内：称谓优先级高者优先，同一称谓取第一次出现
+                key = (rank, position)
+                best = best_by_run.get(run_start)
+                if best is None or key < best[0]:
+                    best_by_run[run_start] = (key, text[subject_start:position + len(title)])
+            for run_start, (_, subject) in best_by_run.items():
+                candidates.append((run_start, 0, subject))
+
+        for authority in self.authority_subjects:
+            positions = term_positions.get(authority)
+            if positions:
+                candidates.append((positions[0], 1, authority))
+
+        if not candidates:
+            return ""
+        return min(candidates)[2]
+
+    @staticmethod
+    def _subject_start(text, run_start, title_position):
+        """计算主体的起点：跳过分句开头的 "○序号"，且称谓前至少保留一个字符"""
+        start = run_start
+        if start > 0 and text[start - 1] == '○':
+            while start < title_position - 1 and text[start].isdecimal():
+                start += 1
+        if start >= title_position:
+            return None
+        return start
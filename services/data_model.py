@@ -8,8 +8,13 @@ import traceback
 
 # 🌟【注意】我们保持 category_structure.py 文件不变，它导入的是原始结构
 from gemini.services.category_structure import DEFAULT_CATEGORY_STRUCTURE
-from gemini.services.keywords_data import QING_SHILU_KEYWORDS
-from gemini.services.constants import CLASSIFIED_DATA_FILE, CUSTOM_KEYWORD_FILE, HISTORY_FILE
+from gemini.services.constants import (
+    CLASSIFIED_DATA_FILENAME, CUSTOM_KEYWORD_FILENAME, HISTORY_FILENAME, get_data_dir
+)
+from gemini.services.similarity_index import SIMILARITY_INDEXES
+from gemini.services.content_index import ContentHashIndex
+from gemini.services.category_registry import CategoryRegistry
+from gemini.services.records import ClassifiedEntry, classified_data_from_json, record_to_json
 
 # L1 键的显示名称映射，用于在不修改 category_structure.py 的前提下生成 'name' 字段
 # 这是根据您提供的 category_structure.py 中的注释确定的。
@@ -24,24 +29,37 @@ class DataModel:
     负责管理和持久化应用的所有数据：分类结构、关键词、历史记录。
     """
 
-    def __init__(self):
+    def __init__(self, data_dir: str | None = None):
+        # 数据目录：未指定时按 constants.py 的配置解析 (命令行参数 / 环境变量 / 配置文件 / 默认)
+        self.data_dir = get_data_dir(data_dir)
+        self.classified_data_file = os.path.join(self.data_dir, CLASSIFIED_DATA_FILENAME)
+        self.custom_keyword_file = os.path.join(self.data_dir, CUSTOM_KEYWORD_FILENAME)
+        self.history_file = os.path.join(self.data_dir, HISTORY_FILENAME)
+        print(f"INFO: Data files will be stored in: {self.data_dir}")
+
         self.classifiedData = {}
         self.translationHistory = []
         self.customKeywordMap = {}
         # categoryStructure 存储的是 category_structure.py 导入的原始结构
         self.categoryStructure = self._get_default_category_structure()
-        self.qingShiluKeywords = self._get_qing_shilu_keywords()
+        # 分类注册表：两种分类键字符串 <-> 整数 ID，打分、存储和索引内部使用 ID
+        self.category_registry = CategoryRegistry(self.categoryStructure)
+
+        self.mergedKeywordMap = {}
+        # 关键词库版本号：每次合并词库后递增，供 Service 判断缓存是否失效
+        self.keywordMapVersion = 0
 
-        self.mergedKeywordMap = {**self.qingShiluKeywords}
+        # 相似检索索引 (名称 -> 索引)：首次使用时构建，保存分类时增量更新
+        self._similarity_indexes = {}
+        # 索引中的文档键 id(条目) -> (分类 ID, 条目)
+        self._indexed_entries = {}
+        # 内容哈希索引：批量导入时检测重复条文，首次使用时构建
+        self._content_index = None
 
         self.load_all_data()
 
         print(f"DEBUG(Model): Merged Keyword Map size: {len(self.mergedKeywordMap)}")
 
-    def _get_qing_shilu_keywords(self):
-        """加载《清实录》专属词库"""
-        return QING_SHILU_KEYWORDS
-
     def _get_default_category_structure(self):
         """加载默认分类结构"""
         return DEFAULT_CATEGORY_STRUCTURE
@@ -93,29 +111,41 @@ class DataModel:
         return default_data if default_data is not None else {}
 
     def save_data_to_json(self, data, file_path):
-        """通用 JSON 文件保存函数"""
+        """通用 JSON 文件保存函数 (services/records.py 中的记录按 to_dict() 写出)"""
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+                json.dump(data, f, ensure_ascii=False, indent=4, default=record_to_json)
         except Exception as e:
             print(f"错误：无法保存数据到 {file_path}. 错误: {e}")
 
     def load_all_data(self):
         """加载所有持久化数据"""
-        self.classifiedData = self.load_data_from_json(CLASSIFIED_DATA_FILE)
-        self.translationHistory = self.load_data_from_json(HISTORY_FILE, default_data=[])
-        self.customKeywordMap = self.load_data_from_json(CUSTOM_KEYWORD_FILE)
+        # 已分类条目以 ClassifiedEntry 记录保存，写回时还原为原有的 JSON 结构
+        self.classifiedData = classified_data_from_json(self.load_data_from_json(self.classified_data_file))
+        self.translationHistory = self.load_data_from_json(self.history_file, default_data=[])
+        self.customKeywordMap = self.load_data_from_json(self.custom_keyword_file)
         self._update_merged_keyword_map()
+        self._reset_similarity_indexes()
 
     def _update_merged_keyword_map(self):
-        """合并《清实录》自带词库和自定义词库"""
-        self.mergedKeywordMap = {**self.qingShiluKeywords, **self.customKeywordMap}
+        """合并词库 (分类关键词全部来自自定义词库 custom_keywords.json)"""
+        self.mergedKeywordMap = {**self.customKeywordMap}
+        # 词库中新增的分类 (例如自定义关键词) 也登记到注册表
+        for category_key in self.mergedKeywordMap:
+            self.category_registry.id_of(category_key, register=True)
+        self.keywordMapVersion += 1
 
     def save_classified_text(self, original_text, translation, classification_key, article_id: str | None = None):
-        """保存已分类的文本，新增 article_id 用于批量处理的标识（JS: saveClassification）"""
+        """
+        保存已分类的文本，新增 article_id 用于批量处理的标识（JS: saveClassification）
+        返回 (新条目, 被替换的旧条目或 None)，供 Service 增量更新语料统计。
+        """
 
-        # 示例 key: '0/赈灾与民生保障/赈灾'
-        l1, l2, l3 = classification_key.split('/')
+        # 示例 key: '0/赈灾与民生保障/赈灾' (显示键 '事务类-赈灾与民生保障-赈灾' 同样接受)
+        category_id = self.category_registry.id_of(classification_key, register=True)
+        if category_id is None:
+            raise ValueError(f"无效的分类键: {classification_key}")
+        l1, l2, l3 = self.category_registry.path(category_id)
 
         if l1 not in self.classifiedData:
             self.classifiedData[l1] = {}
@@ -124,20 +154,17 @@ class DataModel:
         if l3 not in self.classifiedData[l1][l2]:
             self.classifiedData[l1][l2][l3] = []
 
-        new_entry = {
-            "originalText": original_text,
-            "translation": translation,
-            "articleId": article_id,
-            "timestamp": time.time()
-        }
+        new_entry = ClassifiedEntry(original_text, translation, article_id, time.time())
 
         # 检查是否已存在具有相同 articleId 的条目
         is_updated = False
+        replaced_entry = None
         if article_id:
             try:
                 articles_list = self.classifiedData[l1][l2][l3]
                 for i, existing_entry in enumerate(articles_list):
-                    if existing_entry.get("articleId") == article_id:
+                    if existing_entry.article_id == article_id:
+                        replaced_entry = existing_entry
                         articles_list[i] = new_entry
                         is_updated = True
                         break
@@ -147,7 +174,74 @@ class DataModel:
         if not is_updated:
             self.classifiedData[l1][l2][l3].append(new_entry)
 
-        self.save_data_to_json(self.classifiedData, CLASSIFIED_DATA_FILE)
+        # 增量更新已构建的相似检索索引
+        if replaced_entry is not None:
+            self._unindex_entry(replaced_entry)
+        self._index_entry(category_id, new_entry)
+        if self._content_index is not None:
+            if replaced_entry is not None:
+                self._content_index.remove(replaced_entry)
+            self._content_index.add(category_id, new_entry)
+
+        self.save_data_to_json(self.classifiedData, self.classified_data_file)
+        return new_entry, replaced_entry
+
+    # =================================================================
+    # 相似检索索引 (services/similarity_index.py)
+    # =================================================================
+
+    def iter_classified_entries(self):
+        """遍历所有已分类条目，产出 (分类 ID, 条目)"""
+        register = self.category_registry.register
+        for l1, v1 in self.classifiedData.items():
+            for l2, v2 in v1.items():
+                for l3, texts in v2.items():
+                    category_id = register(l1, l2, l3)
+                    for entry in texts:
+                        yield category_id, entry
+
+    def get_similarity_index(self, name='minhash'):
+        """获取 (必要时构建) 指定名称的相似检索索引"""
+        index = self._similarity_indexes.get(name)
+        if index is None:
+            if name not in SIMILARITY_INDEXES:
+                raise ValueError(f"未知的相似检索索引: {name}，可选: {sorted(SIMILARITY_INDEXES)}")
+            index = SIMILARITY_INDEXES[name]()
+            for category_id, entry in self.iter_classified_entries():
+                self._indexed_entries[id(entry)] = (category_id, entry)
+                index.add(id(entry), entry.original_text)
+            self._similarity_indexes[name] = index
+        return index
+
+    def get_indexed_entry(self, doc_key):
+        """根据索引返回的文档键取回 (分类 ID, 条目)"""
+        return self._indexed_entries[doc_key]
+
+    def _index_entry(self, category_id, entry):
+        if not self._similarity_indexes:
+            return
+        self._indexed_entries[id(entry)] = (category_id, entry)
+        for index in self._similarity_indexes.values():
+            index.add(id(entry), entry.original_text)
+
+    def _unindex_entry(self, entry):
+        for index in self._similarity_indexes.values():
+            index.remove(id(entry))
+        self._indexed_entries.pop(id(entry), None)
+
+    def _reset_similarity_indexes(self):
+        self._similarity_indexes = {}
+        self._indexed_entries = {}
+        self._content_index = None
+
+    def get_content_index(self):
+        """获取 (必要时构建) 已分类条文的内容哈希索引"""
+        if self._content_index is None:
+            index = ContentHashIndex()
+            for category_id, entry in self.iter_classified_entries():
+                index.add(category_id, entry)
+            self._content_index = index
+        return self._content_index
 
     def update_custom_keywords(self, category_key, keywords):
         """更新自定义关键词并保存（JS: saveKeywords）"""
@@ -158,12 +252,12 @@ class DataModel:
         self.customKeywordMap[category_key]['keywords'] = keywords
 
         self._update_merged_keyword_map()
-        self.save_data_to_json(self.customKeywordMap, CUSTOM_KEYWORD_FILE)
+        self.save_data_to_json(self.customKeywordMap, self.custom_keyword_file)
 
     def find_category_cases(self, l1, l2, l3):
         """查找指定分类下的案例文本"""
         return [
-            item['originalText']
+            item.original_text
             for item in self.classifiedData.get(l1, {}).get(l2, {}).get(l3, [])
         ]
 
@@ -302,10 +396,10 @@ class DataModel:
                             "Level1": l1_key,
                             "Level2": l2_name,
                             "Level3": l3_name,
-                            "OriginalText": article['originalText'],
-                            "Translation": article.get('translation', 'N/A'),
-                            "ArticleId": article.get('articleId', 'N/A'),
-                            "Timestamp": article['timestamp']
+                            "OriginalText": article.original_text,
+                            "Translation": article.translation,
+                            "ArticleId": article.article_id,
+                            "Timestamp": article.timestamp
                         })
 
         return articles_to_export
@@ -1,13 +1,24 @@
 # services/file_manager.py
 # ----------------------------------------------------
-# FileManager 类：文件I/O、批量处理、UI交互
+# FileManager 类：文件I/O、批量处理
+# 本模块不依赖 Qt：文件选择对话框由 UI 层通过 file_selector 适配器注入 (见 ui_utils.QtFileSelector)
 
+import asyncio
 import os
 import re
-from PySide6.QtWidgets import QFileDialog, QWidget
 
 # 从同级模块导入 QingShiluService (用于分析)
-from gemini.services.analysis_service import QingShiluService
+from gemini.services.analysis_service import QingShiluService, BATCH_STAGES
+from gemini.services.content_index import content_hash
+from gemini.services.batch_pipeline import BatchPipeline
+from gemini.services.records import BatchArticle
+from gemini.prepare_text.rank import number_text
+
+# 批量导入时对已分类过的条文的处理方式：
+# 'carry'   - 沿用已保存的分类，不再分析 (默认)
+# 'skip'    - 跳过，不再分析和展示
+# 'analyze' - 照常分析 (仅跳过本批次内部的重复)
+KNOWN_ARTICLE_POLICIES = ('carry', 'skip', 'analyze')
 
 
 class FileManager:
@@ -15,17 +26,39 @@ class FileManager:
     负责文件操作相关的核心业务逻辑，现包含多条历史条文的批量处理。
     """
 
-    def __init__(self, qingshilu_service: QingShiluService):
+    def __init__(self, qingshilu_service: QingShiluService, file_selector=None):
         self.qingshilu_service = qingshilu_service
+        # 文件选择适配器，需提供 select_files(parent, title, name_filter) -> list[str]
+        self.file_selector = file_selector
         self.selected_files = []
-        # 存储批量分析结果，包含条文的列表
+        # 存储批量分析结果，包含条文的列表 (BatchArticle 记录，to_dict() 得到原有的 JSON 结构)
         self.batch_articles = []
-
-    def select_batch_files(self, parent_widget: QWidget) -> list[str] | None:
-        """打开文件对话框，选择文件列表，并更新内部状态"""
-        files, _ = QFileDialog.getOpenFileNames(
-            parent_widget, "选择批量文件", "", "文本文件 (*.txt);;所有文件 (*)"
+        # 本次批量处理中因重复而跳过的条文：{"article_id", "duplicate_of", "reason"}
+        self.skipped_articles = []
+        self.known_article_policy = 'carry'
+        # 为 True 时，没有任何“○”标记的原始文件按行临时编号 (每个非空行为一条条文)，见 prepare_text/rank.py
+        self.number_raw_files = False
+        self._content_index = None
+        self._seen_in_batch = {}
+
+    def set_known_article_policy(self, policy: str):
+        """设置已分类条文的处理方式，取值见 KNOWN_ARTICLE_POLICIES"""
+        if policy not in KNOWN_ARTICLE_POLICIES:
+            raise ValueError(f"未知的重复条文处理方式: {policy}，可选: {KNOWN_ARTICLE_POLICIES}")
+        self.known_article_policy = policy
+
+    def select_batch_files(self, parent_widget=None) -> list[str] | None:
+        """通过 file_selector 让用户选择文件列表，并更新内部状态"""
+        if self.file_selector is None:
+            raise RuntimeError("FileManager 未配置 file_selector，无界面时请直接调用 set_selected_files()")
+
+        files = self.file_selector.select_files(
+            parent_widget, "选择批量文件", "文本文件 (*.txt);;所有文件 (*)"
         )
+        return self.set_selected_files(files)
+
+    def set_selected_files(self, files: list[str]) -> list[str] | None:
+        """直接设置待处理的文件列表 (命令行等无界面场景)"""
         if files:
             self.selected_files = files
             return files
@@ -69,55 +102,139 @@ class FileManager:
     def process_files(self):
         """
         执行批量分析的核心调度逻辑：读取文件 -> 拆分条文 -> 分析条文。
+        各阶段由 BatchPipeline 以有界队列串联，文件读取与条文分析相互重叠。
         """
         files_to_process = self.get_selected_files()
         if not files_to_process:
             return "错误：没有文件可供处理。"
 
+        self.begin_batch()
+        # 批量界面只展示推荐，其余阶段按需惰性计算
+        pipeline = BatchPipeline(self, stages=BATCH_STAGES)
+        asyncio.run(pipeline.run(files_to_process, self.batch_articles.append))
+
+        return self.summarize_batch(len(files_to_process))
+
+    def begin_batch(self):
+        """开始新的一批：清空 batch_articles / skipped_articles 和批次内的去重记录"""
         self.batch_articles = []
-        total_files = len(files_to_process)
-        article_count = 0
-
-        for i, file_path in enumerate(files_to_process):
-            try:
-                # 1. 读取文件内容
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    text = f.read()
-
-                # 2. 拆分文件为多条历史条文
-                articles = self._split_text_into_articles(text, file_path)
-                article_count += len(articles)
-
-                # 3. 对每条条文进行分析
-                for article in articles:
-                    # 调用核心分析服务进行分析
-                    analysis_result = self.qingshilu_service.run_full_analysis(article['originalText'])
-
-                    self.batch_articles.append({
-                        "article_id": article['article_id'],
-                        "originalText": article['originalText'],
-                        "analysis": analysis_result,
-                        "classification_key": None  # 初始时未分类
-                    })
-
-                print(
-                    f"Service: 批量处理文件 {os.path.basename(file_path)} 完成，拆分出 {len(articles)} 条条文 ({i + 1}/{total_files})")
-
-            except Exception as e:
-                error_msg = f"处理文件 {os.path.basename(file_path)} 失败: {e}"
-                print(error_msg)
-                # 记录文件级别的错误 (将错误作为单独的条目记录)
-                self.batch_articles.append({"article_id": f"ERROR_{os.path.basename(file_path)}", "error": error_msg})
-
-        return f"批量处理成功：共处理 {total_files} 个文件，拆分并分析 {article_count} 条条文。"
+        self.skipped_articles = []
+        # 按归一化正文的哈希去重：本批次内重复的只保留首次出现，已分类过的按 known_article_policy 处理
+        self._content_index = self.qingshilu_service.model.get_content_index()
+        self._seen_in_batch = {}  # 内容哈希 -> 首次出现的 article_id
+
+    def read_file(self, file_path: str) -> str:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        if self.number_raw_files and '○' not in text:
+            text = number_text(text)
+        return text
+
+    def prepare_articles(self, text: str, file_path: str) -> list[BatchArticle]:
+        """
+        拆分一个文件的文本并去重，返回该文件的批量条目 (需在 begin_batch 之后调用)。
+        重复条文记入 skipped_articles；已分类过的条文按 known_article_policy 直接沿用分类。
+        仍需分析的条目 analysis 为 None，见 needs_analysis()。
+        """
+        entries = []
+        for article in self._split_text_into_articles(text, file_path):
+            digest = content_hash(article['originalText'])
+            duplicate = self._find_duplicate(digest, self._seen_in_batch, self._content_index)
+            if duplicate is not None:
+                duplicate_of, reason = duplicate
+                self.skipped_articles.append({
+                    "article_id": article['article_id'],
+                    "duplicate_of": duplicate_of,
+                    "reason": reason
+                })
+                continue
+            self._seen_in_batch[digest] = article['article_id']
+
+            # 初始时未分类、未分析
+            entry = BatchArticle(article['article_id'], article['originalText'], file_path)
+
+            located = self._content_index.lookup(digest) if self.known_article_policy == 'carry' else None
+            if located is not None:
+                # 已分类过的条文：直接沿用保存的分类和译文，不再分析
+                category_id, stored = located
+                entry.classification_key = self.qingshilu_service.model.category_registry.save_key(category_id)
+                entry.translation = stored.translation
+                entry.auto_classified = True
+                entry.matched_article_id = stored.article_id
+            entries.append(entry)
+        return entries
+
+    @staticmethod
+    def needs_analysis(entry: BatchArticle) -> bool:
+        return entry.error is None and entry.analysis is None and not entry.auto_classified
+
+    @staticmethod
+    def error_entry(file_path: str, error: Exception, article_id: str | None = None) -> BatchArticle:
+        """
+        处理失败的条目：默认为文件级别的错误 (读取或拆分失败，将错误作为单独的条目记录)；
+        传入 article_id 时为单条条文分析失败，错误条目沿用该条文的 article_id。
+        """
+        if article_id is None:
+            article_id = f"ERROR_{os.path.basename(file_path)}"
+            error_msg = f"处理文件 {os.path.basename(file_path)} 失败: {error}"
+        else:
+            error_msg = f"分析条文 {article_id} ({os.path.basename(file_path)}) 失败: {error}"
+        print(error_msg)
+        return BatchArticle(article_id, error=error_msg)
+
+    def summarize_batch(self, total_files: int) -> str:
+        """根据 batch_articles / skipped_articles 生成批量处理的结果概览"""
+        articles = [a for a in self.batch_articles if a.error is None]
+        article_count = len(articles) + len(self.skipped_articles)
+        analyzed_count = sum(1 for a in articles if a.analysis is not None)
+        carried_count = sum(1 for a in articles if a.auto_classified)
+
+        message = f"批量处理成功：共处理 {total_files} 个文件，拆分出 {article_count} 条条文，分析 {analyzed_count} 条。"
+        if carried_count:
+            message += f"\n沿用已有分类 {carried_count} 条 (内容与已分类条文相同，未重新分析)。"
+        if self.skipped_articles:
+            in_batch = sum(1 for item in self.skipped_articles if item['reason'] == 'batch')
+            known = len(self.skipped_articles) - in_batch
+            message += f"\n跳过重复条文 {len(self.skipped_articles)} 条 (本批次内重复 {in_batch} 条，已分类 {known} 条)。"
+        return message
+
+    def _find_duplicate(self, digest, seen_in_batch, content_index):
+        """
+        判断条文是否需要作为重复跳过。
+        返回 (重复来源, 原因) 或 None；原因为 'batch' (本批次内重复) 或 'classified' (已分类)。
+        """
+        if digest in seen_in_batch:
+            return seen_in_batch[digest], 'batch'
+
+        if self.known_article_policy == 'skip':
+            located = content_index.lookup(digest)
+            if located is not None:
+                category_id, entry = located
+                registry = self.qingshilu_service.model.category_registry
+                return entry.article_id or registry.save_key(category_id), 'classified'
+        return None
 
     def get_batch_articles(self):
         """返回本次批量处理的条文结果"""
         return self.batch_articles
 
+    def get_article_translation(self, article: BatchArticle) -> str:
+        """
+        保存分类时使用的译文：沿用分类的条文取已保存的译文；
+        分析过的条文取分析结果中的译文，批量分析未计算该阶段时在此补算。
+        """
+        if article.analysis is None:
+            return article.translation or 'N/A'
+        if article.analysis.translation is None:
+            result = self.qingshilu_service.run_full_analysis(article.original_text, stages={'translation'})
+            article.analysis.translation = result['translation']
+        return article.analysis.translation
+
     def update_article_classification(self, article_id: str, classification_key: str):
         """更新批量条文中的单个条文分类"""
         for article in self.batch_articles:
-            if article.get('article_id') == article_id:
-                article['classification_key'] = classification_key
+            if article.article_id == article_id:
+                article.classification_key = classification_key
+                # 手动分类后不再标记为自动沿用
+                article.auto_classified = False
                 break
\ No newline at end of file
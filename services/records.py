@@ -0,0 +1,190 @@
+# services/records.py
+# ----------------------------------------------------
+# 紧凑的条文记录：批量条目 (FileManager.batch_articles)、已分类条目 (DataModel.classifiedData 的叶子)
+# 和分析结果都用 __slots__ dataclass 保存，不再为每条条文存一份带重复字符串键的 dict。
+# 每个记录类都提供 from_dict / to_dict，与原有的 JSON 结构 (classified_data.json、批量结果的 JSONL)
+# 相互转换；磁盘格式保持不变。
+
+from dataclasses import dataclass, fields
+
+
+def record_to_json(obj):
+    """json.dump 的 default 钩子：记录按其 to_dict() 写出"""
+    to_dict = getattr(obj, 'to_dict', None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
+
+
+def _extra_fields(data, known):
+    """JSON 中未知的字段原样保留，写回时不丢失"""
+    extra = {key: value for key, value in data.items() if key not in known}
+    return extra or None
+
+
+@dataclass(slots=True)
+class ClassifiedEntry:
+    """classified_data.json 中的一条已分类条文"""
+    original_text: str
+    translation: str = 'N/A'
+    article_id: str | None = None
+    timestamp: float = 0.0
+    extra: dict | None = None
+
+    _JSON_KEYS = ('originalText', 'translation', 'articleId', 'timestamp')
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data['originalText'],
+            data.get('translation', 'N/A'),
+            data.get('articleId'),
+            data.get('timestamp', 0.0),
+            _extra_fields(data, cls._JSON_KEYS),
+        )
+
+    def to_dict(self):
+        data = {
+            "originalText": self.original_text,
+            "translation": self.translation,
+            "articleId": self.article_id,
+            "timestamp": self.timestamp,
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+@dataclass(slots=True)
+class Recommendation:
+    """一条分类推荐 (recommendations 阶段的输出)"""
+    category: str
+    category_id: int | None
+    classification_key: str | None
+    level1: str
+    level2: str
+    level3: str
+    score: float
+    reason: str
+    matched_keywords: list
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data['category'], data.get('category_id'), data.get('classificationKey'),
+            data['level1'], data['level2'], data['level3'],
+            data['score'], data.get('reason', '无'), data.get('matchedKeywords', []),
+        )
+
+    def to_dict(self):
+        return {
+            "category": self.category,
+            "category_id": self.category_id,
+            "classificationKey": self.classification_key,
+            "level1": self.level1,
+            "level2": self.level2,
+            "level3": self.level3,
+            "score": self.score,
+            "reason": self.reason,
+            "matchedKeywords": self.matched_keywords,
+        }
+
+
+@dataclass(slots=True)
+class AnalysisRecord:
+    """
+    一条条文的分析结果，每个分析阶段一个字段 (字段顺序与 analysis_service.ANALYSIS_STAGES 相同)；None 表示该阶段未计算。
+    与 AnalysisResult 不同，记录不持有 Service 和分析上下文，不会惰性补算未计算的阶段。
+    """
+    core_info: dict | None = None
+    keywords: list | None = None
+    tags: dict | None = None
+    translation: str | None = None
+    recommendations: list | None = None
+    similar_texts: list | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从 AnalysisResult 或 to_dict() 导出的 dict 构建，只取已有的阶段
+        (用 dict.get 取值，不会触发 AnalysisResult 的惰性计算)。
+        """
+        stages = {stage: dict.get(data, stage) for stage in _ANALYSIS_FIELDS}
+        if stages['recommendations'] is not None:
+            stages['recommendations'] = [Recommendation.from_dict(rec) for rec in stages['recommendations']]
+        return cls(**stages)
+
+    def to_dict(self):
+        """只导出已计算的阶段，与 AnalysisResult.to_dict() 的结构一致"""
+        data = {}
+        for stage in _ANALYSIS_FIELDS:
+            value = getattr(self, stage)
+            if value is None:
+                continue
+            if stage == 'recommendations':
+                value = [rec.to_dict() for rec in value]
+            data[stage] = value
+        return data
+
+
+_ANALYSIS_FIELDS = tuple(field.name for field in fields(AnalysisRecord))
+
+
+@dataclass(slots=True)
+class BatchArticle:
+    """
+    批量处理中的一条条文。error 不为 None 时表示文件级别的错误条目 (只有 article_id 和 error)。
+    translation / matched_article_id 只在沿用已有分类 (auto_classified) 时设置。
+    """
+    article_id: str
+    original_text: str = ''
+    source_file: str | None = None
+    analysis: AnalysisRecord | None = None
+    classification_key: str | None = None
+    auto_classified: bool = False
+    translation: str | None = None
+    matched_article_id: str | None = None
+    error: str | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        if 'error' in data:
+            return cls(data['article_id'], error=data['error'])
+        analysis = data.get('analysis')
+        return cls(
+            data['article_id'],
+            data['originalText'],
+            data.get('source_file'),
+            AnalysisRecord.from_dict(analysis) if analysis is not None else None,
+            data.get('classification_key'),
+            data.get('auto_classified', False),
+            data.get('translation'),
+            data.get('matched_article_id'),
+        )
+
+    def to_dict(self):
+        if self.error is not None:
+            return {"article_id": self.article_id, "error": self.error}
+        data = {
+            "article_id": self.article_id,
+            "originalText": self.original_text,
+            "source_file": self.source_file,
+            "analysis": self.analysis.to_dict() if self.analysis is not None else None,
+            "classification_key": self.classification_key,
+        }
+        if self.auto_classified:
+            data["translation"] = self.translation
+            data["auto_classified"] = True
+            data["matched_article_id"] = self.matched_article_id
+        return data
+
+
+def classified_data_from_json(data):
+    """classified_data.json 的嵌套结构 {l1: {l2: {l3: [dict, ...]}}} -> 叶子为 ClassifiedEntry 的同一结构"""
+    return {
+        l1: {
+            l2: {l3: [ClassifiedEntry.from_dict(entry) for entry in texts] for l3, texts in v2.items()}
+            for l2, v2 in v1.items()
+        }
+        for l1, v1 in data.items()
+    }
@@ -0,0 +1,91 @@
+# services/scoring.py
+# ----------------------------------------------------
+# 分类推荐的打分器：CountScorer (原始匹配计数) / BM25Scorer (按语料 IDF 加权)
+# 打分器只负责给文章中的每个关键词一个权重，分类得分由 CategoryIndex 的矩阵乘法汇总。
+
+import math
+from collections import Counter
+
+
+class CorpusStats:
+    """
+    已分类语料 (classifiedData) 的统计量：文档数、平均长度、每个关键词的文档频率 (df)。
+    保存新分类时增量更新；IDF 在统计量变化后首次使用时统一重算并缓存。
+    """
+
+    def __init__(self):
+        self.doc_count = 0
+        self.total_length = 0
+        self.doc_freq = Counter()
+        self._idf_cache = None
+
+    def clear(self):
+        self.__init__()
+
+    def add_document(self, keywords, length):
+        self.doc_count += 1
+        self.total_length += length
+        self.doc_freq.update(set(keywords))
+        self._idf_cache = None
+
+    def remove_document(self, keywords, length):
+        self.doc_count = max(self.doc_count - 1, 0)
+        self.total_length = max(self.total_length - length, 0)
+        self.doc_freq.subtract(set(keywords))
+        self._idf_cache = None
+
+    @property
+    def avg_length(self):
+        return self.total_length / self.doc_count if self.doc_count else 0.0
+
+    def idf(self, keyword):
+        """BM25 的 IDF：ln(1 + (N - df + 0.5) / (df + 0.5))，语料中越常见的词权重越低"""
+        if self._idf_cache is None:
+            self._idf_cache = {}
+        value = self._idf_cache.get(keyword)
+        if value is None:
+            df = max(self.doc_freq.get(keyword, 0), 0)
+            value = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+            self._idf_cache[keyword] = value
+        return value
+
+
+class CountScorer:
+    """原始打分：文章中每个出现的关键词权重为 1，分类得分 = 匹配关键词个数"""
+
+    name = 'count'
+
+    def weights(self, context):
+        return {keyword: 1 for keyword in context.keywords}
+
+
+class BM25Scorer:
+    """
+    BM25 打分：分类的关键词表视为查询，待分类文章视为文档。
+    关键词权重 = IDF × 词频饱和项 (按文章长度归一化)，"旱"、"饥" 这类泛用词的权重会被压低。
+    """
+
+    name = 'bm25'
+
+    def __init__(self, corpus_stats: CorpusStats, k1=1.5, b=0.75):
+        self.corpus_stats = corpus_stats
+        self.k1 = k1
+        self.b = b
+
+    def weights(self, context):
+        stats = self.corpus_stats
+        doc_length = len(context.clean_text)
+        avg_length = stats.avg_length or doc_length or 1
+        length_norm = self.k1 * (1 - self.b + self.b * doc_length / avg_length)
+
+        weights = {}
+        for keyword in context.keywords:
+            tf = context.count(keyword)
+            weights[keyword] = stats.idf(keyword) * tf * (self.k1 + 1) / (tf + length_norm)
+        return weights
+
+
+SCORERS = {
+    CountScorer.name: CountScorer,
+    BM25Scorer.name: BM25Scorer,
+}
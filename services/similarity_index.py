@@ -0,0 +1,232 @@
+# services/similarity_index.py
+# ----------------------------------------------------
+# 已分类文本的相似检索索引。由 DataModel 构建并在保存分类时增量更新。
+# MinHashLSHIndex：字符 n-gram 分片 + MinHash 签名 + LSH 分桶，查询只比较同桶候选，不再线性扫描全部语料。
+# BigramTfidfIndex：字符二元组 TF-IDF 稀疏向量 + 余弦相似度，不依赖关键词库。
+
+import heapq
+import math
+import random
+import re
+import zlib
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 为可选依赖，缺失时退回纯 Python 实现
+    np = None
+
+# 分片前去掉条文序号 (○123) 和标点空白，只保留正文字符
+_SHINGLE_CLEAN_RE = re.compile(r"○\d*|[\W_]+")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_UINT64_MASK = (1 << 64) - 1
+
+
+def char_shingles(text, n=3):
+    """字符 n-gram 分片集合；正文不足 n 个字符时整段作为一个分片"""
+    clean = _SHINGLE_CLEAN_RE.sub('', text)
+    if len(clean) <= n:
+        return {clean} if clean else set()
+    return {clean[i:i + n] for i in range(len(clean) - n + 1)}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHashLSHIndex:
+    """
+    MinHash + LSH 近似相似索引。
+    签名长度 = bands × rows；两篇文本在任一 band 上签名完全相同即成为候选，
+    候选再按签名估计的 Jaccard 相似度排序取 top-k。
+    默认 32 × 2 时，Jaccard 约 0.18 以上的文本大概率进入候选。
+    """
+
+    def __init__(self, shingle_size=3, bands=32, rows=2, seed=1):
+        self.shingle_size = shingle_size
+        self.bands = bands
+        self.rows = rows
+        self.num_perm = bands * rows
+
+        rng = random.Random(seed)
+        self._perm_a = [rng.randint(1, _MAX_HASH) for _ in range(self.num_perm)]
+        self._perm_b = [rng.randint(0, _MAX_HASH) for _ in range(self.num_perm)]
+        if np is not None:
+            self._np_a = np.array(self._perm_a, dtype=np.uint64)[:, None]
+            self._np_b = np.array(self._perm_b, dtype=np.uint64)[:, None]
+
+        self.signatures = {}  # doc_key -> 签名 (tuple)
+        self._buckets = {}    # (band, band 签名) -> {doc_key, ...}
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def signature(self, text):
+        shingles = char_shingles(text, self.shingle_size)
+        if not shingles:
+            return None
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles]
+
+        if np is not None:
+            values = np.array(hashes, dtype=np.uint64)[None, :]
+            permuted = np.bitwise_and((self._np_a * values + self._np_b) % _MERSENNE_PRIME, _MAX_HASH)
+            return tuple(permuted.min(axis=1).tolist())
+
+        return tuple(
+            # 与 NumPy uint64 运算的溢出回绕保持一致
+            min((((a * h + b) & _UINT64_MASK) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in zip(self._perm_a, self._perm_b)
+        )
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def add(self, doc_key, text):
+        self.remove(doc_key)
+        signature = self.signature(text)
+        if signature is None:
+            return
+        self.signatures[doc_key] = signature
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, set()).add(doc_key)
+
+    def remove(self, doc_key):
+        signature = self.signatures.pop(doc_key, None)
+        if signature is None:
+            return
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(doc_key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def query(self, text, k=3, exclude=None):
+        """返回 [(doc_key, 估计相似度), ...]，按相似度从高到低，最多 k 条"""
+        signature = self.signature(text)
+        if signature is None:
+            return []
+
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        if exclude is not None:
+            candidates.discard(exclude)
+
+        num_perm = self.num_perm
+        scored = (
+            (sum(x == y for x, y in zip(signature, self.signatures[key])) / num_perm, key)
+            for key in candidates
+        )
+        return [(key, score) for score, key in heapq.nlargest(k, scored, key=lambda item: item[0])]
+
+
+class BigramTfidfIndex:
+    """
+    字符二元组 TF-IDF 向量索引 (倒排表形式的稀疏矩阵：二元组 -> {文档: 词频权重})。
+    查询只累加与查询共有的二元组，按余弦相似度用堆取 top-k，不做全量排序。
+    即使两篇文本没有共同的词库关键词，也能按字面相似度召回。
+    """
+
+    # 语料规模增长超过该比例时，用最新的 IDF 重算所有文档的向量长度
+    RENORMALIZE_GROWTH = 0.1
+
+    shingle_size = 2
+
+    def __init__(self):
+        self._postings = {}   # 二元组 -> {doc_key: 1 + log(tf)}
+        self._doc_terms = {}  # doc_key -> {二元组: 1 + log(tf)}
+        self._norms = {}      # doc_key -> 向量长度 (以计算时的 IDF 为准)
+        self._normalized_size = 0
+        self._norms_stale = False
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    @staticmethod
+    def _term_weights(text):
+        clean = _SHINGLE_CLEAN_RE.sub('', text)
+        counts = Counter(clean[i:i + 2] for i in range(len(clean) - 1))
+        return {term: 1 + math.log(tf) for term, tf in counts.items()}
+
+    def _idf(self, term):
+        doc_freq = len(self._postings.get(term, ()))
+        return math.log((1 + len(self._doc_terms)) / (1 + doc_freq)) + 1
+
+    def _norm(self, weights):
+        return math.sqrt(sum((w * self._idf(term)) ** 2 for term, w in weights.items()))
+
+    def add(self, doc_key, text):
+        self.remove(doc_key)
+        weights = self._term_weights(text)
+        if not weights:
+            return
+        self._doc_terms[doc_key] = weights
+        for term, weight in weights.items():
+            self._postings.setdefault(term, {})[doc_key] = weight
+
+        # 增量添加：新文档按当前 IDF 计算长度；语料明显增长后，留到下次查询时统一重算
+        if len(self._doc_terms) > self._normalized_size * (1 + self.RENORMALIZE_GROWTH):
+            self._norms_stale = True
+        if not self._norms_stale:
+            self._norms[doc_key] = self._norm(weights)
+
+    def remove(self, doc_key):
+        weights = self._doc_terms.pop(doc_key, None)
+        if weights is None:
+            return
+        self._norms.pop(doc_key, None)
+        for term in weights:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(doc_key, None)
+                if not posting:
+                    del self._postings[term]
+
+    def _renormalize(self):
+        self._norms = {doc_key: self._norm(weights) for doc_key, weights in self._doc_terms.items()}
+        self._normalized_size = len(self._doc_terms)
+        self._norms_stale = False
+
+    def query(self, text, k=3, exclude=None):
+        """返回 [(doc_key, 余弦相似度), ...]，按相似度从高到低，最多 k 条"""
+        weights = self._term_weights(text)
+        if not weights:
+            return []
+        if self._norms_stale:
+            self._renormalize()
+
+        scores = {}
+        query_norm = 0.0
+        for term, weight in weights.items():
+            idf = self._idf(term)
+            query_weight = weight * idf
+            query_norm += query_weight ** 2
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            factor = query_weight * idf
+            for doc_key, doc_weight in posting.items():
+                scores[doc_key] = scores.get(doc_key, 0.0) + factor * doc_weight
+
+        if exclude is not None:
+            scores.pop(exclude, None)
+        if not scores:
+            return []
+
+        query_norm = math.sqrt(query_norm)
+        norms = self._norms
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1] / norms[item[0]])
+        return [(doc_key, min(score / (query_norm * norms[doc_key]), 1.0)) for doc_key, score in top]
+
+
+# DataModel 按名称构建的相似检索索引
+SIMILARITY_INDEXES = {
+    'minhash': MinHashLSHIndex,
+    'bigram': BigramTfidfIndex,
+}
@@ -0,0 +1,75 @@
+# services/tag_engine.py
+# ----------------------------------------------------
+# TagEngine：按 keywords_data.CATEGORY_CONFIG 给条文打 性质 (nature) / 领域 (domain) 多标签
+# 所有标签的关键词编译进同一个 TermMatcher，一次扫描得到全部标签的得分；
+# 在 QingShiluService 中与其它阶段共用 AnalysisContext 的扫描结果，不再单独扫描文本。
+
+from gemini.services.analysis_context import TermMatcher
+from gemini.services.keywords_data import CATEGORY_CONFIG
+
+TAG_TYPES = ('nature', 'domain')
+
+
+class TagEngine:
+    """
+    标签得分 = 该标签的关键词在文本中出现的总次数；得分不低于 min_score 的标签记入 labels。
+    同一个关键词出现在多个标签中时，分别计入每个标签。
+    """
+
+    def __init__(self, config=None, min_score=1):
+        self.config = CATEGORY_CONFIG if config is None else config
+        self.min_score = min_score
+
+        # 关键词 -> 所属标签 ID 列表
+        self._tags_by_term = {}
+        for tag_id, conf in self.config.items():
+            if conf['type'] not in TAG_TYPES:
+                raise ValueError(f"标签 {tag_id} 的类型未知: {conf['type']}，可选: {TAG_TYPES}")
+            for term in dict.fromkeys(conf['keywords']):
+                self._tags_by_term.setdefault(term, []).append(tag_id)
+
+        self.terms = frozenset(self._tags_by_term)
+        self._matcher = None
+
+    @property
+    def tag_names(self):
+        """按配置顺序排列的标签名称 (用于导出表头等)"""
+        return [conf['name'] for conf in self.config.values()]
+
+    def tag(self, text):
+        """独立使用：自行扫描文本并打标签"""
+        if self._matcher is None:
+            self._matcher = TermMatcher(self.terms)
+        clean_text = text.replace('\n', '').replace('\r', '').strip()
+        return self.tag_positions(self._matcher.scan(clean_text))
+
+    def tag_context(self, context):
+        """使用 AnalysisContext 已有的扫描结果打标签 (其匹配器需包含 self.terms)"""
+        return self.tag_positions(context.term_positions)
+
+    def tag_positions(self, term_positions):
+        """
+        根据 {词条: [出现位置, ...]} 计算得分，返回:
+        {"nature": {名称: 得分}, "domain": {名称: 得分}, "labels": [中文标签, ...],
+         "matchedKeywords": {名称: [关键词, ...]}}
+        """
+        scores = dict.fromkeys(self.config, 0)
+        matched = {}
+        for term, positions in term_positions.items():
+            tag_ids = self._tags_by_term.get(term)
+            if not tag_ids:
+                continue
+            for tag_id in tag_ids:
+                scores[tag_id] += len(positions)
+                matched.setdefault(tag_id, []).append(term)
+
+        result = {tag_type: {} for tag_type in TAG_TYPES}
+        for tag_id, conf in self.config.items():
+            result[conf['type']][conf['name']] = scores[tag_id]
+
+        # 标签按类型 (性质在前)、得分从高到低排列
+        hits = [tag_id for tag_id in self.config if scores[tag_id] >= self.min_score]
+        hits.sort(key=lambda tag_id: (TAG_TYPES.index(self.config[tag_id]['type']), -scores[tag_id]))
+        result['labels'] = [self.config[tag_id]['label'] for tag_id in hits]
+        result['matchedKeywords'] = {self.config[tag_id]['name']: matched.get(tag_id, []) for tag_id in hits}
+        return result
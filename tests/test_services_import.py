@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+services 包的无界面导入检查 (pytest 或 python -m unittest 均可运行)
+1. 在新的 Python 进程中导入 gemini.services 及其全部子模块，不得加载任何 Qt (PySide6 / shiboken6) 模块
+2. 冷启动导入 gemini.services 的耗时 (多轮取最小值) 不得超过 IMPORT_BUDGET_MS
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(os.path.abspath(__file__)).parent.parent
+
+# 允许的最长冷启动导入耗时 (毫秒)，可用环境变量 GEMINI_IMPORT_BUDGET_MS 覆盖 (如较慢的 CI 机器)
+IMPORT_BUDGET_MS = float(os.environ.get("GEMINI_IMPORT_BUDGET_MS", 500))
+ROUNDS = 3
+
+# 子进程中执行：计时导入，再导入其余子模块，报告已加载的 Qt 模块
+CHILD_CODE = """
+import importlib, json, pkgutil, sys, time
+start = time.perf_counter()
+import gemini.services
+elapsed = time.perf_counter() - start
+for module in pkgutil.iter_modules(gemini.services.__path__, "gemini.services."):
+    importlib.import_module(module.name)
+qt_modules = sorted(m for m in sys.modules if m.split('.')[0] in ('PySide6', 'shiboken6'))
+print(json.dumps({"ms": elapsed * 1000, "qt": qt_modules}))
+"""
+
+
+def run_child():
+    env = dict(os.environ)
+    # 与 main.py 相同的路径约定：gemini 的上级目录在 sys.path 中
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT.parent), env.get("PYTHONPATH")]))
+    completed = subprocess.run([sys.executable, "-c", CHILD_CODE], env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise AssertionError(f"导入 gemini.services 失败:\n{completed.stderr.strip()}")
+    # services 导入时会打印 INFO 信息，结果取最后一行
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+class ServicesImportTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.samples = [run_child() for _ in range(ROUNDS)]
+
+    def test_no_qt_modules(self):
+        qt_modules = sorted({m for sample in self.samples for m in sample["qt"]})
+        self.assertEqual(qt_modules, [], "导入 services 时加载了 Qt 模块")
+
+    def test_import_time_within_budget(self):
+        best = min(sample["ms"] for sample in self.samples)
+        self.assertLessEqual(best, IMPORT_BUDGET_MS,
+                             f"导入 gemini.services 耗时 {best:.1f} ms，超过预算 {IMPORT_BUDGET_MS:.0f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
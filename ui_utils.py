@@ -1,7 +1,11 @@
 # ui_utils.py
 
 import os
+import json
+import hashlib
+import importlib.util
 import traceback
+from PySide6 import QtWidgets
 from PySide6.QtWidgets import (
     QWidget, QMessageBox, QFileDialog, QSizePolicy,
     QFrame, QVBoxLayout, QLabel, QHBoxLayout, QApplication
@@ -40,6 +44,20 @@ class WorkerThread(QThread):
             self.error_signal.emit(error_msg)
 
 
+# =======================================================
+# 文件选择适配器 (Service 层不直接依赖 Qt)
+# =======================================================
+
+class QtFileSelector:
+    """
+    FileManager 的文件选择适配器：用 QFileDialog 弹出多选对话框。
+    """
+
+    def select_files(self, parent, title, name_filter):
+        files, _ = QFileDialog.getOpenFileNames(parent, title, "", name_filter)
+        return files
+
+
 # =======================================================
 # 辅助函数和 Tab 基类
 # =======================================================
@@ -64,25 +82,92 @@ def load_ui_file(loader, ui_filename, widget):
     return ui_file
 
 
+# =======================================================
+# 预编译 UI (build_ui.py 用 pyside6-uic 生成) 与 QUiLoader 回退
+# =======================================================
+
+UI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ui')
+COMPILED_UI_DIR = os.path.join(UI_DIR, 'compiled')
+COMPILED_UI_MANIFEST = os.path.join(COMPILED_UI_DIR, 'manifest.json')
+
+# manifest.json 的缓存：{.ui 文件名: {"module", "class", "base", "sha1"}}
+_compiled_manifest = None
+
+
+def ui_file_sha1(ui_path):
+    with open(ui_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _load_compiled_manifest():
+    global _compiled_manifest
+    if _compiled_manifest is None:
+        _compiled_manifest = {}
+        if os.path.exists(COMPILED_UI_MANIFEST):
+            try:
+                with open(COMPILED_UI_MANIFEST, 'r', encoding='utf-8') as f:
+                    _compiled_manifest = json.load(f)
+            except Exception as e:
+                print(f"警告：无法读取预编译 UI 清单 {COMPILED_UI_MANIFEST}，改用 QUiLoader。错误: {e}")
+    return _compiled_manifest
+
+
+def load_compiled_form(ui_filename):
+    """
+    返回预编译的 (Ui_xxx 实例, 根控件类)。
+    未编译、或 .ui 在编译后被修改过 (sha1 不一致) 时返回 None，由调用方回退到 QUiLoader。
+    """
+    info = _load_compiled_manifest().get(ui_filename)
+    if not info:
+        return None
+
+    if ui_file_sha1(os.path.join(UI_DIR, ui_filename)) != info['sha1']:
+        print(f"INFO: {ui_filename} 在预编译后被修改，改用 QUiLoader 加载 (重新运行 build_ui.py 可更新)")
+        return None
+
+    module_path = os.path.join(COMPILED_UI_DIR, info['module'] + '.py')
+    spec = importlib.util.spec_from_file_location(f"gemini_compiled_ui.{info['module']}", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, info['class'])(), getattr(QtWidgets, info['base'])
+
+
+def create_ui_widget(ui_filename, parent=None, loader=None):
+    """
+    按 .ui 文件创建控件：优先使用预编译的 Python 类，否则用 QUiLoader 在运行时解析 XML。
+    两种方式得到的控件结构相同 (根控件挂在 parent 下，子控件可用 findChild 查找)。失败时返回 None。
+    """
+    compiled = load_compiled_form(ui_filename)
+    if compiled is not None:
+        form, base_class = compiled
+        widget = base_class(parent)
+        form.setupUi(widget)
+        # form 的属性引用各子控件，随根控件一起保留
+        widget.compiled_ui = form
+        return widget
+
+    loader = loader or QUiLoader()
+    ui_file = load_ui_file(loader, ui_filename, parent)
+    if ui_file is None:
+        return None
+    widget = loader.load(ui_file, parent)
+    ui_file.close()
+    return widget
+
+
 class BaseTabWidget(QWidget):
     """所有 Tab 模块的基类，包含加载自身的 UI 逻辑"""
 
     def __init__(self, ui_file_name, parent=None):
         super().__init__(parent)
-        self.loader = QUiLoader()
         self.ui_file_name = ui_file_name
         self.load_ui()
 
     def load_ui(self):
-        ui_file = load_ui_file(self.loader, self.ui_file_name, self)
-        if ui_file is None:
+        # QCoreApplication.instance().installEventFilter(self) # 避免在UI加载时做过多事情
+        if create_ui_widget(self.ui_file_name, self) is None:
             # 必须调用 deleteLater() 避免父对象持有无效子对象
             self.deleteLater()
-            return
-
-        # QCoreApplication.instance().installEventFilter(self) # 避免在UI加载时做过多事情
-        self.loader.load(ui_file, self)
-        ui_file.close()
 
 
 # =======================================================
@@ -9,7 +9,7 @@ from PySide6.QtCore import Qt, QTimer, QCoreApplication, QIODevice
 from PySide6.QtGui import QTextOption, QColor, QPalette  # 导入 QColor 和 QPalette
 
 # 导入核心模块 (使用绝对导入)
-from ui_utils import BaseTabWidget, WorkerThread
+from ui_utils import BaseTabWidget, WorkerThread, QtFileSelector
 
 # 保持对同级模块的相对导入
 from gemini.widgets.category_dialog import CategorySelectionDialog
@@ -30,7 +30,7 @@ class BatchTabWidget(BaseTabWidget):
 
         # 通过依赖注入获取 Service 实例
         self.qingshilu_service = qingshilu_service
-        self.file_manager = FileManager(qingshilu_service)
+        self.file_manager = FileManager(qingshilu_service, file_selector=QtFileSelector())
         self.worker = None
 
         # 🌟 关键：调用主题适应逻辑 🌟
@@ -144,7 +144,7 @@ class BatchTabWidget(BaseTabWidget):
             # 筛选出分类键为 None 或空字符串的条文
             results_to_render = [
                 a for a in all_articles
-                if a.get('classification_key') is None or a.get('classification_key') == ''
+                if not a.classification_key
             ]
             self.show_notification(f"已筛选出 {len(results_to_render)} 条未分类条文。")
 
@@ -263,10 +263,10 @@ class BatchTabWidget(BaseTabWidget):
 
         # 渲染新结果
         for result in results:
-            if 'error' in result:
+            if result.error is not None:
                 # 渲染错误信息
-                article_id = result.get('article_id', '未知错误')
-                label = QLabel(f"错误: {article_id}\n信息: {result['error']}")
+                article_id = result.article_id or '未知错误'
+                label = QLabel(f"错误: {article_id}\n信息: {result.error}")
                 label.setStyleSheet(
                     "color: red; font-weight: bold; padding: 5px; border: 1px solid red; background-color: #FFE0E0;")
                 label.setSizePolicy(QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred))
@@ -274,8 +274,8 @@ class BatchTabWidget(BaseTabWidget):
                 continue
 
             # 渲染条文分析结果
-            article_id = result['article_id']
-            category_key = result.get('classification_key')
+            article_id = result.article_id
+            category_key = result.classification_key
 
             article_group = QWidget()
             sizePolicy = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
@@ -300,7 +300,7 @@ class BatchTabWidget(BaseTabWidget):
             id_label = QLabel(f"<b>ID: {article_id}</b>")
             text_browser = QTextBrowser()
             text_browser.setWordWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
-            original_text = result.get('originalText', '原文内容缺失')
+            original_text = result.original_text or '原文内容缺失'
             text_browser.setText(original_text)
             text_browser.setMinimumHeight(150)
             text_browser.setFrameShape(QTextBrowser.NoFrame)
@@ -320,8 +320,9 @@ class BatchTabWidget(BaseTabWidget):
                 """
             )
 
-            # 2. 推荐分类
-            recommendations = result['analysis'].get('recommendations', [])
+            # 2. 推荐分类 (沿用已有分类的条文没有分析结果)
+            analysis = result.analysis
+            recommendations = analysis.recommendations if analysis is not None else None
             rec_container = QWidget()
             rec_layout = QHBoxLayout(rec_container)
             rec_layout.setContentsMargins(0, 0, 0, 0)
@@ -332,7 +333,7 @@ class BatchTabWidget(BaseTabWidget):
 
             if recommendations:
                 for i, rec in enumerate(recommendations[:3]):
-                    recommendation_key = rec['category']
+                    recommendation_key = rec.category
                     display_text = f"推荐{i + 1}: {recommendation_key}"
                     rec_button = QPushButton(display_text)
                     rec_button.article_id = article_id
@@ -344,8 +345,21 @@ class BatchTabWidget(BaseTabWidget):
                     rec_button.clicked.connect(self._handle_accept_recommendation)
                     rec_layout.addWidget(rec_button)
 
+                # 性质/领域标签 (services/tag_engine.py)
+                tag_labels = (analysis.tags or {}).get('labels', [])
+                if tag_labels:
+                    tag_label = QLabel(f"标签: {' '.join(tag_labels)}")
+                    tag_label.setStyleSheet(f"color: {text_color};")
+                    rec_layout.addWidget(tag_label)
+
                 rec_layout.addStretch()
                 rec_widget = rec_container
+            elif result.auto_classified:
+                matched_id = result.matched_article_id or "已分类条文"
+                rec_label = QLabel(f"推荐: 与 {matched_id} 内容相同，已沿用其分类")
+                rec_label.setMinimumWidth(150)
+                rec_label.setStyleSheet(f"color: {text_color};")
+                rec_widget = rec_label
             else:
                 rec_label = QLabel("推荐: 无")
                 rec_label.setMinimumWidth(150)
@@ -355,6 +369,8 @@ class BatchTabWidget(BaseTabWidget):
 
             # 3. 当前分类状态
             current_cat_text = category_key if category_key else "未分类"
+            if category_key and result.auto_classified:
+                current_cat_text += " (自动)"
             current_cat_label = QLabel(f"状态: <b>{current_cat_text}</b>")
 
             if category_key:
@@ -383,27 +399,6 @@ class BatchTabWidget(BaseTabWidget):
         if self.is_filtered:
             self.show_notification(f"当前显示 {len(results)} 条未分类条文。", is_error=False)
 
-    def _convert_display_key_to_save_key(self, display_key: str) -> str | None:
-        """
-        将 L1Name-L2Name-L3Name 的显示格式
-        转换为 Service 要求的 L1Key/L2Name/L3Name (例如: 0/赈灾与民生保障/赈灾)
-        """
-        parts = display_key.split('-')
-        if len(parts) != 3:
-            return None
-
-        level1_name = parts[0]
-
-        if level1_name == "事务类":
-            l1_key = "0"
-        elif level1_name == "问题类":
-            l1_key = "1"
-        else:
-            return None
-
-        # 构造 Service 要求的保存格式： L1_KEY/L2_NAME/L3_NAME
-        return f"{l1_key}/{parts[1]}/{parts[2]}"
-
     def _handle_accept_recommendation(self):
         """处理点击推荐分类按钮的事件：直接采用推荐分类并保存"""
         sender_button = self.sender()
@@ -414,13 +409,14 @@ class BatchTabWidget(BaseTabWidget):
         article_id = sender_button.article_id
         display_key = sender_button.recommendation_key
 
-        classification_key = self._convert_display_key_to_save_key(display_key)
+        # 显示格式 L1Name-L2Name-L3Name -> 保存格式 L1Key/L2Name/L3Name (例如: 0/赈灾与民生保障/赈灾)
+        classification_key = self.qingshilu_service.model.category_registry.to_save_key(display_key)
 
         if not classification_key:
             QMessageBox.critical(self, "错误", f"无法解析推荐分类键 '{display_key}' 为保存格式，请手动分类。")
             return
 
-        current_article = next((a for a in self.file_manager.get_batch_articles() if a['article_id'] == article_id),
+        current_article = next((a for a in self.file_manager.get_batch_articles() if a.article_id == article_id),
                                None)
         if not current_article:
             QMessageBox.critical(self, "错误", f"未找到条文ID: {article_id}")
@@ -434,8 +430,8 @@ class BatchTabWidget(BaseTabWidget):
             self.file_manager.update_article_classification(article_id, classification_key)
 
             self.qingshilu_service.save_classification_result(
-                current_article['originalText'],
-                current_article['analysis'].get('translation', 'N/A'),
+                current_article.original_text,
+                self.file_manager.get_article_translation(current_article),
                 classification_key,
                 article_id=article_id
             )
@@ -447,7 +443,7 @@ class BatchTabWidget(BaseTabWidget):
                 all_articles = self.file_manager.get_batch_articles()
                 results_to_render = [
                     a for a in all_articles
-                    if a.get('classification_key') is None or a.get('classification_key') == ''
+                    if not a.classification_key
                 ]
             else:
                 results_to_render = self.file_manager.get_batch_articles()
@@ -466,7 +462,7 @@ class BatchTabWidget(BaseTabWidget):
 
         article_id = sender_button.article_id
 
-        current_article = next((a for a in self.file_manager.get_batch_articles() if a['article_id'] == article_id),
+        current_article = next((a for a in self.file_manager.get_batch_articles() if a.article_id == article_id),
                                None)
         if not current_article:
             QMessageBox.critical(self, "错误", f"未找到条文ID: {article_id}")
@@ -493,7 +489,7 @@ class BatchTabWidget(BaseTabWidget):
         if file_path:
             try:
                 with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(results, f, ensure_ascii=False, indent=4)
+                    json.dump([article.to_dict() for article in results], f, ensure_ascii=False, indent=4)
 
                 QMessageBox.information(self, "保存成功", f"批量结果已成功保存到: {file_path}")
             except Exception as e:
@@ -3,11 +3,13 @@
 from PySide6.QtWidgets import (
     QTextEdit, QPushButton, QLabel, QTextBrowser, QDialog, QMessageBox
 )
+from PySide6.QtCore import QEvent
 # 使用绝对导入 ui_utils (因为 main.py 已经将 gemini 目录添加到了 sys.path)
 from ui_utils import BaseTabWidget, WorkerThread
 
 # 保持对同级模块的相对导入
 from gemini.widgets.category_dialog import CategorySelectionDialog
+from gemini.services.analysis_service import INTERACTIVE_STAGES
 # ... (SingleTabWidget 类的其余代码保持不变) ...
 
 
@@ -17,6 +19,7 @@ class SingleTabWidget(BaseTabWidget):
         # 通过依赖注入获取 Service 实例
         self.analysis_service = qingshilu_service
         self.worker = None
+        self.similar_worker = None
         self.current_analysis_results = None  # 存储Service返回的全部结果
         self.connect_signals()
         self._update_char_count_controller()
@@ -43,6 +46,14 @@ class SingleTabWidget(BaseTabWidget):
             self.analyzeButton.clicked.connect(self._start_smart_analyze_worker)
         if self.saveClassificationButton:
             self.saveClassificationButton.clicked.connect(self._save_classification_controller)
+        if self.similarTextsText:
+            # 相似文本面板被打开 (Show 事件) 时才检索
+            self.similarTextsText.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if watched is self.similarTextsText and event.type() == QEvent.Show:
+            self._load_similar_texts_controller()
+        return super().eventFilter(watched, event)
 
     # --- Controller 方法 ---
 
@@ -65,11 +76,12 @@ class SingleTabWidget(BaseTabWidget):
         self.translationTextEdit.setText("正在调用 Service 层进行智能分析，请稍候...")
         self.coreInfoLabel.setText("核心信息: 正在提取...")
         self.recommendationsText.setText("推荐分类: 正在计算...")
-        self.similarTextsText.setText("相似文本: 正在检索...")
+        if self.similarTextsText:
+            self.similarTextsText.setText("相似文本: 打开面板后检索")
         self.keywordsText.setText("")
 
-        # 创建 WorkerThread：调用 Service.run_full_analysis 方法
-        self.worker = WorkerThread(self.analysis_service.run_full_analysis, text)
+        # 创建 WorkerThread：调用 Service.run_full_analysis 方法（相似文本阶段延后到面板打开时）
+        self.worker = WorkerThread(self.analysis_service.run_full_analysis, text, stages=INTERACTIVE_STAGES)
 
         # 连接信号
         self.worker.result_signal.connect(self._on_analysis_success)
@@ -102,12 +114,51 @@ class SingleTabWidget(BaseTabWidget):
         rec_html = self._render_recommendations_html(results['recommendations'])
         self.recommendationsText.setHtml(rec_html)
 
-        # 4. 相似文本 (模拟卡片 UI)
-        similar_html = self._render_similar_texts_html(results['similar_texts'])
-        self.similarTextsText.setHtml(similar_html)
+        # 4. 相似文本 (模拟卡片 UI)：仅在面板可见时才触发检索
+        self._load_similar_texts_controller()
 
         QMessageBox.information(self, "分析完成", "智能分析和推荐已完成。")
 
+    def _load_similar_texts_controller(self):
+        """相似文本面板打开时，在后台线程中惰性计算 similar_texts 阶段"""
+        results = self.current_analysis_results
+        if results is None or not self.similarTextsText or not self.similarTextsText.isVisible():
+            return
+
+        if results.is_loaded('similar_texts'):
+            self._on_similar_texts_success(results, results['similar_texts'])
+            return
+
+        # 检索仍在进行：不重复启动，线程结束后若分析结果已更新会重新检索
+        if self.similar_worker is not None and self.similar_worker.isRunning():
+            return
+
+        self.similarTextsText.setText("相似文本: 正在检索...")
+        self.similar_worker = WorkerThread(results.load, 'similar_texts')
+        self.similar_worker.result_signal.connect(
+            lambda similar_texts: self._on_similar_texts_success(results, similar_texts))
+        self.similar_worker.error_signal.connect(
+            lambda error_message: self._on_similar_texts_error(results, error_message))
+        self.similar_worker.finished.connect(lambda: self._on_similar_worker_finished(results))
+        self.similar_worker.start()
+
+    def _on_similar_texts_success(self, results, similar_texts):
+        """在主线程中渲染相似文本；检索期间重新分析过的旧结果直接丢弃"""
+        if results is not self.current_analysis_results:
+            return
+        if self.similarTextsText:
+            self.similarTextsText.setHtml(self._render_similar_texts_html(similar_texts))
+
+    def _on_similar_texts_error(self, results, error_message):
+        if results is not self.current_analysis_results:
+            return
+        self._on_analysis_error(error_message)
+
+    def _on_similar_worker_finished(self, results):
+        """检索期间分析结果已更新 (当时的检索请求被跳过)：为当前结果重新检索"""
+        if results is not self.current_analysis_results:
+            self._load_similar_texts_controller()
+
     def _on_analysis_error(self, error_message):
         """在主线程中处理 Service 返回的错误信息"""
         self.analyzeButton.setEnabled(True)